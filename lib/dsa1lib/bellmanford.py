@@ -0,0 +1,114 @@
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.subgraph import SubgraphView
+import numpy as np
+
+
+def edge_arrays_of(graph) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Directed edge list of a weighted graph for bellman_ford(). Undirected edges appear once per direction. Views
+    share the edge arrays of their graph, only the ids of the edges in the view are taken.
+
+    Args:
+        graph (WeightedGraph | CSRWeightedGraph | DenseWeightedGraph | SubgraphView): Graph.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Tails, heads, weights and ids of the edges.
+    """
+    if isinstance(graph, DenseWeightedGraph):
+        # the matrix of an undirected graph is symmetric, so it already holds both directions
+        eids = np.flatnonzero(np.asarray(graph.matrix) != np.inf)
+        src, dst = np.divmod(eids, graph.num_vertices)
+        return src, dst, np.asarray(graph.matrix)[eids], eids
+
+    src = np.asarray(graph.edge_v1, dtype=np.int64)
+    dst = np.asarray(graph.edge_v2, dtype=np.int64)
+    weights = np.asarray(graph.edge_weights, dtype=np.float64)
+    eids = np.arange(len(src))
+    if isinstance(graph, SubgraphView):
+        eids = np.asarray(graph.edge_ids(), dtype=np.int64)
+        src, dst, weights = src[eids], dst[eids], weights[eids]
+    if graph.directed:
+        return src, dst, weights, eids
+    return np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((weights, weights)), \
+        np.concatenate((eids, eids))
+
+
+def bellman_ford(V: int, src: np.ndarray, dst: np.ndarray, weights: np.ndarray, eids: np.ndarray,
+                 source: int) -> tuple[np.ndarray, np.ndarray, bool]:
+    """Bellman-Ford with every pass one vectorised relaxation of the edge arrays. A pass relaxes the edges out of the
+    vertices the previous pass improved, all against the distances the previous pass left, and np.minimum.at keeps
+    the smallest of the relaxations into the same vertex. After pass k the distances are the shortest over paths of
+    at most k edges, so the passes stop as soon as one improves nothing, and a V-th pass that still improves
+    something means a negative cycle is reachable from the source.
+
+    Args:
+        V (int): Number of vertices.
+        src (np.ndarray): Tail of every edge.
+        dst (np.ndarray): Head of every edge.
+        weights (np.ndarray): Weight of every edge.
+        eids (np.ndarray): Edge id reported for every edge.
+        source (int): Source vertex.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, bool]: Distance to every vertex (inf if unreachable), id of the edge into
+            every vertex on its shortest path (-1 for none), and whether a negative cycle is reachable.
+    """
+    # edges grouped by tail, so the edges out of a set of vertices are gathered without scanning all of them
+    order = np.argsort(src, kind="stable")
+    dst, weights, eids = dst[order], weights[order], eids[order]
+    offsets = np.zeros(V + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=V), out=offsets[1:])
+
+    dist = np.full(V, np.inf)
+    edge_id_to = np.full(V, -1, dtype=np.int64)
+    dist[source] = 0.0
+    improved = np.array([source])
+
+    for _ in range(V):
+        starts = offsets[improved]
+        counts = offsets[improved + 1] - starts
+        slots = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+        candidate = np.repeat(dist[improved], counts) + weights[slots]
+        better = candidate < dist[dst[slots]]
+        if not better.any():
+            return dist, edge_id_to, False
+
+        # every candidate was computed before any write, so the pass only sees the distances of the previous one
+        slots, candidate = slots[better], candidate[better]
+        targets = dst[slots]
+        np.minimum.at(dist, targets, candidate)
+        # an edge whose relaxation won names the predecessor, on ties the last one written
+        winners = candidate == dist[targets]
+        edge_id_to[targets[winners]] = eids[slots[winners]]
+
+        improved = np.unique(targets)
+
+    return dist, edge_id_to, True
+
+
+if __name__ == "__main__":
+    # passes and time on a random graph with negative edges but no negative cycle, made by shifting the weights of
+    # a non negative graph with vertex potentials
+    # usage: python -m dsa1lib.bellmanford [V] [E]
+    import sys
+    import time
+    from dsa1lib.generators import ErdosRenyi
+    from dsa1lib.graph import WeightedDirectedGraph
+    from dsa1lib.shortestpath import BellmanFordSSSP, DijkstraSSSP
+
+    V = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    E = int(sys.argv[2]) if len(sys.argv) > 2 else 800_000
+    base = ErdosRenyi(V, E, seed=25).to_graph()
+    potential = np.random.default_rng(25).integers(0, 1000, V)
+    v1s, v2s = np.asarray(base.edge_v1), np.asarray(base.edge_v2)
+    graph = WeightedDirectedGraph.from_edge_arrays(
+        V, v1s, v2s, np.asarray(base.edge_weights) + potential[v1s] - potential[v2s])
+    print(f"V = {V}, E = {E}, {int((np.asarray(graph.edge_weights) < 0).sum())} negative edges")
+
+    start = time.perf_counter()
+    bellman_ford_sssp = BellmanFordSSSP(graph, 0)
+    print(f"BellmanFordSSSP: {time.perf_counter() - start : .3f} s")
+
+    # the shift changes every path from 0 to v by the same amount, potential[0] - potential[v]
+    expected = DijkstraSSSP(base, 0).dist_to
+    assert all(d == e + potential[0] - potential[v] if e != float("inf") else d == e
+               for v, (d, e) in enumerate(zip(bellman_ford_sssp.dist_to, expected)))
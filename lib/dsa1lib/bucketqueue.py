@@ -0,0 +1,272 @@
+from typing import Any
+import weakref
+
+# largest integral edge weight for which integer_pq_for() returns a DialQueue. Emptying the queue can scan up to
+# V * max_step buckets, which on a 100000 vertex path with weight 1000 is 25x slower than IndexedMinPQ
+DIAL_MAX_STEP = 255
+
+
+class DialQueue:
+    """Monotone priority queue of integral keys, Dial's bucket queue. Bucket k % (max_step + 1) holds the indices
+    with key k, and since every key in the queue is within max_step of the smallest one, the buckets are used in a
+    circle. del_min never returns a key smaller than the previous one, so the queue suits Dijkstra with integer
+    weights up to max_step.
+
+    decrease_key appends the index to its new bucket and leaves the old entry behind, entries whose index no longer
+    has that key are dropped when their bucket is reached.
+    """
+
+    def __init__(self, max_len: int, max_step: int):
+        """
+        Args:
+            max_len (int): Number of indices.
+            max_step (int): Largest difference between a key and the smallest key, the largest edge weight.
+        """
+        self.max_len = max_len
+        self.index_to_key: list = [None] * max_len
+        self._buckets: list[list[int]] = [[] for _ in range(max_step + 1)]
+        self._cur = 0  # key of the bucket being emptied, no smaller key can be in the queue
+        self._len = 0
+
+    def _check_key(self, key):
+        if key != int(key):
+            raise ValueError("Keys must be integral")
+        if key < self._cur or key >= self._cur + len(self._buckets):
+            if self._len:
+                raise ValueError("Key outside of the window of the bucket queue")
+            # an empty queue can start over anywhere
+            self._cur = int(key)
+
+    def insert(self, index: int, key):
+        if self.index_to_key[index] is not None:
+            raise KeyError("Value at provided index already exists")
+
+        self._check_key(key)
+        self.index_to_key[index] = key
+        self._buckets[int(key) % len(self._buckets)].append(index)
+        self._len += 1
+
+    def key_of_index(self, index: int):
+        return self.index_to_key[index]
+
+    def contains(self, index: int) -> bool:
+        return self.index_to_key[index] is not None
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        old_key = self.index_to_key[index]
+        if old_key is None:
+            self.insert(index, key)
+        elif key < old_key:
+            self.decrease_key(index, key)
+        else:
+            return False
+        return True
+
+    def decrease_key(self, index: int, key) -> None:
+        if not self.contains(index):
+            raise KeyError("Index is not in the heap")
+        if self.index_to_key[index] < key:
+            raise ValueError("Keys can only decrease")
+        if self.index_to_key[index] == key:
+            return
+
+        self._check_key(key)
+        self.index_to_key[index] = key
+        self._buckets[int(key) % len(self._buckets)].append(index)
+
+    def _advance(self) -> list[int]:
+        """Moves to the first bucket whose last entry is live, dropping stale entries on the way.
+        """
+        if not self._len:
+            raise IndexError("Heap empty")
+
+        buckets, keys = self._buckets, self.index_to_key
+        n_buckets, cur = len(buckets), self._cur
+        while True:
+            bucket = buckets[cur % n_buckets]
+            while bucket:
+                if keys[bucket[-1]] == cur:
+                    self._cur = cur
+                    return bucket
+                bucket.pop()
+            cur += 1
+
+    def min(self) -> int:
+        return self._advance()[-1]
+
+    def del_min(self) -> tuple[int, Any]:
+        index = self._advance().pop()
+        key = self.index_to_key[index]
+        self.index_to_key[index] = None
+        self._len -= 1
+        return index, key
+
+    def __len__(self):
+        return self._len
+
+
+class RadixHeap:
+    """Monotone priority queue of integral keys below 2^64, a radix heap. Bucket 0 holds keys equal to the last
+    deleted key, bucket b > 0 the keys whose highest bit differing from it is bit b - 1. When bucket 0 runs out, the
+    first non empty bucket is split by its smallest key, so every key moves down at most 64 times. Unlike DialQueue
+    the cost does not depend on how large the keys get.
+
+    decrease_key leaves stale entries behind like DialQueue, an entry is live while its index has a key that belongs
+    to the entry's bucket.
+    """
+
+    def __init__(self, max_len: int):
+        """
+        Args:
+            max_len (int): Number of indices.
+        """
+        self.max_len = max_len
+        self.index_to_key: list = [None] * max_len
+        self._buckets: list[list[int]] = [[] for _ in range(65)]
+        self._last = 0  # last deleted key, no smaller key can be in the queue
+        self._len = 0
+
+    def _check_key(self, key):
+        if key != int(key):
+            raise ValueError("Keys must be integral")
+        if key < self._last:
+            if self._len:
+                raise ValueError("Key is smaller than the last deleted key")
+            self._last = int(key)
+
+    def insert(self, index: int, key):
+        if self.index_to_key[index] is not None:
+            raise KeyError("Value at provided index already exists")
+
+        self._check_key(key)
+        self.index_to_key[index] = key
+        self._buckets[(int(key) ^ self._last).bit_length()].append(index)
+        self._len += 1
+
+    def key_of_index(self, index: int):
+        return self.index_to_key[index]
+
+    def contains(self, index: int) -> bool:
+        return self.index_to_key[index] is not None
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        old_key = self.index_to_key[index]
+        if old_key is None:
+            self.insert(index, key)
+        elif key < old_key:
+            self.decrease_key(index, key)
+        else:
+            return False
+        return True
+
+    def decrease_key(self, index: int, key) -> None:
+        if not self.contains(index):
+            raise KeyError("Index is not in the heap")
+        if self.index_to_key[index] < key:
+            raise ValueError("Keys can only decrease")
+        if self.index_to_key[index] == key:
+            return
+
+        self._check_key(key)
+        self.index_to_key[index] = key
+        self._buckets[(int(key) ^ self._last).bit_length()].append(index)
+
+    def _advance(self) -> list[int]:
+        """Refills bucket 0 until its last entry is live, and returns it.
+        """
+        if not self._len:
+            raise IndexError("Heap empty")
+
+        buckets, keys = self._buckets, self.index_to_key
+        lowest = buckets[0]
+        while True:
+            while lowest:
+                if keys[lowest[-1]] == self._last:
+                    return lowest
+                lowest.pop()
+
+            b = 1
+            while not buckets[b]:
+                b += 1
+            # entries whose key no longer belongs to bucket b are stale, the live entry of the index is elsewhere
+            last = self._last
+            entries = [index for index in buckets[b]
+                       if keys[index] is not None and (int(keys[index]) ^ last).bit_length() == b]
+            buckets[b] = []
+            if not entries:
+                continue
+
+            last = self._last = int(min(keys[index] for index in entries))
+            for index in entries:
+                buckets[(int(keys[index]) ^ last).bit_length()].append(index)
+
+    def min(self) -> int:
+        return self._advance()[-1]
+
+    def del_min(self) -> tuple[int, Any]:
+        index = self._advance().pop()
+        key = self.index_to_key[index]
+        self.index_to_key[index] = None
+        self._len -= 1
+        return index, key
+
+    def __len__(self):
+        return self._len
+
+
+def dial_max_step(weights) -> int | None:
+    """max_step of a DialQueue over edges with the given weights, if they are all integers from 0 to DIAL_MAX_STEP.
+
+    Args:
+        weights: Edge weights.
+
+    Returns:
+        int | None: Largest weight, None if a comparison heap is needed.
+    """
+    if not len(weights) or min(weights) < 0 or max(weights) > DIAL_MAX_STEP:
+        return None
+    if not all(map(float.is_integer, weights)):
+        return None
+    return int(max(weights))
+
+
+def integer_pq_for(weights, max_len: int) -> DialQueue | None:
+    """DialQueue for Dijkstra over edges with the given weights, if they are all integers from 0 to DIAL_MAX_STEP.
+    Otherwise None, for a comparison heap. RadixHeap is not picked here: in python its bucket moves cost about as
+    much as the sifts of the 4-ary IndexedMinPQ, so it only pays off when keys are too spread out for buckets.
+
+    Args:
+        weights: Edge weights.
+        max_len (int): Number of vertices.
+
+    Returns:
+        DialQueue | None: Queue to use, None for a comparison heap.
+    """
+    max_step = dial_max_step(weights)
+    return DialQueue(max_len, max_step) if max_step is not None else None
+
+
+# graph -> (version, dial_max_step() of its weights at that version)
+_max_steps: "weakref.WeakKeyDictionary[Any, tuple[int, int | None]]" = weakref.WeakKeyDictionary()
+
+
+def integer_pq_of(graph) -> DialQueue | None:
+    """integer_pq_for() over the edge weights of graph. The result of the weight scan is kept per graph with the
+    version it was made at, like SSSPCache keeps trees, so it is paid once per change of the graph rather than once
+    per search. Graphs are held weakly, and objects without a version are scanned every time.
+
+    Args:
+        graph (WeightedGraph | CSRWeightedGraph | SubgraphView): Graph to search.
+
+    Returns:
+        DialQueue | None: Queue to use, None for a comparison heap.
+    """
+    version = getattr(graph, "version", None)
+    entry = _max_steps.get(graph) if version is not None else None
+    if entry is not None and entry[0] == version:
+        max_step = entry[1]
+    else:
+        max_step = dial_max_step(graph.edge_weights)
+        if version is not None:
+            _max_steps[graph] = (version, max_step)
+    return DialQueue(graph.num_vertices, max_step) if max_step is not None else None
@@ -0,0 +1,473 @@
+from array import array
+from mmap import ACCESS_READ, mmap as memory_map
+from dsa1lib.graph import DirectedGraph, Graph, WeightedDirectedEdge, WeightedDirectedGraph, WeightedEdge, \
+    WeightedGraph, WeightedUndirectedEdge
+import struct
+import sys
+
+# on-disk layout: 64 byte header, then the arrays in _sections() order, each padded to 8 bytes
+_MAGIC = b"DSA1CSR\x00"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQ")  # magic, version, flags, V, E, number of adjacency slots
+_HEADER_SIZE = 64
+_DIRECTED = 1
+_WEIGHTED = 2
+
+
+class CSRGraph:
+    """Immutable compressed sparse row (CSR) graph. Neighbors of v are targets[offsets[v]:offsets[v + 1]], so the
+    whole adjacency lives in two flat arrays instead of a list of python lists. Built with Graph.freeze().
+    """
+
+    def __init__(self, V: int, E: int, offsets: array, targets: array, directed: bool) -> None:
+        """
+        Args:
+            V (int): Number of vertices.
+            E (int): Number of edges.
+            offsets (array): V + 1 offsets into targets.
+            targets (array): Adjacent vertices, grouped by source vertex.
+            directed (bool): False if every edge is stored from both of its endpoints.
+        """
+        self._V = V
+        self._E = E
+        self._offsets = offsets
+        self._targets = targets
+        self._targets_view = memoryview(targets)
+        self.directed = directed
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CSRGraph":
+        offsets = cls._offsets_of(graph)
+        targets = array("i")
+        for v in range(graph.num_vertices):
+            targets.extend(graph._adj[v])
+        return cls(graph.num_vertices, graph.num_edges, offsets, targets, isinstance(graph, DirectedGraph))
+
+    @staticmethod
+    def _offsets_of(graph: Graph) -> array:
+        offsets = array("q", [0]) * (graph.num_vertices + 1)
+        for v in range(graph.num_vertices):
+            offsets[v + 1] = offsets[v] + len(graph._adj[v])
+        return offsets
+
+    @property
+    def offsets(self) -> array:
+        """V + 1 offsets, the adjacency slots of v are offsets[v] up to offsets[v + 1]. Do not modify.
+        """
+        return self._offsets
+
+    @property
+    def targets(self) -> memoryview:
+        """Adjacent vertex of every adjacency slot, as a zero-copy view. Do not modify.
+        """
+        return self._targets_view
+
+    @property
+    def version(self) -> int:
+        """Mutation counter, always 0 since a frozen graph never changes.
+
+        Returns:
+            int: Version of the graph.
+        """
+        return 0
+
+    @property
+    def num_vertices(self) -> int:
+        """Number of vertices in the graph.
+
+        Returns:
+            int: Number of vertices in the graph.
+        """
+        return self._V
+
+    @property
+    def num_edges(self) -> int:
+        """Number of edges in the graph.
+
+        Returns:
+            int: Number of edges in the graph.
+        """
+        return self._E
+
+    def _check_vertex(self, v: int):
+        if v < 0 or v >= self._V:
+            raise ValueError(
+                "Vertex in not within bounds of the number of vertex for the graph.")
+
+    def degree(self, v: int) -> int:
+        """Number of adjacency slots of v (out-degree for directed graphs).
+
+        Args:
+            v (int): Vertex.
+
+        Returns:
+            int: Degree of v.
+        """
+        self._check_vertex(v)
+        return self._offsets[v + 1] - self._offsets[v]
+
+    def adj(self, v: int) -> memoryview:
+        """The adjacent vertices of v, as a zero-copy slice of the targets array.
+
+        Args:
+            v (int): Vertex whose neighbors to find.
+
+        Returns:
+            memoryview: Adjacent vertices to the provided vertex.
+        """
+        self._check_vertex(v)
+        return self._targets_view[self._offsets[v]:self._offsets[v + 1]]
+
+    def reverse(self) -> "CSRGraph":
+        """Transpose of a directed graph, built with a counting pass over the targets.
+
+        Returns:
+            CSRGraph: Graph with every edge reversed.
+        """
+        if not self.directed:
+            return self
+
+        offsets = self._reverse_offsets()
+        fill = offsets[:-1]
+        targets = array("i", [0]) * len(self._targets)
+        for v1 in range(self._V):
+            for v2 in self.adj(v1):
+                targets[fill[v2]] = v1
+                fill[v2] += 1
+
+        return CSRGraph(self._V, self._E, offsets, targets, True)
+
+    def _reverse_offsets(self) -> array:
+        """Offsets of the transpose, from a count of the slots pointing at each vertex.
+        """
+        offsets = array("q", [0]) * (self._V + 1)
+        for v2 in self._targets:
+            offsets[v2 + 1] += 1
+        for v in range(self._V):
+            offsets[v + 1] += offsets[v]
+        return offsets
+
+    def _sections(self) -> list:
+        return [self._offsets, self._targets]
+
+    def save(self, path: str) -> None:
+        """Writes the graph in the binary layout read by load(). 
+
+        Args:
+            path (str): File to write.
+        """
+        flags = (_DIRECTED if self.directed else 0) | (_WEIGHTED if isinstance(self, CSRWeightedGraph) else 0)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, flags, self._V,
+                       self._E, len(self._targets)).ljust(_HEADER_SIZE, b"\0"))
+            for section in self._sections():
+                data = memoryview(section).cast("B")
+                file.write(data)
+                file.write(b"\0" * (-len(data) % 8))
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "CSRGraph":
+        """Reads a graph written by save(). With mmap the arrays are read-only views into the mapped file, so
+        nothing is parsed up front and pages are read from disk the first time they are touched.
+
+        Args:
+            path (str): File to read.
+            mmap (bool, optional): Map the file instead of reading it into memory. Defaults to True.
+
+        Returns:
+            CSRGraph: CSRGraph, or CSRWeightedGraph for weighted graphs.
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Graph files are little endian.")
+
+        with open(path, "rb") as file:
+            magic, version, flags, V, E, num_slots = _HEADER.unpack(file.read(_HEADER_SIZE)[:_HEADER.size])
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError("Not a dsa1lib graph file.")
+
+            if mmap:
+                buffer = memoryview(memory_map(file.fileno(), 0, access=ACCESS_READ))
+            else:
+                file.seek(0)
+                buffer = memoryview(file.read())
+
+        layout = [("q", V + 1), ("i", num_slots)]
+        if flags & _WEIGHTED:
+            layout += [("d", num_slots), ("i", num_slots), ("i", E), ("i", E), ("d", E)]
+
+        sections = []
+        position = _HEADER_SIZE
+        for typecode, length in layout:
+            size = length * array(typecode).itemsize
+            section = buffer[position:position + size]
+            if mmap:
+                sections.append(section.cast(typecode))
+            else:
+                packed = array(typecode)
+                packed.frombytes(section)
+                sections.append(packed)
+            position += size + (-size % 8)
+
+        if flags & _WEIGHTED:
+            return CSRWeightedGraph(V, *sections, directed=bool(flags & _DIRECTED))
+        return CSRGraph(V, E, *sections, directed=bool(flags & _DIRECTED))
+
+    def __repr__(self) -> str:
+        repre = ""
+        for v in range(self._V):
+            repre += f"{v}: " + str(list(self.adj(v))) + "\n"
+        return repre
+
+
+class CSRWeightedGraph(CSRGraph):
+    """Immutable CSR weighted graph. Besides offsets and targets, every adjacency slot has a weight and the id of its
+    edge, and edges themselves are kept in flat edge_v1/edge_v2/edge_weight arrays.
+    """
+
+    def __init__(self, V: int, offsets: array, targets: array, weights: array, slot_edge: array,
+                 edge_v1: array, edge_v2: array, edge_weight: array, directed: bool) -> None:
+        super().__init__(V, len(edge_v1), offsets, targets, directed)
+        self._weights = weights
+        self._weights_view = memoryview(weights)
+        self._slot_edge = slot_edge
+        self._slot_edge_view = memoryview(slot_edge)
+        self._edge_v1 = edge_v1
+        self._edge_v2 = edge_v2
+        self._edge_weight = edge_weight
+        self._edge_cls = WeightedDirectedEdge if directed else WeightedUndirectedEdge
+        self._edge_views: list[WeightedEdge] | None = None
+
+    @classmethod
+    def from_graph(cls, graph: WeightedGraph) -> "CSRWeightedGraph":
+        offsets = cls._offsets_of(graph)
+        targets, weights, slot_edge = array("i"), array("d"), array("i")
+
+        edge_v1, edge_v2, edge_weight = array("i", graph.edge_v1), array("i", graph.edge_v2), array(
+            "d", graph.edge_weights)
+
+        for v in range(graph.num_vertices):
+            eids = graph.adj_ids(v)
+            slot_edge.extend(eids)
+            for eid in eids:
+                # undirected edges are listed at both endpoints, the target is whichever end is not v
+                targets.append(edge_v2[eid] if edge_v1[eid] == v else edge_v1[eid])
+                weights.append(edge_weight[eid])
+
+        return cls(graph.num_vertices, offsets, targets, weights, slot_edge, edge_v1, edge_v2, edge_weight,
+                   isinstance(graph, WeightedDirectedGraph))
+
+    @property
+    def slot_weights(self) -> memoryview:
+        """Weight of every adjacency slot, parallel to targets, as a zero-copy view. Do not modify.
+        """
+        return self._weights_view
+
+    @property
+    def slot_edges(self) -> memoryview:
+        """Edge id of every adjacency slot, parallel to targets, as a zero-copy view. Do not modify.
+        """
+        return self._slot_edge_view
+
+    @property
+    def edge_v1(self) -> array:
+        return self._edge_v1
+
+    @property
+    def edge_v2(self) -> array:
+        return self._edge_v2
+
+    @property
+    def edge_weights(self) -> array:
+        return self._edge_weight
+
+    def edge(self, eid: int) -> WeightedEdge:
+        """Edge object for the edge id, for code that works on WeightedEdge.
+
+        Args:
+            eid (int): Edge id.
+
+        Returns:
+            WeightedEdge: Edge with the stored endpoints and weight.
+        """
+        return self._edge_cls(self._edge_v1[eid], self._edge_v2[eid], self._edge_weight[eid], eid)
+
+    def adj(self, v: int) -> list[WeightedEdge]:
+        """Adjacent edges of v. Edge objects are made on the fly, use neighbors() in hot loops.
+
+        Args:
+            v (int): Vertex whose adjacent edges to find.
+
+        Returns:
+            list[WeightedEdge]: Adjacent edges to the provided vertex.
+        """
+        self._check_vertex(v)
+        return [self.edge(eid) for eid in self._slot_edge_view[self._offsets[v]:self._offsets[v + 1]]]
+
+    def adj_ids(self, v: int) -> memoryview:
+        """Ids of the adjacent edges of v, as a zero-copy slice.
+
+        Args:
+            v (int): Vertex whose adjacent edges to find.
+
+        Returns:
+            memoryview: Adjacent edge ids.
+        """
+        self._check_vertex(v)
+        return self._slot_edge_view[self._offsets[v]:self._offsets[v + 1]]
+
+    def neighbors(self, v: int) -> tuple[memoryview, memoryview]:
+        """Adjacent vertices of v and the weights of the edges to them, as zero-copy slices.
+
+        Args:
+            v (int): Vertex whose neighbors to find.
+
+        Returns:
+            tuple[memoryview, memoryview]: Adjacent vertices, and the weights of the edges to them.
+        """
+        self._check_vertex(v)
+        lo, hi = self._offsets[v], self._offsets[v + 1]
+        return self._targets_view[lo:hi], self._weights_view[lo:hi]
+
+    def edge_ids(self) -> range:
+        """Ids of the edges of the graph, every edge once, see WeightedGraph.edge_ids().
+
+        Returns:
+            range: Edge ids.
+        """
+        return range(self._E)
+
+    def _sections(self) -> list:
+        return super()._sections() + [self._weights, self._slot_edge, self._edge_v1, self._edge_v2, self._edge_weight]
+
+    def get_all_edges(self) -> list[WeightedEdge]:
+        if self._edge_views is None:
+            self._edge_views = [self.edge(eid) for eid in range(self._E)]
+        return list(self._edge_views)
+
+    def reverse(self) -> "CSRWeightedGraph":
+        """Transpose of a directed graph, built with the same counting pass as CSRGraph.reverse(). Edge eid of the
+        transpose is the reverse of edge eid, so the edge ids are shared with this graph.
+
+        Returns:
+            CSRWeightedGraph: Graph with every edge reversed.
+        """
+        if not self.directed:
+            return self
+
+        offsets = self._reverse_offsets()
+        fill = offsets[:-1]
+        num_slots = len(self._targets)
+        targets, weights, slot_edge = array("i", [0]) * num_slots, array("d", [0.0]) * num_slots, \
+            array("i", [0]) * num_slots
+        for v1 in range(self._V):
+            for slot in range(self._offsets[v1], self._offsets[v1 + 1]):
+                v2 = self._targets[slot]
+                at = fill[v2]
+                targets[at] = v1
+                weights[at] = self._weights[slot]
+                slot_edge[at] = self._slot_edge[slot]
+                fill[v2] += 1
+
+        # the edge arrays are never written, so the transpose shares them with the ends swapped
+        return CSRWeightedGraph(self._V, offsets, targets, weights, slot_edge, self._edge_v2, self._edge_v1,
+                                self._edge_weight, True)
+
+    def __repr__(self) -> str:
+        repre = ""
+        for v in range(self._V):
+            repre += f"{v}: " + str(self.adj(v)) + "\n"
+        return repre
+
+
+if __name__ == "__main__":
+    # memory and adjacency scan throughput of the list-of-lists layout against the frozen CSR layout
+    # and load time of the text edge list against the binary file
+    # usage: python -m dsa1lib.csr [V] [E]
+    import os
+    import random
+    import shutil
+    import tempfile
+    import time
+    import tracemalloc
+    from dsa1lib.shortestpath import DijkstraSSSP
+
+    V = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    E = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    rng = random.Random(50)
+
+    tracemalloc.start()
+    graph = WeightedDirectedGraph(V)
+    for _ in range(E):
+        graph.add_edge(rng.randrange(V), rng.randrange(V), rng.random())
+    list_bytes = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.reset_peak()
+    frozen = graph.freeze()
+    csr_bytes = tracemalloc.get_traced_memory()[0] - list_bytes
+    tracemalloc.stop()
+
+    print(f"V = {V}, E = {E}")
+    print(f"list of lists : {list_bytes / 2 ** 20 : .1f} MiB")
+    print(f"csr           : {csr_bytes / 2 ** 20 : .1f} MiB")
+
+    def scan_lists():
+        total = 0.0
+        for v in range(V):
+            for edge in graph.adj(v):
+                total += edge.weight
+        return total
+
+    def scan_csr():
+        total = 0.0
+        for v in range(V):
+            _, weights = frozen.neighbors(v)
+            for w in weights:
+                total += w
+        return total
+
+    for name, run in [("scan list of lists", scan_lists), ("scan csr", scan_csr),
+                      ("dijkstra list of lists", lambda: DijkstraSSSP(graph, 0)),
+                      ("dijkstra csr", lambda: DijkstraSSSP(frozen, 0))]:
+        start = time.perf_counter()
+        run()
+        print(f"{name : <24}: {time.perf_counter() - start : .3f} s")
+
+    # round trip through the text edge list loaders and the binary file
+    directory = tempfile.mkdtemp()
+    text_path, binary_path = os.path.join(directory, "graph.txt"), os.path.join(directory, "graph.csr")
+    with open(text_path, "w") as file:
+        file.write(f"{V} {E}\n")
+        for v1, v2, w in zip(graph.edge_v1, graph.edge_v2, graph.edge_weights):
+            file.write(f"{v1} {v2} {w!r}\n")
+    graph.save(binary_path)
+    print(f"text file     : {os.path.getsize(text_path) / 2 ** 20 : .1f} MiB")
+    print(f"binary file   : {os.path.getsize(binary_path) / 2 ** 20 : .1f} MiB")
+
+    def load_text_per_edge():
+        with open(text_path) as file:
+            V, E = [int(inp) for inp in file.readline().split()]
+            text_graph = WeightedDirectedGraph(V)
+            for line in file:
+                v1, v2, w = line.split()
+                text_graph.add_edge(int(v1), int(v2), float(w))
+        return text_graph
+
+    def load_text_bulk():
+        with open(text_path) as file:
+            V, E = [int(inp) for inp in file.readline().split()]
+            edges = [line.split() for line in file]
+        return WeightedDirectedGraph.from_edge_arrays(
+            V, [int(e[0]) for e in edges], [int(e[1]) for e in edges], [float(e[2]) for e in edges])
+
+    for name, load in [("text, add_edge", load_text_per_edge), ("text, from_edge_arrays", load_text_bulk),
+                       ("binary, read", lambda: CSRGraph.load(binary_path, mmap=False)),
+                       ("binary, mmap", lambda: CSRGraph.load(binary_path))]:
+        start = time.perf_counter()
+        loaded = load()
+        loaded_at = time.perf_counter()
+        first_query = DijkstraSSSP(loaded, 0).dist_to
+        print(f"{name : <24}: load {loaded_at - start : .3f} s, load + first dijkstra "
+              f"{time.perf_counter() - start : .3f} s")
+        assert first_query == DijkstraSSSP(frozen, 0).dist_to
+
+    shutil.rmtree(directory)
@@ -0,0 +1,217 @@
+from concurrent.futures import ThreadPoolExecutor
+from dsa1lib.csr import CSRWeightedGraph
+from dsa1lib.graph import WeightedGraph
+from dsa1lib.shortestpath import SingleSourceShortestPathAlgo
+import heapq
+import numpy as np
+
+# frontiers with fewer adjacency slots than this are relaxed in the calling thread even when workers are given
+_MIN_PARALLEL_SLOTS = 1 << 16
+
+
+class _CSRArrays:
+    """numpy views of the arrays of a frozen graph, no copies.
+    """
+
+    def __init__(self, graph: CSRWeightedGraph):
+        self.V = graph.num_vertices
+        self.offsets = np.asarray(graph.offsets, dtype=np.int64)
+        self.targets = np.asarray(graph.targets, dtype=np.int32)
+        self.weights = np.asarray(graph.slot_weights, dtype=np.float64)
+        self.slot_edge = np.asarray(graph.slot_edges, dtype=np.int32)
+
+
+def _slots_of(csr: _CSRArrays, vertices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Adjacency slots of the vertices, and the vertex each slot belongs to.
+    """
+    starts = csr.offsets[vertices]
+    counts = csr.offsets[vertices + 1] - starts
+    owners = np.repeat(vertices, counts)
+    # slot k of the result is start of its vertex plus its rank among the slots of that vertex
+    first = np.cumsum(counts) - counts
+    slots = np.arange(counts.sum(), dtype=np.int64) - np.repeat(first - starts, counts)
+    return slots, owners
+
+
+def _candidates(csr: _CSRArrays, dist: np.ndarray, vertices: np.ndarray,
+                light: bool, delta: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Relaxations along the light (weight <= delta) or heavy edges out of vertices that would improve a distance,
+    as targets, new distances and slots.
+    """
+    slots, owners = _slots_of(csr, vertices)
+    weights = csr.weights[slots]
+    keep = weights <= delta if light else weights > delta
+    slots, owners, weights = slots[keep], owners[keep], weights[keep]
+
+    targets = csr.targets[slots]
+    new_dist = dist[owners] + weights
+    better = new_dist < dist[targets]
+    return targets[better], new_dist[better], slots[better]
+
+
+def delta_stepping(graph: CSRWeightedGraph, source: int, delta: float | None = None,
+                   workers: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """Delta-stepping single source shortest paths. Tentative distances are grouped in buckets of width delta, and
+    the smallest non empty bucket is emptied in phases: all light edges out of the bucket are relaxed at once,
+    vertices that land back in the bucket are relaxed again, and once the bucket stays settled its heavy edges are
+    relaxed once. Every phase is a handful of numpy operations over the CSR arrays, and of all the relaxations into
+    a vertex in a phase the shortest wins.
+
+    delta = smallest weight makes every bucket hold one distance, like Dijkstra, and delta = inf is Bellman-Ford
+    over light edges. In between fewer, larger phases trade python overhead for repeated relaxations.
+
+    Args:
+        graph (CSRWeightedGraph): Frozen graph with non negative edge weights.
+        source (int): Source vertex.
+        delta (float | None, optional): Bucket width. Defaults to the largest weight over the average degree.
+        workers (int, optional): Threads the relaxations of large frontiers are split across, by ranges of frontier
+            vertices. numpy releases the GIL in the gathers, so the threads share the graph and the distance array
+            without copies. Defaults to 1.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Distance to every vertex (inf if unreachable), and the id of the edge into
+            every vertex on its shortest path (-1 for the source and unreachable vertices).
+    """
+    csr = _CSRArrays(graph)
+    if source < 0 or source >= csr.V:
+        raise ValueError(
+            "Vertex in not within bounds of the number of vertex for the graph.")
+    if len(csr.weights) and csr.weights.min() < 0:
+        raise ValueError("Delta-stepping needs non negative edge weights.")
+    if delta is None:
+        delta = float(csr.weights.max()) * csr.V / len(csr.weights) if len(csr.weights) else 1.0
+    if delta <= 0:
+        # zero weight edges would all be heavy and never settle within a bucket
+        delta = float(np.min(csr.weights[csr.weights > 0], initial=1.0))
+
+    dist = np.full(csr.V, np.inf)
+    pred_slot = np.full(csr.V, -1, dtype=np.int64)
+    done = np.zeros(csr.V, dtype=bool)
+    dist[source] = 0.0
+    pool = ThreadPoolExecutor(workers) if workers > 1 else None
+
+    # bucket number -> arrays of the vertices that got a distance in it, and a heap of the bucket numbers. A vertex
+    # whose distance drops later is filed again under its new bucket, the old entry is skipped when its bucket comes
+    buckets: dict[int, list[np.ndarray]] = {}
+    bucket_numbers: list[int] = []
+
+    def bucket_of(vertices: np.ndarray) -> np.ndarray:
+        return np.floor(dist[vertices] / delta).astype(np.int64)
+
+    def file(vertices: np.ndarray):
+        """Files vertices under the buckets of their distances.
+        """
+        if not len(vertices):
+            return
+        numbers = bucket_of(vertices)
+        order = np.argsort(numbers, kind="stable")
+        numbers, vertices = numbers[order], vertices[order]
+        starts = np.flatnonzero(np.diff(numbers)) + 1
+        for number, part in zip(numbers[np.r_[0, starts]].tolist(), np.split(vertices, starts)):
+            if number not in buckets:
+                buckets[number] = []
+                heapq.heappush(bucket_numbers, number)
+            buckets[number].append(part)
+
+    def relax(vertices: np.ndarray, light: bool) -> np.ndarray:
+        """Applies the best relaxation into each target, returns the targets that improved.
+        """
+        if pool is not None and csr.offsets[vertices + 1].sum() - csr.offsets[vertices].sum() >= _MIN_PARALLEL_SLOTS:
+            parts = pool.map(lambda part: _candidates(csr, dist, part, light, delta), np.array_split(vertices, workers))
+            targets, new_dist, slots = (np.concatenate(column) for column in zip(*parts))
+        else:
+            targets, new_dist, slots = _candidates(csr, dist, vertices, light, delta)
+        if not len(targets):
+            return targets
+
+        # shortest relaxation into each target first
+        order = np.lexsort((new_dist, targets))
+        targets, new_dist, slots = targets[order], new_dist[order], slots[order]
+        first = np.ones(len(targets), dtype=bool)
+        first[1:] = targets[1:] != targets[:-1]
+        targets, new_dist, slots = targets[first], new_dist[first], slots[first]
+
+        dist[targets] = new_dist
+        pred_slot[targets] = slots
+        return targets
+
+    try:
+        file(np.array([source]))
+        while bucket_numbers:
+            number = heapq.heappop(bucket_numbers)
+            members = np.unique(np.concatenate(buckets.pop(number)))
+            # relaxations never lower a distance below the bucket being emptied, so stale entries are either done
+            # or filed again in a later bucket
+            frontier = members[~done[members] & (bucket_of(members) == number)]
+
+            settled = [frontier]
+            while len(frontier):
+                improved = relax(frontier, light=True)
+                in_bucket = bucket_of(improved) == number
+                file(improved[~in_bucket])
+                frontier = improved[in_bucket]
+                settled.append(frontier)
+
+            bucket = np.unique(np.concatenate(settled))
+            file(relax(bucket, light=False))
+            done[bucket] = True
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    edge_id_to = np.full(csr.V, -1, dtype=np.int64)
+    reached = pred_slot >= 0
+    edge_id_to[reached] = csr.slot_edge[pred_slot[reached]]
+    return dist, edge_id_to
+
+
+class DeltaSteppingSSSP(SingleSourceShortestPathAlgo):
+    """delta_stepping() behind the SingleSourceShortestPathAlgo surface. Distances are the ones DijkstraSSSP finds,
+    and so are the tree edges wherever the shortest path is unique. Graphs that are not frozen are frozen first.
+    """
+
+    def __init__(self, graph: WeightedGraph | CSRWeightedGraph, source: int, delta: float | None = None,
+                 workers: int = 1):
+        """
+        Args:
+            graph (WeightedGraph | CSRWeightedGraph): Graph with non negative edge weights.
+            source (int): Source vertex.
+            delta (float | None, optional): Bucket width, see delta_stepping(). Defaults to None.
+            workers (int, optional): Threads for relaxing large frontiers. Defaults to 1.
+        """
+        self.delta = delta
+        self.workers = workers
+        super().__init__(graph, source)  # type: ignore
+
+    def _find_shortest_path(self):
+        frozen = self.graph if isinstance(self.graph, CSRWeightedGraph) else self.graph.freeze()
+        dist, edge_id_to = delta_stepping(frozen, self.source, self.delta, self.workers)
+        self.dist_to = dist.tolist()
+        for v in np.flatnonzero(edge_id_to >= 0).tolist():
+            self.edge_to[v] = self.graph.edge(int(edge_id_to[v]))
+
+
+if __name__ == "__main__":
+    # delta-stepping against DijkstraSSSP on a frozen graph, for a few bucket widths
+    # usage: python -m dsa1lib.deltastepping [V] [workers]
+    import os
+    import sys
+    import time
+    from dsa1lib.generators import ErdosRenyi
+    from dsa1lib.shortestpath import DijkstraSSSP
+
+    V = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    graph = ErdosRenyi(V, 8 * V, seed=23, weight_range=(1, 1000)).to_csr()
+    print(f"V = {V}, E = {graph.num_edges}")
+
+    start = time.perf_counter()
+    expected = DijkstraSSSP(graph, 0).dist_to
+    print(f"DijkstraSSSP           : {time.perf_counter() - start : .3f} s")
+
+    for delta in (None, 50.0, 500.0):
+        for threads in sorted({1, workers}):
+            start = time.perf_counter()
+            dist, _ = delta_stepping(graph, 0, delta, threads)
+            print(f"delta {str(delta) : <6}, {threads} thread(s): {time.perf_counter() - start : .3f} s")
+            assert dist.tolist() == expected
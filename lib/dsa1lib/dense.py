@@ -0,0 +1,224 @@
+from array import array
+from itertools import compress
+from operator import lt
+from dsa1lib.graph import WeightedDirectedEdge, WeightedEdge, WeightedUndirectedEdge, _as_array
+import math
+
+
+class DenseWeightedGraph:
+    """Weighted graph stored as a contiguous V x V adjacency matrix, math.inf where there is no edge. Entry eid of
+    the matrix is the edge from eid // V to eid % V, so edge ids are matrix positions. A matrix holds one edge per
+    ordered pair: parallel edges keep the lighter weight. Undirected graphs keep the matrix symmetric.
+
+    DijkstraSSSP and PrimMST notice this graph and run their O(V^2) array-scan versions on it.
+    """
+
+    def __init__(self, V: int, directed: bool = True) -> None:
+        self._V = V
+        self._E = 0
+        self._version = 0
+        self.directed = directed
+        self._matrix = array("d", [math.inf]) * (V * V)
+        self._edge_cls = WeightedDirectedEdge if directed else WeightedUndirectedEdge
+
+    @classmethod
+    def from_graph(cls, graph) -> "DenseWeightedGraph":
+        """Dense copy of a weighted graph.
+
+        Args:
+            graph (WeightedGraph): Graph to copy.
+
+        Returns:
+            DenseWeightedGraph: The graph as an adjacency matrix.
+        """
+        dense = cls(graph.num_vertices, graph.directed)
+        edges = graph.get_all_edges()
+        v1s = [edge.any_vertex() for edge in edges]
+        dense.add_edges(v1s, [edge.other_vertex(v1) for edge, v1 in zip(edges, v1s)], [edge.weight for edge in edges])
+        return dense
+
+    @property
+    def num_vertices(self) -> int:
+        return self._V
+
+    @property
+    def num_edges(self) -> int:
+        return self._E
+
+    @property
+    def version(self) -> int:
+        """Mutation counter of the graph, changes whenever an edge is added or gets lighter.
+
+        Returns:
+            int: Version of the graph.
+        """
+        return self._version
+
+    @property
+    def matrix(self) -> array:
+        """Row major adjacency matrix, do not modify.
+
+        Returns:
+            array: V * V edge weights.
+        """
+        return self._matrix
+
+    def _check_vertex(self, v: int):
+        if v < 0 or v >= self._V:
+            raise ValueError(
+                "Vertex in not within bounds of the number of vertex for the graph.")
+
+    def add_edge(self, v1: int, v2: int, weight: float):
+        self._check_vertex(v1)
+        self._check_vertex(v2)
+        self._set(v1, v2, weight)
+
+    def add_edges(self, v1s, v2s, weights):
+        v1s, v2s, weights = _as_array("i", v1s), _as_array("i", v2s), _as_array("d", weights)
+        if not len(v1s) == len(v2s) == len(weights):
+            raise ValueError("Edge arrays have different lengths.")
+        for vs in (v1s, v2s):
+            if len(vs) and (min(vs) < 0 or max(vs) >= self._V):
+                raise ValueError("Edge has vertices outside of range.")
+
+        for v1, v2, weight in zip(v1s, v2s, weights):
+            self._set(v1, v2, weight)
+
+    def _set(self, v1: int, v2: int, weight: float):
+        eid = v1 * self._V + v2
+        if self._matrix[eid] == math.inf:
+            self._E += 1
+        if weight < self._matrix[eid]:
+            self._version += 1
+            self._matrix[eid] = weight
+            if not self.directed:
+                self._matrix[v2 * self._V + v1] = weight
+
+    def row(self, v: int) -> memoryview:
+        """Weights of the edges out of v, indexed by target, as a zero-copy slice of the matrix.
+
+        Args:
+            v (int): Vertex.
+
+        Returns:
+            memoryview: Row v of the matrix.
+        """
+        self._check_vertex(v)
+        return memoryview(self._matrix)[v * self._V:(v + 1) * self._V]
+
+    def edge(self, eid: int) -> WeightedEdge:
+        v1, v2 = divmod(eid, self._V)
+        return self._edge_cls(v1, v2, self._matrix[eid], eid)
+
+    def adj_ids(self, v: int) -> list[int]:
+        self._check_vertex(v)
+        first = v * self._V
+        return list(compress(range(first, first + self._V), map(lt, self.row(v), [math.inf] * self._V)))
+
+    def adj(self, v: int) -> list[WeightedEdge]:
+        return [self.edge(eid) for eid in self.adj_ids(v)]
+
+    def get_all_edges(self) -> list[WeightedEdge]:
+        return [self.edge(eid) for v in range(self._V) for eid in self.adj_ids(v)
+                if self.directed or eid % self._V >= v]
+
+    def __repr__(self) -> str:
+        repre = ""
+        for v in range(self._V):
+            repre += f"{v}: " + str(self.adj(v)) + "\n"
+        return repre
+
+
+def dense_dijkstra(graph: DenseWeightedGraph, source: int,
+                   target: int | None = None) -> tuple[list[float], list[int]]:
+    """O(V^2) Dijkstra. Each step picks the closest unsettled vertex with min() over a list and relaxes a whole
+    matrix row, so the inner loops run in C and no heap or edge objects are involved. Stops once target, if given,
+    is settled.
+
+    Returns:
+        tuple[list[float], list[int]]: Distance to each vertex, and its predecessor (-1 for none).
+    """
+    V, matrix = graph.num_vertices, graph.matrix
+    dist = [math.inf] * V
+    parent = [-1] * V
+    # distances of the unsettled vertices, settled ones are set to inf so min() skips them
+    frontier = [math.inf] * V
+    dist[source] = frontier[source] = 0.0
+
+    for _ in range(V):
+        closest = min(frontier)
+        if closest == math.inf:
+            break
+        u = frontier.index(closest)
+        frontier[u] = math.inf
+        if u == target:
+            break
+
+        through_u = [closest + weight for weight in matrix[u * V:(u + 1) * V]]
+        # settled vertices never improve with non negative weights, so comparing against dist is enough
+        for v in compress(range(V), map(lt, through_u, dist)):
+            dist[v] = frontier[v] = through_u[v]
+            parent[v] = u
+
+    return dist, parent
+
+
+def dense_prim(graph: DenseWeightedGraph, root: int = 0) -> list[int]:
+    """O(V^2) Prim over the adjacency matrix, for the tree containing root.
+
+    Returns:
+        list[int]: Parent of each vertex in the minimum spanning tree, -1 for the root and unreached vertices.
+    """
+    V, matrix = graph.num_vertices, graph.matrix
+    parent = [-1] * V
+    # lightest known edge into each vertex, -inf once the vertex is in the tree so it never improves
+    key = [math.inf] * V
+    # same keys for vertices outside the tree, inf inside it, for picking the next vertex with min()
+    frontier = [math.inf] * V
+    frontier[root] = 0.0
+
+    for _ in range(V):
+        lightest = min(frontier)
+        if lightest == math.inf:
+            break
+        u = frontier.index(lightest)
+        frontier[u] = math.inf
+        key[u] = -math.inf
+
+        row = matrix[u * V:(u + 1) * V]
+        for v in compress(range(V), map(lt, row, key)):
+            key[v] = frontier[v] = row[v]
+            parent[v] = u
+
+    return parent
+
+
+if __name__ == "__main__":
+    # list of edge objects against the matrix on dense graphs
+    # usage: python -m dsa1lib.dense [V] [density]
+    import random
+    import sys
+    import time
+    # the class DijkstraSSSP and PrimMST check for, not the copy defined in __main__
+    from dsa1lib.dense import DenseWeightedGraph
+    from dsa1lib.graph import WeightedUndirectedGraph
+    from dsa1lib.mst import PrimMST
+    from dsa1lib.shortestpath import DijkstraSSSP
+
+    V = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    density = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    rng = random.Random(9)
+
+    pairs = [(v1, v2) for v1 in range(V) for v2 in range(v1 + 1, V) if rng.random() < density]
+    sparse = WeightedUndirectedGraph.from_edge_arrays(
+        V, [v1 for v1, _ in pairs], [v2 for _, v2 in pairs], [rng.randint(1, 100) for _ in pairs])
+    dense = DenseWeightedGraph.from_graph(sparse)
+    print(f"V = {V}, E = {sparse.num_edges}")
+
+    for name, graph in [("list of edges", sparse), ("matrix", dense)]:
+        start = time.perf_counter()
+        dist_to = DijkstraSSSP(graph, 0).dist_to
+        dijkstra_at = time.perf_counter()
+        mst_weight = PrimMST(graph).mst_weight
+        print(f"{name : <14}: dijkstra {dijkstra_at - start : .3f} s, prim {time.perf_counter() - dijkstra_at : .3f} s,"
+              f" mst weight {mst_weight}, sum dist {sum(dist_to)}")
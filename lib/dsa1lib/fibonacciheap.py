@@ -0,0 +1,178 @@
+from typing import Any
+
+
+class FibonacciHeap:
+    """Indexed min Fibonacci heap. Nodes are the indices themselves: parent, child, circular left/right sibling
+    links, degree and mark live in flat lists. insert and decrease_key are O(1) amortized, del_min O(log n)
+    amortized through consolidating the root list.
+    """
+
+    def __init__(self, max_len: int):
+        self.max_len = max_len
+        self.index_to_key: list = [None] * max_len
+        self._parent = [-1] * max_len
+        self._child = [-1] * max_len
+        self._left = list(range(max_len))
+        self._right = list(range(max_len))
+        self._degree = [0] * max_len
+        self._mark = [False] * max_len
+        self._min = -1
+        self._len = 0
+
+    def _splice(self, x: int, y: int):
+        """Puts x, a node on its own, to the right of y in y's circular list.
+        """
+        right = self._right[y]
+        self._left[x] = y
+        self._right[x] = right
+        self._left[right] = x
+        self._right[y] = x
+
+    def _unlink(self, x: int):
+        """Takes x out of its circular list, leaving it on its own.
+        """
+        left, right = self._left[x], self._right[x]
+        self._right[left] = right
+        self._left[right] = left
+        self._left[x] = self._right[x] = x
+
+    def _add_root(self, x: int):
+        self._parent[x] = -1
+        if self._min == -1:
+            self._min = x
+        else:
+            self._splice(x, self._min)
+            if self.index_to_key[x] < self.index_to_key[self._min]:
+                self._min = x
+
+    def insert(self, index: int, key):
+        if self.index_to_key[index] is not None:
+            raise KeyError("Value at provided index already exists")
+
+        self.index_to_key[index] = key
+        self._left[index] = self._right[index] = index
+        self._child[index] = -1
+        self._degree[index] = 0
+        self._mark[index] = False
+        self._add_root(index)
+        self._len += 1
+
+    def key_of_index(self, index: int):
+        return self.index_to_key[index]
+
+    def contains(self, index: int) -> bool:
+        return self.index_to_key[index] is not None
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        old_key = self.index_to_key[index]
+        if old_key is None:
+            self.insert(index, key)
+        elif key < old_key:
+            self.decrease_key(index, key)
+        else:
+            return False
+        return True
+
+    def min(self) -> int:
+        return self._min
+
+    def _cut(self, x: int, parent: int):
+        """Moves x from the children of parent to the root list.
+        """
+        if self._child[parent] == x:
+            self._child[parent] = self._right[x] if self._right[x] != x else -1
+        self._unlink(x)
+        self._degree[parent] -= 1
+        self._mark[x] = False
+        self._add_root(x)
+
+    def decrease_key(self, index: int, key) -> None:
+        if not self.contains(index):
+            raise KeyError("Index is not in the heap")
+        keys = self.index_to_key
+        if keys[index] < key:
+            raise ValueError("Keys can only decrease")
+
+        keys[index] = key
+        parent = self._parent[index]
+        if parent != -1 and key < keys[parent]:
+            self._cut(index, parent)
+            # cascading cut: a node that loses a second child is cut as well
+            while self._parent[parent] != -1:
+                if not self._mark[parent]:
+                    self._mark[parent] = True
+                    break
+                grandparent = self._parent[parent]
+                self._cut(parent, grandparent)
+                parent = grandparent
+        elif key < keys[self._min]:
+            self._min = index
+
+    def del_min(self) -> tuple[int, Any]:
+        z = self._min
+        if z == -1:
+            raise IndexError("Heap empty")
+
+        key = self.index_to_key[z]
+        self.index_to_key[z] = None
+        self._len -= 1
+
+        # children of z go to the root list
+        child = self._child[z]
+        while child != -1:
+            next_child = self._right[child] if self._right[child] != child else -1
+            self._unlink(child)
+            self._parent[child] = -1
+            self._mark[child] = False
+            self._splice(child, z)
+            child = next_child
+        self._child[z] = -1
+
+        if self._right[z] == z:
+            self._min = -1
+        else:
+            self._min = self._right[z]
+            self._unlink(z)
+            self._consolidate()
+
+        return z, key
+
+    def _consolidate(self):
+        """Links roots of equal degree until all degrees differ, and finds the new minimum.
+        """
+        keys, degree = self.index_to_key, self._degree
+        roots = [self._min]
+        root = self._right[self._min]
+        while root != self._min:
+            roots.append(root)
+            root = self._right[root]
+
+        by_degree: list[int] = []
+        for x in roots:
+            d = degree[x]
+            while d < len(by_degree) and by_degree[d] != -1:
+                y = by_degree[d]
+                if keys[y] < keys[x]:
+                    x, y = y, x
+                # y becomes a child of x
+                self._unlink(y)
+                self._parent[y] = x
+                self._mark[y] = False
+                if self._child[x] == -1:
+                    self._child[x] = y
+                else:
+                    self._splice(y, self._child[x])
+                degree[x] += 1
+                by_degree[d] = -1
+                d += 1
+            if d >= len(by_degree):
+                by_degree.extend([-1] * (d + 1 - len(by_degree)))
+            by_degree[d] = x
+
+        self._min = -1
+        for x in by_degree:
+            if x != -1 and (self._min == -1 or keys[x] < keys[self._min]):
+                self._min = x
+
+    def __len__(self):
+        return self._len
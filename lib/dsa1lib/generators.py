@@ -0,0 +1,290 @@
+from typing import Iterator
+from dsa1lib.csr import CSRWeightedGraph
+from dsa1lib.graph import Graph, DirectedGraph, UndirectedGraph, WeightedDirectedGraph, WeightedUndirectedGraph, \
+    _as_array
+import numpy as np
+import abc
+
+# edges are generated, and added to graphs, in batches of this many
+CHUNK_SIZE = 1 << 20
+
+
+class GraphGenerator(abc.ABC):
+    """Seeded synthetic graph. Edges are drawn in numpy batches and streamed into the graph with add_edges(), so
+    no python level list of edges is ever built. The same seed gives the same graph, which also lets to_csr()
+    make two passes over the edges without keeping them.
+    """
+    directed = True
+
+    def __init__(self, V: int, seed: int = 0, weight_range: tuple[int, int] = (1, 100)):
+        """
+        Args:
+            V (int): Number of vertices.
+            seed (int, optional): Random seed. Defaults to 0.
+            weight_range (tuple[int, int], optional): Inclusive range of the integral edge weights. Defaults to (1, 100).
+        """
+        self.V = V
+        self.seed = seed
+        self.weight_range = weight_range
+
+    @abc.abstractmethod
+    def _edge_chunks(self, rng: np.random.Generator) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Yields batches of (v1s, v2s)."""
+        raise NotImplementedError
+
+    def chunks(self) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Batches of edges as int32 v1s, v2s and float64 weights.
+
+        Yields:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Endpoints and weights of a batch of edges.
+        """
+        rng = np.random.default_rng(self.seed)
+        low, high = self.weight_range
+        for v1s, v2s in self._edge_chunks(rng):
+            weights = rng.integers(low, high + 1, len(v1s)).astype(np.float64)
+            yield v1s.astype(np.int32), v2s.astype(np.int32), weights
+
+    def to_graph(self, weighted: bool = True) -> Graph:
+        """Builds the graph as a (weighted) directed or undirected dsa1lib graph.
+
+        Args:
+            weighted (bool, optional): Keep the edge weights. Defaults to True.
+
+        Returns:
+            Graph: The generated graph.
+        """
+        if weighted:
+            graph = (WeightedDirectedGraph if self.directed else WeightedUndirectedGraph)(self.V)
+        else:
+            graph = (DirectedGraph if self.directed else UndirectedGraph)(self.V)
+
+        for v1s, v2s, weights in self.chunks():
+            if weighted:
+                graph.add_edges(v1s, v2s, weights)
+            else:
+                graph.add_edges(v1s, v2s)
+        return graph
+
+    def to_csr(self) -> CSRWeightedGraph:
+        """Builds the frozen CSR graph directly. The first pass over the edges counts degrees, the second scatters
+        the edges into preallocated arrays.
+
+        Returns:
+            CSRWeightedGraph: The generated graph.
+        """
+        degrees = np.zeros(self.V, dtype=np.longlong)
+        E = 0
+        for v1s, v2s, _ in self.chunks():
+            degrees += np.bincount(v1s, minlength=self.V)
+            if not self.directed:
+                degrees += np.bincount(v2s, minlength=self.V)
+            E += len(v1s)
+
+        offsets = np.zeros(self.V + 1, dtype=np.longlong)
+        np.cumsum(degrees, out=offsets[1:])
+        cursor = offsets[:-1].copy()
+        targets = np.empty(offsets[-1], dtype=np.int32)
+        weights = np.empty(offsets[-1], dtype=np.float64)
+        slot_edge = np.empty(offsets[-1], dtype=np.int32)
+        edge_v1 = np.empty(E, dtype=np.int32)
+        edge_v2 = np.empty(E, dtype=np.int32)
+        edge_weight = np.empty(E, dtype=np.float64)
+
+        first_eid = 0
+        for v1s, v2s, chunk_weights in self.chunks():
+            last_eid = first_eid + len(v1s)
+            eids = np.arange(first_eid, last_eid, dtype=np.int32)
+            edge_v1[first_eid:last_eid] = v1s
+            edge_v2[first_eid:last_eid] = v2s
+            edge_weight[first_eid:last_eid] = chunk_weights
+
+            slots = (targets, weights, slot_edge)
+            _scatter(cursor, v1s, (v2s, chunk_weights, eids), slots)
+            if not self.directed:
+                _scatter(cursor, v2s, (v1s, chunk_weights, eids), slots)
+            first_eid = last_eid
+
+        return CSRWeightedGraph(self.V, _as_array("q", offsets), _as_array("i", targets), _as_array("d", weights),
+                                _as_array("i", slot_edge), _as_array("i", edge_v1), _as_array("i", edge_v2),
+                                _as_array("d", edge_weight), self.directed)
+
+    def save(self, path: str) -> None:
+        """Writes the generated graph in the binary CSR format, see CSRGraph.load().
+
+        Args:
+            path (str): File to write.
+        """
+        self.to_csr().save(path)
+
+
+def _scatter(cursor: np.ndarray, sources: np.ndarray, columns: tuple, slots: tuple):
+    """Writes a batch of adjacency entries at the next free slots of their source vertices."""
+    order = np.argsort(sources, kind="stable")
+    sorted_sources = sources[order]
+    counts = np.bincount(sorted_sources, minlength=len(cursor))
+    first_of_source = np.cumsum(counts) - counts
+    positions = cursor[sorted_sources] + np.arange(len(sorted_sources)) - first_of_source[sorted_sources]
+    for slot_column, column in zip(slots, columns):
+        slot_column[positions] = column[order]
+    cursor += counts
+
+
+def _batches(m: int) -> Iterator[int]:
+    while m > 0:
+        yield min(CHUNK_SIZE, m)
+        m -= CHUNK_SIZE
+
+
+class ErdosRenyi(GraphGenerator):
+    """G(n, m): m edges with uniformly random endpoints. Self loops and parallel edges are not filtered out."""
+
+    def __init__(self, n: int, m: int, directed: bool = True, seed: int = 0,
+                 weight_range: tuple[int, int] = (1, 100)):
+        super().__init__(n, seed, weight_range)
+        self.m = m
+        self.directed = directed
+
+    def _edge_chunks(self, rng):
+        for k in _batches(self.m):
+            yield rng.integers(0, self.V, k), rng.integers(0, self.V, k)
+
+
+class Grid2D(GraphGenerator):
+    """rows x cols undirected grid, vertex r * cols + c is joined to its right and lower neighbors."""
+    directed = False
+
+    def __init__(self, rows: int, cols: int, seed: int = 0, weight_range: tuple[int, int] = (1, 100)):
+        super().__init__(rows * cols, seed, weight_range)
+        self.rows = rows
+        self.cols = cols
+
+    def coordinates(self) -> np.ndarray:
+        """Position of every vertex on the grid, for the A* heuristics in dsa1lib.shortestpath.
+
+        Returns:
+            np.ndarray: V x 2 array, row v is (column, row) of vertex v.
+        """
+        rows, cols = np.divmod(np.arange(self.V), self.cols)
+        return np.column_stack((cols, rows)).astype(np.float64)
+
+    def _edge_chunks(self, rng):
+        rows_per_chunk = max(1, CHUNK_SIZE // (2 * self.cols))
+        for first_row in range(0, self.rows, rows_per_chunk):
+            rows = np.arange(first_row, min(first_row + rows_per_chunk, self.rows))
+
+            right = (rows[:, None] * self.cols + np.arange(self.cols - 1)).ravel()
+            down = (rows[rows < self.rows - 1][:, None] * self.cols + np.arange(self.cols)).ravel()
+            yield np.concatenate((right, down)), np.concatenate((right + 1, down + self.cols))
+
+
+class RMAT(GraphGenerator):
+    """Recursive matrix (R-MAT) power-law graph on 2^scale vertices. Each edge picks one quadrant of the adjacency
+    matrix per level with probabilities a, b, c and 1 - a - b - c.
+    """
+
+    def __init__(self, scale: int, m: int, a: float = 0.57, b: float = 0.19, c: float = 0.19,
+                 directed: bool = True, seed: int = 0, weight_range: tuple[int, int] = (1, 100)):
+        super().__init__(1 << scale, seed, weight_range)
+        self.scale = scale
+        self.m = m
+        self.a, self.b, self.c = a, b, c
+        self.directed = directed
+
+    def _edge_chunks(self, rng):
+        for k in _batches(self.m):
+            v1s = np.zeros(k, dtype=np.int64)
+            v2s = np.zeros(k, dtype=np.int64)
+            for _ in range(self.scale):
+                r = rng.random(k)
+                lower_half = r >= self.a + self.b
+                right_half = ((r >= self.a) & ~lower_half) | (r >= self.a + self.b + self.c)
+                v1s = 2 * v1s + lower_half
+                v2s = 2 * v2s + right_half
+            yield v1s, v2s
+
+
+class RandomDAG(GraphGenerator):
+    """m edges that all go forward in a hidden random topological order of the n vertices. Pass a negative lower
+    weight bound for DAGs with negative edges.
+    """
+
+    def __init__(self, n: int, m: int, seed: int = 0, weight_range: tuple[int, int] = (1, 100)):
+        if n < 2 and m > 0:
+            raise ValueError("A DAG with edges needs at least 2 vertices.")
+        super().__init__(n, seed, weight_range)
+        self.m = m
+
+    def _edge_chunks(self, rng):
+        order = rng.permutation(self.V)
+        for k in _batches(self.m):
+            v1s, v2s = rng.integers(0, self.V, k), rng.integers(0, self.V, k)
+            while (v1s == v2s).any():
+                loops = v1s == v2s
+                v2s[loops] = rng.integers(0, self.V, loops.sum())
+            yield order[np.minimum(v1s, v2s)], order[np.maximum(v1s, v2s)]
+
+
+class Bipartite(GraphGenerator):
+    """m random edges between n_left vertices 0..n_left - 1 and n_right vertices after them."""
+
+    def __init__(self, n_left: int, n_right: int, m: int, directed: bool = False, seed: int = 0,
+                 weight_range: tuple[int, int] = (1, 100)):
+        super().__init__(n_left + n_right, seed, weight_range)
+        self.n_left = n_left
+        self.n_right = n_right
+        self.m = m
+        self.directed = directed
+
+    def _edge_chunks(self, rng):
+        for k in _batches(self.m):
+            yield rng.integers(0, self.n_left, k), self.n_left + rng.integers(0, self.n_right, k)
+
+
+class LayeredFlowNetwork(GraphGenerator):
+    """Source s = 0, then layers of width vertices, then sink t = V - 1. The source feeds every vertex of the first
+    layer, every layer vertex has degree edges to random vertices of the next layer, and the last layer drains into
+    the sink. Weights are the capacities.
+    """
+
+    def __init__(self, layers: int, width: int, degree: int, seed: int = 0,
+                 weight_range: tuple[int, int] = (1, 100)):
+        if layers < 1 or width < 1:
+            raise ValueError("A layered flow network needs at least one layer of at least one vertex.")
+        super().__init__(layers * width + 2, seed, weight_range)
+        self.layers = layers
+        self.width = width
+        self.degree = degree
+        self.s = 0
+        self.t = self.V - 1
+
+    def _edge_chunks(self, rng):
+        first_layer = 1 + np.arange(self.width)
+        yield np.full(self.width, self.s), first_layer
+
+        for layer in range(self.layers - 1):
+            layer_vertices = 1 + layer * self.width + np.arange(self.width)
+            v1s = np.repeat(layer_vertices, self.degree)
+            yield v1s, layer_vertices[-1] + 1 + rng.integers(0, self.width, len(v1s))
+
+        last_layer = 1 + (self.layers - 1) * self.width + np.arange(self.width)
+        yield last_layer, np.full(self.width, self.t)
+
+
+if __name__ == "__main__":
+    # generation throughput into graph objects and straight into csr
+    # usage: python -m dsa1lib.generators [edges]
+    import sys
+    import time
+
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    side = int((m / 2) ** 0.5)
+
+    for generator in [ErdosRenyi(m // 10, m), Grid2D(side, side), RMAT(max(1, (m // 16).bit_length()), m),
+                      RandomDAG(m // 10, m), Bipartite(m // 20, m // 20, m),
+                      LayeredFlowNetwork(100, m // 1000, 10)]:
+        start = time.perf_counter()
+        graph = generator.to_graph()
+        built_at = time.perf_counter()
+        frozen = generator.to_csr()
+        print(f"{type(generator).__name__ : <20}: V = {graph.num_vertices}, E = {graph.num_edges}, "
+              f"graph {built_at - start : .2f} s, csr {time.perf_counter() - built_at : .2f} s")
@@ -1,14 +1,19 @@
-from typing import Union, cast
+from array import array
+from typing import Any, Callable
 import abc
+import operator
 
 class WeightedEdge(abc.ABC):
-    """Implementation for weighted edge, to be used with WeightedGraph or WeightedUndirectedGraph. 
+    """Implementation for weighted edge, to be used with WeightedGraph or WeightedUndirectedGraph. Graphs keep their
+    edges in flat arrays, the edges they hand out are light views that remember their edge id. 
     """
+    __slots__ = ("_v1", "_v2", "_weight", "eid")
 
-    def __init__(self, v1: int, v2: int, weight: float) -> None:
+    def __init__(self, v1: int, v2: int, weight: float, eid: int | None = None) -> None:
         self._v1 = v1
         self._v2 = v2
         self._weight = weight
+        self.eid = eid
 
     def any_vertex(self):
         return self._v1
@@ -51,8 +56,10 @@ class WeightedEdge(abc.ABC):
 
 
 class WeightedUndirectedEdge(WeightedEdge):
-    def __init__(self, v1: int, v2: int, weight):
-        super().__init__(v1, v2, weight)
+    __slots__ = ()
+
+    def __init__(self, v1: int, v2: int, weight, eid: int | None = None):
+        super().__init__(v1, v2, weight, eid)
 
     def __eq__(self, other: "WeightedEdge") -> bool:
         """Equal if the pair of vertices and weights match. 
@@ -63,9 +70,8 @@ class WeightedUndirectedEdge(WeightedEdge):
         Returns:
             bool: True iff pair of vertices match, and weights are equal. 
         """
-        return (self.weight, self._v1, self._v2) == (other.weight, other._v1, other._v2) or \
-            (self.weight, self._v1, self._v2) == (
-                other.weight, other._v2, other._v1)
+        return self._weight == other._weight and (
+            (self._v1 == other._v1 and self._v2 == other._v2) or (self._v1 == other._v2 and self._v2 == other._v1))
 
     def __hash__(self):
         """Hash depends on the pair of vertices (order not considered), and weight
@@ -78,8 +84,10 @@ class WeightedUndirectedEdge(WeightedEdge):
 
 
 class WeightedDirectedEdge(WeightedEdge):
-    def __init__(self, v1: int, v2: int, weight):
-        super().__init__(v1, v2, weight)
+    __slots__ = ()
+
+    def __init__(self, v1: int, v2: int, weight, eid: int | None = None):
+        super().__init__(v1, v2, weight, eid)
 
     @property
     def edge_from(self):
@@ -98,9 +106,8 @@ class WeightedDirectedEdge(WeightedEdge):
         Returns:
             bool: True iff pair of from and to vertices, and weights are equal. 
         """
-        return (self.weight, self._v1, self._v2) == (other.weight, other._v1, other._v2) or \
-            (self.weight, self._v1, self._v2) == (
-                other.weight, other._v2, other._v1)
+        return self._weight == other._weight and (
+            (self._v1 == other._v1 and self._v2 == other._v2) or (self._v1 == other._v2 and self._v2 == other._v1))
 
     def __hash__(self):
         """Hash depends on the pair of vertices (order is considered), and weight
@@ -111,14 +118,184 @@ class WeightedDirectedEdge(WeightedEdge):
         return hash((self.weight, self._v1, self._v2))
 
 
+def _as_array(typecode: str, values) -> array:
+    """Packs a sequence into a typed array. Buffers of the same item type (arrays, numpy arrays) are copied bytewise, 
+    other buffers are unpacked with a single tolist(). 
+    """
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array(typecode, values)
+
+    if view.format == typecode and view.c_contiguous:
+        packed = array(typecode)
+        packed.frombytes(view.cast("B"))
+        return packed
+    return array(typecode, view.tolist())
+
+
+# how WeightedGraph.coalesce() merges the weights of parallel edges
+_COALESCE_POLICIES = {"min": min, "max": max, "sum": operator.add}
+
+
 class Graph:
     """Abstract class for Graph. 
     """
+    directed = False
 
     def __init__(self, V: int) -> None:
         self._adj = [[] for _ in range(V)]
         self._V = V
         self._E = 0
+        # bumped by every mutation, derived structures are cached with the version they were built at
+        self._version = 0
+        self._derived: dict[str, tuple[int, Any]] = {}
+
+    @classmethod
+    def from_edge_arrays(cls, V: int, *edge_arrays):
+        """Graph with V vertices and the edges given as parallel arrays, see add_edges(). 
+
+        Args:
+            V (int): Number of vertices. 
+            edge_arrays: v1s, v2s (and weights for weighted graphs). 
+
+        Returns:
+            Graph: The built graph. 
+        """
+        graph = cls(V)
+        graph.add_edges(*edge_arrays)
+        return graph
+
+    def _check_edge_arrays(self, *edge_arrays: array):
+        """Bounds check for a whole batch of edges, first two arrays are the endpoints. 
+        """
+        if len(set(map(len, edge_arrays))) > 1:
+            raise ValueError("Edge arrays have different lengths.")
+        for vs in edge_arrays[:2]:
+            if len(vs):
+                self._check_endpoints(min(vs), max(vs))
+
+    def _check_endpoints(self, lowest: int, highest: int):
+        """Bounds check shared by single edges and batches, on the smallest and the largest endpoint. 
+        """
+        if lowest < 0 or highest >= self._V:
+            raise ValueError("Edge has vertices outside of range.")
+
+    def _extend_adj(self, v1s: array, v1_entries, v2s: array | None = None, v2_entries=None) -> None:
+        """Appends v1_entries[i] to the adjacency list of v1s[i], and for undirected graphs v2_entries[i] to the list 
+        of v2s[i] right after it. The degrees of the batch are counted first, so every list it touches grows once to 
+        its final size and is then filled in place. 
+        """
+        adj = self._adj
+        owner_arrays = (v1s,) if v2s is None else (v1s, v2s)
+        if len(v1s) < self._V // 8:
+            # counting into an array of V would cost more than the batch
+            if v2s is None:
+                for v1, entry in zip(v1s, v1_entries):
+                    adj[v1].append(entry)
+            else:
+                for v1, entry1, v2, entry2 in zip(v1s, v1_entries, v2s, v2_entries):
+                    adj[v1].append(entry1)
+                    adj[v2].append(entry2)
+            return
+
+        # degree of every vertex in the batch, then the position of its next entry
+        fill = [0] * self._V
+        for vs in owner_arrays:
+            for v in vs:
+                fill[v] += 1
+        for v, degree in enumerate(fill):
+            if degree:
+                fill[v] = len(adj[v])
+                adj[v] += [0] * degree
+
+        if v2s is None:
+            for v1, entry in zip(v1s, v1_entries):
+                position = fill[v1]
+                adj[v1][position] = entry
+                fill[v1] = position + 1
+        else:
+            for v1, entry1, v2, entry2 in zip(v1s, v1_entries, v2s, v2_entries):
+                position = fill[v1]
+                adj[v1][position] = entry1
+                fill[v1] = position + 1
+                position = fill[v2]
+                adj[v2][position] = entry2
+                fill[v2] = position + 1
+
+    def _check_vertex(self, v: int):
+        if v < 0 or v >= self._V:
+            raise ValueError(
+                "Vertex in not within bounds of the number of vertex for the graph.")
+
+    @property
+    def version(self) -> int:
+        """Mutation counter of the graph, changes whenever edges are added or removed. 
+
+        Returns:
+            int: Version of the graph. 
+        """
+        return self._version
+
+    def _cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """Derived structure by name, rebuilt only if the graph changed since it was last built. 
+        """
+        entry = self._derived.get(name)
+        if entry is None or entry[0] != self._version:
+            entry = self._derived[name] = (self._version, build())
+        return entry[1]
+
+    def _edges_added(self, v1s, v2s, weights=None) -> None:
+        """Bumps the version after edges were added. Derived structures that can take the new edges are patched in 
+        place, the rest are dropped and rebuilt on next use. 
+        """
+        self._version += 1
+        if not self._derived:
+            return
+
+        for name, (version, derived) in list(self._derived.items()):
+            if version == self._version - 1 and self._patch_derived(name, derived, v1s, v2s, weights):
+                self._derived[name] = (self._version, derived)
+            else:
+                del self._derived[name]
+
+    def _patch_derived(self, name: str, derived: Any, v1s, v2s, weights) -> bool:
+        if name == "out_degrees":
+            for v1, v2 in zip(v1s, v2s):
+                derived[v1] += 1
+                if not self.directed:
+                    derived[v2] += 1
+            return True
+        elif name == "in_degrees":
+            for v1, v2 in zip(v1s, v2s):
+                derived[v2] += 1
+                if not self.directed:
+                    derived[v1] += 1
+            return True
+        return False
+
+    def out_degrees(self) -> array:
+        """Number of adjacent vertices of each vertex (degree for undirected graphs). Cached until the graph changes, 
+        do not modify. 
+
+        Returns:
+            array: Out-degree of each vertex. 
+        """
+        return self._cached("out_degrees", lambda: array("i", map(len, self._adj)))
+
+    def in_degrees(self) -> array:
+        """Number of edges coming into each vertex (degree for undirected graphs). Cached until the graph changes, 
+        do not modify. 
+
+        Returns:
+            array: In-degree of each vertex. 
+        """
+        return self._cached("in_degrees", self._count_in_degrees)
+
+    def _count_in_degrees(self) -> array:
+        return array("i", self.out_degrees())
 
     @property
     def num_vertices(self) -> int:
@@ -147,14 +324,33 @@ class Graph:
         Returns:
             list[int]: Adjacent vertices to the provided vertex. 
         """
-        if v < 0 or v > self.num_vertices:
-            raise ValueError(
-                "Vertex in not within bounds of the number of vertex for the graph.")
+        self._check_vertex(v)
         return self._adj[v]
 
     def add_edge(self, v1: int, v2: int) -> None:
         raise NotImplementedError
 
+    def add_edges(self, v1s, v2s) -> None:
+        raise NotImplementedError
+
+    def freeze(self):
+        """Immutable compressed sparse row (CSR) copy of the graph. Adjacency is packed in flat offset, target
+        (and weight) arrays, but the adj()/num_vertices/num_edges surface is kept so the algorithms run unchanged. 
+
+        Returns:
+            CSRGraph: Frozen copy of the graph. 
+        """
+        from dsa1lib.csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def save(self, path: str) -> None:
+        """Writes the frozen graph to a binary file, load it back with CSRGraph.load(path). 
+
+        Args:
+            path (str): File to write. 
+        """
+        self.freeze().save(path)
+
     def __repr__(self) -> str:
         repre = ""
         for v in range(self._V):
@@ -176,17 +372,31 @@ class UndirectedGraph(Graph):
             v1 (int): Vertex 1. 
             v2 (int): Vertex 2. 
         """
-        if v1 < 0 or v2 < 0 or v1 > self.num_vertices or v2 > self.num_vertices:
-            raise ValueError(
-                "Vertex in not within bounds of the number of vertex for the graph.")
+        self._check_endpoints(min(v1, v2), max(v1, v2))
         self._adj[v1].append(v2)
         self._adj[v2].append(v1)
         self._E += 1
+        self._edges_added((v1,), (v2,))
+
+    def add_edges(self, v1s, v2s) -> None:
+        """Adds undirected edges between v1s[i] and v2s[i], bounds are checked once for the batch. 
+
+        Args:
+            v1s: Vertex 1 of each edge. 
+            v2s: Vertex 2 of each edge. 
+        """
+        v1s, v2s = _as_array("i", v1s), _as_array("i", v2s)
+        self._check_edge_arrays(v1s, v2s)
+
+        self._extend_adj(v1s, v2s, v2s, v1s)
+        self._E += len(v1s)
+        self._edges_added(v1s, v2s)
 
 
 class DirectedGraph(Graph):
     """Implementation of a directed graph
     """
+    directed = True
 
     def __init__(self, V: int) -> None:
         super().__init__(V)
@@ -198,65 +408,309 @@ class DirectedGraph(Graph):
             v1 (int): Source vertex. 
             v2 (int): Target vertex. 
         """
-        if v1 < 0 or v2 < 0 or v1 > self.num_vertices or v2 > self.num_vertices:
-            raise ValueError(
-                "Vertex in not within bounds of the number of vertex for the graph.")
+        self._check_endpoints(min(v1, v2), max(v1, v2))
         self._adj[v1].append(v2)
         self._E += 1
+        self._edges_added((v1,), (v2,))
+
+    def add_edges(self, v1s, v2s) -> None:
+        """Adds directed edges from v1s[i] to v2s[i], bounds are checked once for the batch. 
+
+        Args:
+            v1s: Source vertex of each edge. 
+            v2s: Target vertex of each edge. 
+        """
+        v1s, v2s = _as_array("i", v1s), _as_array("i", v2s)
+        self._check_edge_arrays(v1s, v2s)
+
+        self._extend_adj(v1s, v2s)
+        self._E += len(v1s)
+        self._edges_added(v1s, v2s)
 
     def reverse(self) -> "DirectedGraph":
-        graph = DirectedGraph(self.num_vertices)
+        """Graph with every edge reversed. Cached and kept in step with add_edge, so do not modify it. Adjacency 
+        lists hold the same vertices as a transpose built from scratch, but not always in the same order. 
+
+        Returns:
+            DirectedGraph: Transpose of the graph. 
+        """
+        return self._cached("reverse", self._build_reverse)
+
+    def _build_reverse(self) -> "DirectedGraph":
+        v1s, v2s = self.edge_arrays()
+        return DirectedGraph.from_edge_arrays(self.num_vertices, v2s, v1s)
+
+    def edge_arrays(self) -> tuple[array, array]:
+        """Flat edge list, edge i goes from v1s[i] to v2s[i]. Cached and kept in step with add_edge, so do not 
+        modify it. Built grouped by source, later edges are appended, so the order is not fixed. 
+
+        Returns:
+            tuple[array, array]: Sources and targets of the edges. 
+        """
+        return self._cached("edge_arrays", self._build_edge_arrays)
+
+    def _build_edge_arrays(self) -> tuple[array, array]:
+        v1s, v2s = array("i"), array("i")
         for v1 in range(self.num_vertices):
-            for v2 in cast(list[int], self.adj(v1)):
-                graph.add_edge(v2, v1)
-        return graph
+            v1s.extend(array("i", [v1]) * len(self._adj[v1]))
+            v2s.extend(self._adj[v1])
+        return v1s, v2s
+
+    def _count_in_degrees(self) -> array:
+        in_degrees = array("i", [0]) * self.num_vertices
+        for targets in self._adj:
+            for v2 in targets:
+                in_degrees[v2] += 1
+        return in_degrees
+
+    def _patch_derived(self, name: str, derived: Any, v1s, v2s, weights) -> bool:
+        if name == "reverse":
+            derived.add_edges(v2s, v1s)
+            return True
+        elif name == "edge_arrays":
+            derived[0].extend(v1s)
+            derived[1].extend(v2s)
+            return True
+        return super()._patch_derived(name, derived, v1s, v2s, weights)
 
 
 class WeightedGraph(Graph):
+    """Abstract class for weighted graphs. Edge eid goes from edge_v1[eid] to edge_v2[eid] with weight 
+    edge_weights[eid], and adjacency lists hold edge ids rather than edge objects. 
+    """
+    _edge_cls: type[WeightedEdge] = WeightedEdge
+
     def __init__(self, V: int) -> None:
         super().__init__(V)
+        self._edge_v1 = array("i")
+        self._edge_v2 = array("i")
+        self._edge_weight = array("d")
+
+    @property
+    def edge_v1(self) -> array:
+        return self._edge_v1
+
+    @property
+    def edge_v2(self) -> array:
+        return self._edge_v2
+
+    @property
+    def edge_weights(self) -> array:
+        return self._edge_weight
+
+    def edge(self, eid: int) -> WeightedEdge:
+        """Edge view for the edge id, for code that works on WeightedEdge. 
+
+        Args:
+            eid (int): Edge id. 
+
+        Returns:
+            WeightedEdge: Edge with the stored endpoints and weight. 
+        """
+        return self._edge_cls(self._edge_v1[eid], self._edge_v2[eid], self._edge_weight[eid], eid)
 
     def adj(self, v: int) -> list[WeightedEdge]:
-        if v < 0 or v > self.num_vertices:
-            raise ValueError(
-                "Vertex in not within bounds of the number of vertex for the graph.")
+        """The adjacent edges of v. Every call makes a new edge view per edge, so this is the convenience path for
+        code that wants WeightedEdge objects, loops over many vertices should use adj_ids() and the edge arrays. 
+
+        Args:
+            v (int): Vertex whose adjacent edges to find. 
+
+        Returns:
+            list[WeightedEdge]: Adjacent edges. 
+        """
+        self._check_vertex(v)
+        return [self.edge(eid) for eid in self._adj[v]]
+
+    def adj_ids(self, v: int) -> list[int]:
+        """Ids of the adjacent edges of v. 
+
+        Args:
+            v (int): Vertex whose adjacent edges to find. 
+
+        Returns:
+            list[int]: Adjacent edge ids. 
+        """
+        self._check_vertex(v)
         return self._adj[v]
 
+    def edge_ids(self) -> range:
+        """Ids of the edges of the graph, every edge once. Code that walks the edge arrays should go through this 
+        rather than range(num_edges), a SubgraphView shares the arrays of its graph but keeps only some of the ids. 
+
+        Returns:
+            range: Edge ids. 
+        """
+        return range(self._E)
+
     def get_all_edges(self) -> list[WeightedEdge]:
-        edgeset = set()
-        for v in range(self.num_vertices):
-            for neib in self.adj(v):
-                edgeset.add(neib)
+        """All edges of the graph, undirected edges once. The edge list is kept by the graph, so after the first call
+        this is only a list copy. 
 
-        return list(edgeset)
+        Returns:
+            list[WeightedEdge]: Edges in the order they were added. 
+        """
+        return list(self._cached("edges", lambda: [self.edge(eid) for eid in range(self._E)]))
+
+    def __repr__(self) -> str:
+        repre = ""
+        for v in range(self._V):
+            repre += f"{v}: " + str(self.adj(v)) + "\n"
+        return repre
+
+    def _store_edge(self, v1: int, v2: int, weight: float) -> int:
+        """Appends an edge to the edge store, both endpoints are checked before anything is written. 
+
+        Returns:
+            int: Edge id of the new edge. 
+        """
+        self._check_endpoints(min(v1, v2), max(v1, v2))
+
+        eid = self._E
+        self._edge_v1.append(v1)
+        self._edge_v2.append(v2)
+        self._edge_weight.append(weight)
+        self._E += 1
+        self._edges_added((v1,), (v2,), (weight,))
+        return eid
+
+    def _store_edges(self, v1s, v2s, weights) -> tuple[array, array, int]:
+        """Appends a batch of edges to the edge store. 
+
+        Returns:
+            tuple[array, array, int]: Packed v1s and v2s, and the edge id of the first edge of the batch. 
+        """
+        v1s, v2s, weights = _as_array("i", v1s), _as_array("i", v2s), _as_array("d", weights)
+        self._check_edge_arrays(v1s, v2s, weights)
+
+        first_eid = self._E
+        self._edge_v1.extend(v1s)
+        self._edge_v2.extend(v2s)
+        self._edge_weight.extend(weights)
+        self._E += len(v1s)
+        self._edges_added(v1s, v2s, weights)
+        return v1s, v2s, first_eid
+
+    def _clear_edges(self) -> None:
+        """Removes every edge. Edge ids start over from 0 and all derived structures are dropped. 
+        """
+        self._adj = [[] for _ in range(self._V)]
+        self._edge_v1 = array("i")
+        self._edge_v2 = array("i")
+        self._edge_weight = array("d")
+        self._E = 0
+        self._version += 1
+        self._derived.clear()
+
+    def coalesce(self, policy: str = "min", keep_self_loops: bool = False) -> int:
+        """Merges parallel edges into one edge, in a single pass over the edge arrays. Use "min" for path weights, 
+        "sum" for flow capacities. Self loops never lie on a shortest path, spanning tree or augmenting path, so they 
+        are dropped unless asked for. Surviving edges keep the order of their first occurrence, but edge ids change. 
+
+        Args:
+            policy (str, optional): Weight of a merged edge, one of "min", "max" or "sum". Defaults to "min". 
+            keep_self_loops (bool, optional): Coalesce self loops instead of dropping them. Defaults to False. 
+
+        Returns:
+            int: Number of edges removed. 
+        """
+        merge = _COALESCE_POLICIES.get(policy)
+        if merge is None:
+            raise ValueError(f"Unknown coalesce policy {policy!r}, use one of {', '.join(_COALESCE_POLICIES)}.")
+
+        # endpoint pair -> position of the merged edge, undirected edges are keyed by the ordered pair
+        merged_at: dict[tuple[int, int], int] = {}
+        v1s, v2s, weights = array("i"), array("i"), array("d")
+        for v1, v2, weight in zip(self._edge_v1, self._edge_v2, self._edge_weight):
+            if v1 == v2 and not keep_self_loops:
+                continue
+            key = (v1, v2) if self.directed or v1 < v2 else (v2, v1)
+            at = merged_at.get(key)
+            if at is None:
+                merged_at[key] = len(v1s)
+                v1s.append(v1)
+                v2s.append(v2)
+                weights.append(weight)
+            else:
+                weights[at] = merge(weights[at], weight)
+
+        removed = self._E - len(v1s)
+        if removed:
+            self._clear_edges()
+            self.add_edges(v1s, v2s, weights)
+        return removed
+
+    def _patch_derived(self, name: str, derived: Any, v1s, v2s, weights) -> bool:
+        if name == "edges":
+            derived.extend(self.edge(eid) for eid in range(self._E - len(v1s), self._E))
+            return True
+        return super()._patch_derived(name, derived, v1s, v2s, weights)
+
+    def freeze(self):
+        from dsa1lib.csr import CSRWeightedGraph
+        return CSRWeightedGraph.from_graph(self)
 
 
 class WeightedUndirectedGraph(WeightedGraph):
     """Implementation for weighted undirected graph.
     """
 
+    _edge_cls = WeightedUndirectedEdge
+
     def __init__(self, V: int) -> None:
         super().__init__(V)
 
     def add_edge(self, v1: int, v2: int, weight: float):
-        if v1 < 0 or v2 < 0 or v1 > self.num_vertices or v2 > self.num_vertices:
-            raise ValueError("Edge has vertices outside of range.")
+        eid = self._store_edge(v1, v2, weight)
+        self._adj[v1].append(eid)
+        self._adj[v2].append(eid)
 
-        edge = WeightedUndirectedEdge(v1, v2, weight)
-        self._adj[v1].append(edge)
-        self._adj[v2].append(edge)
+    def add_edges(self, v1s, v2s, weights) -> None:
+        """Adds undirected edges between v1s[i] and v2s[i] with weights[i], bounds are checked once for the batch. 
+        """
+        v1s, v2s, first_eid = self._store_edges(v1s, v2s, weights)
+        eids = range(first_eid, self._E)
+        self._extend_adj(v1s, eids, v2s, eids)
 
 
 class WeightedDirectedGraph(WeightedGraph):
     """Implementation for weighted directed graph
     """
+    directed = True
+
+    _edge_cls = WeightedDirectedEdge
 
     def __init__(self, V: int) -> None:
         super().__init__(V)
 
     def add_edge(self, v1: int, v2: int, weight: float):
-        if v1 < 0 or v2 < 0 or v1 > self.num_vertices or v2 > self.num_vertices:
-            raise ValueError("Edge has vertices outside of range.")
+        eid = self._store_edge(v1, v2, weight)
+        self._adj[v1].append(eid)
+
+    def add_edges(self, v1s, v2s, weights) -> None:
+        """Adds directed edges from v1s[i] to v2s[i] with weights[i], bounds are checked once for the batch. 
+        """
+        v1s, _, first_eid = self._store_edges(v1s, v2s, weights)
+        self._extend_adj(v1s, range(first_eid, self._E))
+
+    def reverse(self) -> "WeightedDirectedGraph":
+        """Graph with every edge reversed, edge eid of the transpose is the reverse of edge eid. Cached and kept in 
+        step with add_edge, so do not modify it. 
 
-        edge = WeightedDirectedEdge(v1, v2, weight)
-        self._adj[v1].append(edge)
+        Returns:
+            WeightedDirectedGraph: Transpose of the graph. 
+        """
+        return self._cached("reverse", lambda: WeightedDirectedGraph.from_edge_arrays(
+            self.num_vertices, self._edge_v2, self._edge_v1, self._edge_weight))
+
+    def _count_in_degrees(self) -> array:
+        in_degrees = array("i", [0]) * self.num_vertices
+        for v2 in self._edge_v2:
+            in_degrees[v2] += 1
+        return in_degrees
+
+    def _patch_derived(self, name: str, derived: Any, v1s, v2s, weights) -> bool:
+        if name == "reverse":
+            derived.add_edges(v2s, v1s, weights)
+            return True
+        return super()._patch_derived(name, derived, v1s, v2s, weights)
@@ -0,0 +1,73 @@
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+import time
+
+
+class HeapStats:
+    """Operation counts and cumulative time of the heaps recording into it. Counted heaps are separate subclasses
+    (CountingIndexedMinPQ, CountingMaxBinomialHeap), so heaps made outside count_heap_ops() run the plain code.
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+        self.seconds = 0.0
+
+    def timer(self) -> "_Timer":
+        return _Timer(self)
+
+    def as_dict(self) -> dict[str, float]:
+        """Counters by name, e.g. inserts, decrease_keys, del_mins, swim_levels, sink_levels, comparisons, plus the
+        time spent in heap operations under "seconds". comparisons are the key comparisons that restore heap order
+        (sifts, links, finding the new maximum), not the argument checks of decrease_key and the like.
+
+        Returns:
+            dict[str, float]: Counters and time.
+        """
+        stats: dict[str, float] = dict(self.counts)
+        stats["seconds"] = self.seconds
+        return stats
+
+    def __repr__(self) -> str:
+        return f"HeapStats({self.as_dict()})"
+
+
+class _Timer:
+    """Adds the time spent in a with block to the stats.
+    """
+    __slots__ = ("_stats", "_start")
+
+    def __init__(self, stats: HeapStats) -> None:
+        self._stats = stats
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self._stats.seconds += time.perf_counter() - self._start
+
+
+# innermost count_heap_ops() block last
+_active: list[HeapStats] = []
+
+
+def active_stats() -> HeapStats | None:
+    """Stats of the innermost count_heap_ops() block, None outside of one.
+    """
+    return _active[-1] if _active else None
+
+
+@contextmanager
+def count_heap_ops() -> Iterator[HeapStats]:
+    """Heaps created inside the block, including the ones algorithms create internally, count their operations.
+
+    Yields:
+        HeapStats: Counters, readable with as_dict() after the block.
+    """
+    stats = HeapStats()
+    _active.append(stats)
+    try:
+        yield stats
+    finally:
+        _active.remove(stats)
@@ -1,53 +1,177 @@
+from array import array
+import heapq
+import math
 import random
-from typing import Any
+from typing import Any, Iterable, Protocol
+from dsa1lib.heapstats import HeapStats, active_stats
+
+
+class IndexedPQ(Protocol):
+    """What DijkstraSSSP and PrimMST need from a priority queue of keys identified by indices 0 ... max_len - 1.
+    key_of_index is None for indices that are not in the queue, and decrease_key raises KeyError for them.
+    """
+
+    def insert(self, index: int, key) -> None: ...
+
+    def decrease_key(self, index: int, key) -> None: ...
+
+    def insert_or_decrease(self, index: int, key) -> bool: ...
+
+    def contains(self, index: int) -> bool: ...
+
+    def del_min(self) -> tuple[int, Any]: ...
+
+    def key_of_index(self, index: int) -> Any: ...
+
+    def __len__(self) -> int: ...
 
 
 class IndexedMinPQ:
     """Stores keys identified by indices. Rather than storing the keys in the heap, we store
     the index, which allows the client to decrease keys based on the provided index.  
+
+    The heap is d-ary: heap position i has children d * (i - 1) + 2 ... d * i + 1. A wider heap is shallower, so
+    decrease_key swims fewer levels, at the price of comparing more children in del_min. The default of 4 came
+    out ahead of 2 for Dijkstra on grid graphs, see python -m dsa1lib.indexheap bench.
+
+    With float_keys the keys are kept in an array('d') and compared as plain floats, for clients like PrimMST that
+    would otherwise compare objects through a python level __lt__.
     """
 
-    def __init__(self, max_len: int):
+    def __new__(cls, *args, **kwargs):
+        # inside count_heap_ops() every heap is a counting one, outside the plain class runs untouched
+        if cls is IndexedMinPQ and active_stats() is not None:
+            cls = CountingIndexedMinPQ
+        return super().__new__(cls)
+
+    def __init__(self, max_len: int, arity: int = 4, float_keys: bool = False):
+        if arity < 2:
+            raise ValueError("Heap arity must be at least 2")
+
         self.max_len = max_len
-        self.index_to_key: list = [None] * self.max_len
+        self.arity = arity
+        self.float_keys = float_keys
+        self.index_to_key: list | array = array("d", [math.inf]) * self.max_len if float_keys \
+            else [None] * self.max_len
+        # 0 for indices that are not in the heap
         self.index_to_heapidx: list[int] = [0] * self.max_len
         # index 0 unused, heaps contain lookup_idx
         self.heap: list[int] = [-1] * (self.max_len + 1)
         self.heap_tail_idx = 1  # heapidx to be inserted next
 
+    @classmethod
+    def from_items(cls, indices: Iterable[int], keys: Iterable, max_len: int | None = None,
+                   arity: int = 4, float_keys: bool = False) -> "IndexedMinPQ":
+        """Heap holding key keys[i] at index indices[i], built bottom-up in O(n) instead of n inserts.
+
+        Args:
+            indices (Iterable[int]): Distinct indices.
+            keys (Iterable): Their keys.
+            max_len (int | None, optional): Capacity of the heap. Defaults to the largest index + 1.
+            arity (int, optional): Children per heap node. Defaults to 4.
+            float_keys (bool, optional): Keep the keys in an array('d'). Defaults to False.
+
+        Returns:
+            IndexedMinPQ: The heap.
+        """
+        indices, keys = list(indices), list(keys)
+        if len(indices) != len(keys):
+            raise ValueError("Indices and keys have different lengths")
+        if max_len is None:
+            max_len = max(indices, default=-1) + 1
+
+        pq = cls(max_len, arity, float_keys)
+        pq._heapify(indices, keys)
+        return pq
+
+    def _heapify(self, indices: list[int], keys: list):
+        if len(self):
+            raise ValueError("Heap is not empty")
+        if len(indices) > self.max_len:
+            raise IndexError("Heap full")
+        if len(set(indices)) != len(indices):
+            raise KeyError("Indices are not distinct")
+        if indices and (min(indices) < 0 or max(indices) >= self.max_len):
+            raise IndexError("Index out of bounds")
+
+        index_to_key, heapidx_of, heap = self.index_to_key, self.index_to_heapidx, self.heap
+        for heap_idx, (index, key) in enumerate(zip(indices, keys), 1):
+            index_to_key[index] = key
+            heapidx_of[index] = heap_idx
+            heap[heap_idx] = index
+        self.heap_tail_idx = len(indices) + 1
+
+        # sink every internal node, from the last parent up to the root
+        for heap_idx in range((len(indices) - 2) // self.arity + 1, 0, -1):
+            self._sink(heap_idx)
+
+    def clear(self):
+        """Empties the heap for reuse, without reallocating its arrays. Costs O(len).
+        """
+        index_to_key, heapidx_of, heap = self.index_to_key, self.index_to_heapidx, self.heap
+        for heap_idx in range(1, self.heap_tail_idx):
+            if not self.float_keys:
+                index_to_key[heap[heap_idx]] = None
+            heapidx_of[heap[heap_idx]] = 0
+            heap[heap_idx] = -1
+        self.heap_tail_idx = 1
+
     def _swim(self, heap_idx: int):
-        i = heap_idx
-        while i > 1 and self._key_at_heapidx(i) < self._key_at_heapidx(i // 2):
-            self._exchange_keys(i, i // 2)
-            i //= 2
+        # the moving index is held aside and parents are shifted down into the hole, it is written once at the end
+        heap, keys, heapidx_of = self.heap, self.index_to_key, self.index_to_heapidx
+        arity = self.arity
+        index = heap[heap_idx]
+        key = keys[index]
 
-    def _sink(self, heap_idx: int):
         i = heap_idx
-        while 2 * i < self.heap_tail_idx:
-            min_child_idx = 2 * i
-            if 2 * i + 1 < self.heap_tail_idx and self.index_to_key[self.heap[2 * i + 1]] < self.index_to_key[self.heap[2 * i]]:
-                min_child_idx = 2 * i + 1
-
-            if self.index_to_key[self.heap[min_child_idx]] < self.index_to_key[self.heap[i]]:
-                self._exchange_keys(i, min_child_idx)
+        while i > 1:
+            parent = (i - 2) // arity + 1
+            parent_index = heap[parent]
+            if not key < keys[parent_index]:
+                break
+            heap[i] = parent_index
+            heapidx_of[parent_index] = i
+            i = parent
+
+        heap[i] = index
+        heapidx_of[index] = i
 
-            i = min_child_idx
-
-    def _key_at_heapidx(self, heapidx: int):
-        return self.index_to_key[self.heap[heapidx]]
-
-    def _exchange_keys(self, heap_idx1: int, heap_idx2: int):
-        index1, index2 = self.heap[heap_idx1], self.heap[heap_idx2]
-
-        self.heap[heap_idx1], self.heap[heap_idx2] = index2, index1
+    def _sink(self, heap_idx: int):
+        # same hole technique as _swim, the smallest child moves up into the hole
+        heap, keys, heapidx_of = self.heap, self.index_to_key, self.index_to_heapidx
+        arity, tail = self.arity, self.heap_tail_idx
+        index = heap[heap_idx]
+        key = keys[index]
 
-        self.index_to_heapidx[index1], self.index_to_heapidx[index2] = heap_idx2, heap_idx1
+        i = heap_idx
+        first_child = arity * (i - 1) + 2
+        while first_child < tail:
+            min_child = first_child
+            min_key = keys[heap[first_child]]
+            last_child = first_child + arity
+            if last_child > tail:
+                last_child = tail
+            for child in range(first_child + 1, last_child):
+                child_key = keys[heap[child]]
+                if child_key < min_key:
+                    min_child, min_key = child, child_key
+
+            if not min_key < key:
+                break
+            moved = heap[min_child]
+            heap[i] = moved
+            heapidx_of[moved] = i
+            i = min_child
+            first_child = arity * (i - 1) + 2
+
+        heap[i] = index
+        heapidx_of[index] = i
 
     def insert(self, index: int, key):
         if self.heap_tail_idx > self.max_len:
             raise IndexError("Heap full")
 
-        if self.index_to_key[index]:
+        if self.index_to_heapidx[index]:
             raise KeyError("Value at provided index already exists")
 
         self.index_to_key[index] = key
@@ -58,7 +182,56 @@ class IndexedMinPQ:
         self._swim(self.heap_tail_idx - 1)
 
     def key_of_index(self, index: int):
-        return self.index_to_key[index]
+        return self.index_to_key[index] if self.index_to_heapidx[index] else None
+
+    def contains(self, index: int) -> bool:
+        return self.index_to_heapidx[index] != 0
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        """Inserts the index with the key, or lowers its key if it is already in the heap, with one position
+        lookup and one swim.
+
+        Args:
+            index (int): Index.
+            key: New key.
+
+        Returns:
+            bool: True if the index was inserted or its key lowered, False if its key was already no larger.
+        """
+        heap_idx = self.index_to_heapidx[index]
+        if heap_idx:
+            if not key < self.index_to_key[index]:
+                return False
+            self.index_to_key[index] = key
+            self._swim(heap_idx)
+            return True
+
+        heap_idx = self.heap_tail_idx
+        if heap_idx > self.max_len:
+            raise IndexError("Heap full")
+        self.index_to_key[index] = key
+        self.heap[heap_idx] = index
+        self.heap_tail_idx = heap_idx + 1
+        self._swim(heap_idx)
+        return True
+
+    def change_key(self, index: int, key) -> None:
+        """Sets the key of an index in the heap to any value, swimming or sinking it as needed.
+
+        Args:
+            index (int): Index in the heap.
+            key: New key.
+        """
+        heap_idx = self.index_to_heapidx[index]
+        if not heap_idx:
+            raise KeyError("Index is not in the heap")
+
+        old_key = self.index_to_key[index]
+        self.index_to_key[index] = key
+        if key < old_key:
+            self._swim(heap_idx)
+        else:
+            self._sink(heap_idx)
 
     def min(self):
         return self.heap[1]
@@ -67,11 +240,15 @@ class IndexedMinPQ:
         return self._del_key_at_heapidx(1)
 
     def decrease_key(self, index: int, key) -> None | ValueError:
+        # with float_keys an absent index reads as inf, so membership is checked on the heap position
+        heap_idx = self.index_to_heapidx[index]
+        if not heap_idx:
+            raise KeyError("Index is not in the heap")
         if self.index_to_key[index] < key:
             raise ValueError("Keys can only decrease")
 
         self.index_to_key[index] = key
-        self._swim(self.index_to_heapidx[index])
+        self._swim(heap_idx)
 
     def del_key(self, index: int) -> tuple | IndexError:
         if index >= self.max_len:
@@ -83,14 +260,27 @@ class IndexedMinPQ:
         return self.heap_tail_idx - 1
 
     def _del_key_at_heapidx(self, heap_idx: int) -> tuple[int, Any]:
+        heap = self.heap
         self.heap_tail_idx -= 1  # tail was at the position to be inserted next
-        self._exchange_keys(heap_idx, self.heap_tail_idx)
+        tail_idx = self.heap_tail_idx
 
-        index_to_delete = self.heap[self.heap_tail_idx]
+        index_to_delete = heap[heap_idx]
         deleted_key = self.index_to_key[index_to_delete]
-        self.index_to_key[index_to_delete] = None
-
-        self._sink(heap_idx)
+        if not self.float_keys:
+            self.index_to_key[index_to_delete] = None
+
+        # the tail element fills the hole, and the tail becomes empty
+        moved = heap[tail_idx]
+        heap[heap_idx] = moved
+        self.index_to_heapidx[moved] = heap_idx
+        self.index_to_heapidx[index_to_delete] = 0
+        heap[tail_idx] = -1
+
+        if heap_idx < self.heap_tail_idx:
+            self._sink(heap_idx)
+            if heap_idx > 1:
+                # the tail element moved into the middle of the heap, it can also belong above it
+                self._swim(heap_idx)
 
         return index_to_delete, deleted_key
 
@@ -100,7 +290,223 @@ class IndexedMinPQ:
             \nindex_to_heapidx: {[(i, val) for i, val in enumerate(self.index_to_heapidx)]}"
 
 
+class CountingIndexedMinPQ(IndexedMinPQ):
+    """IndexedMinPQ that counts its operations, swim and sink levels and key comparisons into a HeapStats, and
+    times its public operations. Made directly, or by IndexedMinPQ inside count_heap_ops().
+    """
+
+    def __init__(self, max_len: int, arity: int = 4, float_keys: bool = False, stats: HeapStats | None = None):
+        super().__init__(max_len, arity, float_keys)
+        self.stats = stats or active_stats() or HeapStats()
+
+    def _levels(self, upper: int, lower: int) -> list[int]:
+        """Heap positions from upper down to lower, lower being a descendant of upper.
+        """
+        path = [lower]
+        while path[-1] != upper:
+            path.append((path[-1] - 2) // self.arity + 1)
+        path.reverse()
+        return path
+
+    def _swim(self, heap_idx: int):
+        index = self.heap[heap_idx]
+        super()._swim(heap_idx)
+        final_idx = self.index_to_heapidx[index]
+
+        levels = len(self._levels(final_idx, heap_idx)) - 1
+        self.stats.counts["swim_levels"] += levels
+        # one comparison per level moved, and one more against the parent that stopped it
+        self.stats.counts["comparisons"] += levels + (final_idx > 1)
+
+    def _sink(self, heap_idx: int):
+        index, tail = self.heap[heap_idx], self.heap_tail_idx
+        super()._sink(heap_idx)
+        path = self._levels(heap_idx, self.index_to_heapidx[index])
+
+        self.stats.counts["sink_levels"] += len(path) - 1
+        # at every position with children: the children among themselves, and the smallest against the key
+        for i in path:
+            first_child = self.arity * (i - 1) + 2
+            if first_child < tail:
+                self.stats.counts["comparisons"] += min(self.arity, tail - first_child)
+
+    def insert(self, index: int, key):
+        self.stats.counts["inserts"] += 1
+        with self.stats.timer():
+            super().insert(index, key)
+
+    def decrease_key(self, index: int, key) -> None:
+        self.stats.counts["decrease_keys"] += 1
+        with self.stats.timer():
+            super().decrease_key(index, key)
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        contained = self.contains(index)
+        with self.stats.timer():
+            changed = super().insert_or_decrease(index, key)
+        if changed:
+            self.stats.counts["decrease_keys" if contained else "inserts"] += 1
+        return changed
+
+    def change_key(self, index: int, key) -> None:
+        self.stats.counts["change_keys"] += 1
+        with self.stats.timer():
+            super().change_key(index, key)
+
+    def del_min(self) -> tuple:
+        self.stats.counts["del_mins"] += 1
+        with self.stats.timer():
+            return super().del_min()
+
+    def del_key(self, index: int) -> tuple | IndexError:
+        self.stats.counts["del_keys"] += 1
+        with self.stats.timer():
+            return super().del_key(index)
+
+
+class LazyMinPQ:
+    """Indexed min priority queue on top of the C heapq functions. Entries are (key, index, generation) tuples and
+    decrease_key pushes a new entry instead of moving the old one, bumping the generation of the index, so entries
+    of an older generation are stale and skipped by del_min. Once more than max_stale_ratio of the heap is stale,
+    the heap is rebuilt from the live entries, which keeps it at O(len) entries rather than O(E).
+    """
+
+    # heaps smaller than this are never compacted
+    _MIN_COMPACT_SIZE = 64
+
+    def __init__(self, max_len: int, max_stale_ratio: float = 0.5):
+        self.max_len = max_len
+        self.max_stale_ratio = max_stale_ratio
+        self.index_to_key: list = [None] * max_len
+        self._generation = [0] * max_len
+        self._heap: list[tuple[Any, int, int]] = []
+        self._len = 0
+
+    def _push(self, index: int, key):
+        self.index_to_key[index] = key
+        generation = self._generation[index] + 1
+        self._generation[index] = generation
+        heapq.heappush(self._heap, (key, index, generation))
+
+        stale = len(self._heap) - self._len
+        if stale > self.max_stale_ratio * len(self._heap) and len(self._heap) > self._MIN_COMPACT_SIZE:
+            self.compact()
+
+    def compact(self):
+        """Drops the stale entries and heapifies the rest, O(size of the heap).
+        """
+        keys, generation = self.index_to_key, self._generation
+        self._heap = [entry for entry in self._heap
+                      if entry[2] == generation[entry[1]] and keys[entry[1]] is not None]
+        heapq.heapify(self._heap)
+
+    def insert(self, index: int, key):
+        if self.index_to_key[index] is not None:
+            raise KeyError("Value at provided index already exists")
+        self._len += 1
+        self._push(index, key)
+
+    def decrease_key(self, index: int, key) -> None:
+        if not self.contains(index):
+            raise KeyError("Index is not in the heap")
+        if self.index_to_key[index] < key:
+            raise ValueError("Keys can only decrease")
+        self._push(index, key)
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        old_key = self.index_to_key[index]
+        if old_key is None:
+            self._len += 1
+        elif not key < old_key:
+            return False
+        self._push(index, key)
+        return True
+
+    def contains(self, index: int) -> bool:
+        return self.index_to_key[index] is not None
+
+    def key_of_index(self, index: int):
+        return self.index_to_key[index]
+
+    def _pop_stale(self):
+        heap, keys, generation = self._heap, self.index_to_key, self._generation
+        while heap[0][2] != generation[heap[0][1]] or keys[heap[0][1]] is None:
+            heapq.heappop(heap)
+
+    def min(self) -> int:
+        if not self._len:
+            raise IndexError("Heap empty")
+        self._pop_stale()
+        return self._heap[0][1]
+
+    def del_min(self) -> tuple[int, Any]:
+        if not self._len:
+            raise IndexError("Heap empty")
+
+        heap, keys, generation = self._heap, self.index_to_key, self._generation
+        while True:
+            key, index, entry_generation = heapq.heappop(heap)
+            if entry_generation == generation[index] and keys[index] is not None:
+                break
+
+        keys[index] = None
+        self._len -= 1
+        return index, key
+
+    def __len__(self):
+        return self._len
+
+
 if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] == ["bench"]:
+        # replays the queue operations of Dijkstra on a road like grid with random weights against each arity
+        # usage: python -m dsa1lib.indexheap bench [rows]
+        import time
+        from dsa1lib.graph import WeightedUndirectedGraph
+
+        rows = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+        V = rows * rows
+        rng = random.Random(11)
+        right = [v for v in range(V) if v % rows < rows - 1]
+        down = list(range(V - rows))
+        grid = WeightedUndirectedGraph.from_edge_arrays(
+            V, right + down, [v + 1 for v in right] + [v + rows for v in down],
+            [rng.randint(1, 100) for _ in range(len(right) + len(down))])
+
+        # (operation, index, key) with operation 0 insert, 1 decrease_key, 2 del_min
+        ops: list[tuple[int, int, float]] = []
+        dist = [math.inf] * V
+        dist[0] = 0.0
+        pq = IndexedMinPQ(V)
+        pq.insert(0, 0.0)
+        ops.append((0, 0, 0.0))
+        edge_v1, edge_v2, weights = grid.edge_v1, grid.edge_v2, grid.edge_weights
+        while len(pq):
+            u, _ = pq.del_min()
+            ops.append((2, 0, 0.0))
+            for eid in grid.adj_ids(u):
+                v = edge_v2[eid] if edge_v1[eid] == u else edge_v1[eid]
+                if dist[u] + weights[eid] < dist[v]:
+                    dist[v] = dist[u] + weights[eid]
+                    ops.append((1 if pq.key_of_index(v) is not None else 0, v, dist[v]))
+                    (pq.decrease_key if ops[-1][0] else pq.insert)(v, dist[v])
+
+        print(f"{rows} x {rows} grid: {len(ops)} operations, "
+              f"{sum(op == 1 for op, _, _ in ops)} decrease_key")
+        for arity in (2, 3, 4, 8):
+            best = math.inf
+            for _ in range(3):
+                pq = IndexedMinPQ(V, arity)
+                run = (pq.insert, pq.decrease_key, lambda v, key: pq.del_min())
+                start = time.perf_counter()
+                for op, v, key in ops:
+                    run[op](v, key)
+                best = min(best, time.perf_counter() - start)
+            print(f"arity {arity}: {best : .3f} s")
+        sys.exit()
+
     ipq = IndexedMinPQ(10)
 
     print("---------------------------------")
@@ -0,0 +1,308 @@
+from array import array
+from collections import deque
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.graph import WeightedDirectedEdge, WeightedDirectedGraph, WeightedGraph
+import abc
+import math
+
+
+class FlowEdge(WeightedDirectedEdge):
+    """Edge view of a FlowNetwork. Capacity and flow live in the network's arrays, indexed by the edge id.
+    """
+    __slots__ = ("_network",)
+
+    def __init__(self, network: "FlowNetwork", eid: int):
+        super().__init__(network.edge_v1[eid], network.edge_v2[eid], network.edge_weights[eid], eid)
+        self._network = network
+
+    @property
+    def flow(self) -> int:
+        return self._network.flow_of(self.eid)  # type: ignore
+
+    @property
+    def capacity(self) -> int:
+        return int(self.weight)
+
+    def residual_capacity(self, from_v: int) -> int:
+        return self._network.residual_capacity(self.eid, from_v)  # type: ignore
+
+    def push_flow(self, aug_flow: int, from_v: int):
+        self._network.push_flow(self.eid, aug_flow, from_v)  # type: ignore
+
+
+class FlowNetwork(WeightedDirectedGraph):
+    """Flow network over a copy of the graph's edges. Flow of edge eid is kept in a flat array next to its capacity,
+    so augmenting works on edge ids and never touches edge objects.
+    """
+
+    def __init__(self, graph: WeightedGraph, s: int, t: int):
+        super().__init__(graph.num_vertices)
+        self.s = s
+        self.t = t
+        self._incoming_edges: list[list[int]] = [[] for _ in range(graph.num_vertices)]
+        # capacity and flow of every edge, extended by add_edge and add_edges
+        self._capacity = array("q")
+        self._flow = array("q")
+        v1s, v2s, weights = [], [], []
+        if isinstance(graph, DenseWeightedGraph):
+            for v1 in range(graph.num_vertices):
+                row = graph.row(v1)
+                for v2, weight in enumerate(row):
+                    if weight != math.inf:
+                        v1s.append(v1)
+                        v2s.append(v2)
+                        weights.append(weight)
+        else:
+            edge_v1, edge_v2, edge_weights = graph.edge_v1, graph.edge_v2, graph.edge_weights
+            for v1 in range(graph.num_vertices):
+                for eid in graph.adj_ids(v1):
+                    v1s.append(v1)
+                    v2s.append(edge_v2[eid] if edge_v1[eid] == v1 else edge_v1[eid])
+                    weights.append(edge_weights[eid])
+        self.add_edges(v1s, v2s, weights)
+
+    def add_edge(self, v1: int, v2: int, weight: float):
+        super().add_edge(v1, v2, weight)
+        self._incoming_edges[v2].append(self.num_edges - 1)
+        self._capacity.append(int(weight))
+        self._flow.append(0)
+
+    def add_edges(self, v1s, v2s, weights):
+        first_eid = self.num_edges
+        super().add_edges(v1s, v2s, weights)
+        for eid in range(first_eid, self.num_edges):
+            self._incoming_edges[self._edge_v2[eid]].append(eid)
+        self._capacity.extend(int(weight) for weight in self._edge_weight[first_eid:])
+        self._flow.extend(array("q", [0]) * (self.num_edges - first_eid))
+
+    def _clear_edges(self) -> None:
+        super()._clear_edges()
+        self._incoming_edges = [[] for _ in range(self.num_vertices)]
+        self._capacity = array("q")
+        self._flow = array("q")
+
+    def coalesce(self, policy: str = "sum", keep_self_loops: bool = False) -> int:
+        """Merges parallel edges, summing their capacities by default, see WeightedGraph.coalesce(). Only allowed
+        before any flow is pushed.
+
+        Returns:
+            int: Number of edges removed.
+        """
+        if any(self._flow):
+            raise ValueError("Can't coalesce a flow network that carries flow.")
+        return super().coalesce(policy, keep_self_loops)
+
+    def edge(self, eid: int) -> FlowEdge:
+        return FlowEdge(self, eid)
+
+    def incoming_edge_ids(self, v: int) -> list[int]:
+        return self._incoming_edges[v]
+
+    def outgoing_edge_ids(self, v: int) -> list[int]:
+        return self._adj[v]
+
+    def incoming_edges(self, v: int) -> list[FlowEdge]:
+        return [self.edge(eid) for eid in self._incoming_edges[v]]
+
+    def outgoing_edges(self, v: int) -> list[FlowEdge]:
+        return [self.edge(eid) for eid in self._adj[v]]
+
+    def flow_of(self, eid: int) -> int:
+        return self._flow[eid]
+
+    def residual_capacity(self, eid: int, from_v: int) -> int:
+        """Residual capacity of an edge in the residual network, moving out of from_v.
+
+        Args:
+            eid (int): Edge id.
+            from_v (int): Endpoint the residual edge leaves from.
+
+        Returns:
+            int: Capacity left on the edge if from_v is its tail, flow to cancel if from_v is its head.
+        """
+        if self._capacity[eid] < 0:
+            # convention: negative capacity edges can't carry flow
+            return 0
+        elif from_v == self._edge_v1[eid]:
+            return self._capacity[eid] - self._flow[eid]
+        elif from_v == self._edge_v2[eid]:
+            return self._flow[eid]
+        else:
+            raise ValueError("vertex does not belong to flow edge")
+
+    def push_flow(self, eid: int, aug_flow: int, from_v: int):
+        if from_v == self._edge_v1[eid]:
+            self._flow[eid] += aug_flow
+        elif from_v == self._edge_v2[eid]:
+            self._flow[eid] -= aug_flow
+        else:
+            raise ValueError("vertex does not belong to flow edge")
+
+    def other_vertex(self, eid: int, v: int) -> int:
+        return self._edge_v2[eid] if v == self._edge_v1[eid] else self._edge_v1[eid]
+
+    @property
+    def flow(self) -> int:
+        flow = 0
+        for eid in self._adj[self.s]:
+            flow += self._flow[eid]
+        return flow
+
+    def __repr__(self) -> str:
+        rep = ""
+        for v in range(self.num_vertices):
+            rep += f"Vertex {v}: \n"
+            for edge in self.outgoing_edges(v):
+                rep += f"\t{edge} {edge.flow} / {edge.capacity}\n"
+            rep += "\n"
+        return rep
+
+
+class FordFulkersonMethod(abc.ABC):
+    def __init__(self, graph: WeightedGraph, s: int, t: int):
+        """Finds max flow, min cut on a flow network.
+
+        Args:
+            graph (WeightedGraph): Flow network graph
+            s (int): Vertex that is the source. SOURCE CAN'T HAVE INCOMING EDGES.
+            t (int): Vertex that is the target. TARGET CAN'T HAVE OUTGOING EDGES.
+        """
+
+        self.flow_network = FlowNetwork(graph, s, t)
+        self.s = s
+        self.t = t
+        self.maxflow = 0
+        self.mincut = []
+
+    @abc.abstractmethod
+    def find_augmenting_path(self) -> tuple[int, list[int]]:
+        """Finds augmenting path and minimum residual capacity on that path in the residual network.
+
+        Returns:
+            tuple[int, list[int]]: minimum residual capacity on the augmenting path, edge ids of the augmenting path
+        """
+        pass
+
+    @abc.abstractmethod
+    def compute_mincut(self) -> list[int]:
+        """Stores mincut after no augmenting path is found in Ford-Fulkerson method. Returns the vertices stored in
+        the s-cut.
+        """
+        pass
+
+    def _push_flow_through_aug_path(self, min_residual_cap: int, aug_path: list[int]):
+        from_v = self.s
+        for eid in aug_path:
+            self.flow_network.push_flow(eid, min_residual_cap, from_v)
+            from_v = self.flow_network.other_vertex(eid, from_v)
+
+    def _run_maxflow_mincut(self) -> None:
+        """Ford-Fulkerson method of finding max flow. Implement find_augmenting_path() before calling this.
+        """
+
+        is_there_aug_path = True
+
+        while is_there_aug_path:
+            min_residual_cap, aug_path = self.find_augmenting_path()
+
+            if not aug_path:
+                is_there_aug_path = False
+            else:
+                self._push_flow_through_aug_path(min_residual_cap, aug_path)
+
+        self.maxflow = self.flow_network.flow
+        self.mincut = self.compute_mincut()
+
+
+class EdmondsKarp(FordFulkersonMethod):
+    def __init__(self, graph: WeightedGraph, s: int, t: int):
+        super().__init__(graph, s, t)
+
+        self.q = deque(maxlen=self.flow_network.num_vertices)
+        self.color = [0] * self.flow_network.num_vertices
+        # edge id used to reach each vertex in the residual network, -1 if not reached
+        self.residual_edge_to: list[int] = [-1] * self.flow_network.num_vertices
+
+        self._run_maxflow_mincut()
+
+    def find_augmenting_path(self) -> tuple[int, list[int]]:
+        """Uses BFS on residual network, choosing edges that have residual capacity left. When no augmenting path is
+        available, it stores the mincut s-side vertices, and returns (-1, []).
+
+        Returns:
+            tuple[int, list[int]]: Tuple containing the minimum capacity on the augmenting path, and its edge ids.
+        """
+        network = self.flow_network
+        edge_v1, edge_v2 = network.edge_v1, network.edge_v2
+
+        self.q.clear()
+        for v in range(network.num_vertices):
+            self.color[v] = 0
+            self.residual_edge_to[v] = -1
+
+        self.q.append(self.s)
+        self.color[self.s] = 1
+
+        while self.q:
+            v1 = self.q.popleft()
+            self.color[v1] = 2
+
+            for eid in network.outgoing_edge_ids(v1):
+                v2 = edge_v2[eid]
+
+                if self.color[v2] == 0 and network.residual_capacity(eid, v1):
+                    self.color[v2] = 1
+                    self.residual_edge_to[v2] = eid
+                    if v2 == self.t:
+                        return self._construct_aug_path()
+                    self.q.append(v2)
+
+            for eid in network.incoming_edge_ids(v1):
+                v2 = edge_v1[eid]
+
+                if self.color[v2] == 0 and network.residual_capacity(eid, v1):
+                    self.color[v2] = 1
+                    self.residual_edge_to[v2] = eid
+                    self.q.append(v2)
+
+        if self.residual_edge_to[self.t] != -1:
+            return self._construct_aug_path()
+        else:
+            return (-1, [])  # not aug path
+
+    def compute_mincut(self) -> list[int]:
+        mincut = [self.s]
+        for v in range(self.flow_network.num_vertices):
+            if self.residual_edge_to[v] != -1:
+                mincut.append(v)
+        return mincut
+
+    def _construct_aug_path(self) -> tuple[int, list[int]]:
+        aug_path: list[int] = []
+        min_cap = float("inf")
+        v = self.t
+        while v != self.s:
+            eid = self.residual_edge_to[v]
+            assert eid != -1
+
+            aug_path.append(eid)
+            v = self.flow_network.other_vertex(eid, v)
+            min_cap = min(min_cap, self.flow_network.residual_capacity(eid, v))
+
+        aug_path.reverse()
+
+        return int(min_cap), aug_path
+
+
+if __name__ == "__main__":
+    V, E = [int(inp) for inp in input().split()]
+    edges = [input().split() for _ in range(E)]
+    graph = WeightedDirectedGraph.from_edge_arrays(
+        V, [int(e[0]) for e in edges], [int(e[1]) for e in edges], [int(e[2]) for e in edges])
+
+    s, t = [int(inp) for inp in input().split()]
+
+    edmondskarp = EdmondsKarp(graph, s, t)
+    print(edmondskarp.maxflow)
+    print(edmondskarp.flow_network)
+    print(edmondskarp.mincut)
@@ -1,8 +1,10 @@
 import math
-from typing import cast
-from graph import WeightedUndirectedEdge, WeightedUndirectedGraph
-from indexheap import IndexedMinPQ
-from unionfind import UnionFind
+from functools import partial
+from typing import Callable, cast
+from dsa1lib.dense import DenseWeightedGraph, dense_prim
+from dsa1lib.graph import WeightedUndirectedEdge, WeightedUndirectedGraph
+from dsa1lib.indexheap import IndexedMinPQ, IndexedPQ
+from dsa1lib.unionfind import UnionFind
 
 
 class MSTAlgorithm:
@@ -29,74 +31,90 @@ class KruskalMST(MSTAlgorithm):
         super().__init__(graph)
 
     def _find_mst(self) -> list[WeightedUndirectedEdge]:
-        # cast can be ommited with covariance
-        edges = cast(list[WeightedUndirectedEdge], self.graph.get_all_edges())
-        edges.sort()
+        # sort edge ids by the weight array, edge objects are only made for the edges that make it into the mst
+        edge_v1, edge_v2, edge_weights = self.graph.edge_v1, self.graph.edge_v2, self.graph.edge_weights
+        eids = sorted(self.graph.edge_ids(), key=edge_weights.__getitem__)
 
         uf = UnionFind(self.graph.num_vertices)
 
         mst = []
 
-        for edge in edges:
-            v1 = edge.any_vertex()
-            v2 = edge.other_vertex(v1)
+        for eid in eids:
+            v1 = edge_v1[eid]
+            v2 = edge_v2[eid]
             if not uf.in_same_set(v1, v2):
-                mst.append(edge)
+                mst.append(cast(WeightedUndirectedEdge, self.graph.edge(eid)))
                 uf.union(v1, v2)
 
         return mst
 
 
 class PrimMST(MSTAlgorithm):
-    def __init__(self, graph: WeightedUndirectedGraph):
+    def __init__(self, graph: WeightedUndirectedGraph,
+                 pq_factory: Callable[[int], IndexedPQ] = partial(IndexedMinPQ, float_keys=True)):
+        """
+        Args:
+            graph (WeightedUndirectedGraph): Graph to span.
+            pq_factory (Callable[[int], IndexedPQ], optional): Makes the priority queue of edge weights from the
+                number of vertices, e.g. LazyMinPQ or PairingHeap. Defaults to IndexedMinPQ with float keys.
+        """
+        self.pq_factory = pq_factory
         super().__init__(graph)
 
     def _find_mst(self) -> list[WeightedUndirectedEdge]:
-        self.predecessor: list = [None] * self.graph.num_vertices
-        is_in_mst = [False] * self.graph.num_vertices
+        if isinstance(self.graph, DenseWeightedGraph):
+            return self._find_mst_dense(self.graph)
+
+        graph = self.graph
+        edge_v1, edge_v2, weights = graph.edge_v1, graph.edge_v2, graph.edge_weights
+        is_in_mst = [False] * graph.num_vertices
+        # the queue holds edge weights, the id of the edge each weight belongs to is kept alongside, per vertex
+        edge_id_to = [-1] * graph.num_vertices
 
-        indexed_min_pq = IndexedMinPQ(max_len=self.graph.num_vertices)
+        indexed_min_pq = self.pq_factory(graph.num_vertices)
 
-        def visit(edge: WeightedUndirectedEdge | None, to_vertex: int):
-            self.predecessor[to_vertex] = edge
+        def visit(to_vertex: int):
             is_in_mst[to_vertex] = True
 
-            for adj_edge in self.graph.adj(to_vertex):
-                adj_edge = cast(WeightedUndirectedEdge, adj_edge)
-                neighbor_vertex = adj_edge.other_vertex(to_vertex)
+            for eid in graph.adj_ids(to_vertex):
+                neighbor_vertex = edge_v2[eid] if edge_v1[eid] == to_vertex else edge_v1[eid]
 
-                if not is_in_mst[neighbor_vertex]:
-                    if not indexed_min_pq.key_of_index(neighbor_vertex):
-                        indexed_min_pq.insert(neighbor_vertex, adj_edge)
-                    elif adj_edge < indexed_min_pq.key_of_index(neighbor_vertex):
-                        indexed_min_pq.decrease_key(neighbor_vertex, adj_edge)
+                if not is_in_mst[neighbor_vertex] and indexed_min_pq.insert_or_decrease(neighbor_vertex, weights[eid]):
+                    edge_id_to[neighbor_vertex] = eid
 
-        visit(None, 0)
+        visit(0)
 
         while len(indexed_min_pq):
-            to_vertex, next_min_edge = indexed_min_pq.del_min()
+            to_vertex, _ = indexed_min_pq.del_min()
 
             if not is_in_mst[to_vertex]:
-                visit(next_min_edge, to_vertex)
+                visit(to_vertex)
 
+        self.predecessor = [graph.edge(eid) if eid != -1 else None for eid in edge_id_to]
+        return self._gather_mst()
+
+    def _find_mst_dense(self, graph: DenseWeightedGraph) -> list[WeightedUndirectedEdge]:
+        """O(V^2) array-scan Prim for adjacency matrices. 
+        """
+        self.predecessor = [None] * graph.num_vertices
+        for v, u in enumerate(dense_prim(graph)):
+            if u != -1:
+                self.predecessor[v] = graph.edge(u * graph.num_vertices + v)
         return self._gather_mst()
 
     def _gather_mst(self) -> list[WeightedUndirectedEdge]:
         mst: list[WeightedUndirectedEdge] = []
         for v in range(self.graph.num_vertices):
             if self.predecessor[v]:
-                print(v, self.predecessor[v])
                 mst.append(self.predecessor[v])
         return mst
 
 
 if __name__ == "__main__":
     V, E = [int(inp) for inp in input().split()]
-    graph = WeightedUndirectedGraph(V)
-
-    for edge in range(E):
-        v1, v2, w = input().split()
-        graph.add_edge(int(v1), int(v2), float(w))
+    edges = [input().split() for _ in range(E)]
+    graph = WeightedUndirectedGraph.from_edge_arrays(
+        V, [int(e[0]) for e in edges], [int(e[1]) for e in edges], [float(e[2]) for e in edges])
 
     kruskal = KruskalMST(graph)
     prim = PrimMST(graph)
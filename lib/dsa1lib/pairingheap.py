@@ -0,0 +1,115 @@
+from typing import Any
+
+
+class PairingHeap:
+    """Indexed min pairing heap. The tree is kept in flat lists indexed like the keys: first child, next sibling,
+    and prev, which is the left sibling or, for a first child, the parent. decrease_key cuts the subtree and melds
+    it with the root in O(1) amortized, del_min pairs up the children of the root in two passes.
+    """
+
+    def __init__(self, max_len: int):
+        self.max_len = max_len
+        self.index_to_key: list = [None] * max_len
+        self._child = [-1] * max_len
+        self._next = [-1] * max_len
+        self._prev = [-1] * max_len
+        self._root = -1
+        self._len = 0
+
+    def _meld(self, a: int, b: int) -> int:
+        """Links two roots, the one with the larger key becomes the first child of the other.
+        """
+        keys = self.index_to_key
+        if keys[b] < keys[a]:
+            a, b = b, a
+        first = self._child[a]
+        self._next[b] = first
+        if first != -1:
+            self._prev[first] = b
+        self._child[a] = b
+        self._prev[b] = a
+        return a
+
+    def insert(self, index: int, key):
+        if self.index_to_key[index] is not None:
+            raise KeyError("Value at provided index already exists")
+
+        self.index_to_key[index] = key
+        self._child[index] = self._next[index] = self._prev[index] = -1
+        self._root = index if self._root == -1 else self._meld(self._root, index)
+        self._len += 1
+
+    def key_of_index(self, index: int):
+        return self.index_to_key[index]
+
+    def contains(self, index: int) -> bool:
+        return self.index_to_key[index] is not None
+
+    def insert_or_decrease(self, index: int, key) -> bool:
+        old_key = self.index_to_key[index]
+        if old_key is None:
+            self.insert(index, key)
+        elif key < old_key:
+            self.decrease_key(index, key)
+        else:
+            return False
+        return True
+
+    def min(self) -> int:
+        return self._root
+
+    def decrease_key(self, index: int, key) -> None:
+        if not self.contains(index):
+            raise KeyError("Index is not in the heap")
+        if self.index_to_key[index] < key:
+            raise ValueError("Keys can only decrease")
+
+        self.index_to_key[index] = key
+        if index == self._root:
+            return
+
+        # cut the subtree of index out of its sibling list
+        prev, next_ = self._prev[index], self._next[index]
+        if self._child[prev] == index:
+            self._child[prev] = next_
+        else:
+            self._next[prev] = next_
+        if next_ != -1:
+            self._prev[next_] = prev
+        self._next[index] = self._prev[index] = -1
+
+        self._root = self._meld(self._root, index)
+
+    def del_min(self) -> tuple[int, Any]:
+        if self._root == -1:
+            raise IndexError("Heap empty")
+
+        root = self._root
+        key = self.index_to_key[root]
+        self.index_to_key[root] = None
+        self._len -= 1
+
+        # first pass melds the children in pairs from the left, second pass melds the pairs from the right
+        pairs = []
+        child = self._child[root]
+        while child != -1:
+            second = self._next[child]
+            if second == -1:
+                self._prev[child] = -1
+                pairs.append(child)
+                break
+            after = self._next[second]
+            self._next[child] = self._prev[child] = self._next[second] = self._prev[second] = -1
+            pairs.append(self._meld(child, second))
+            child = after
+
+        new_root = -1
+        for tree in reversed(pairs):
+            new_root = tree if new_root == -1 else self._meld(new_root, tree)
+        self._root = new_root
+        self._child[root] = -1
+
+        return root, key
+
+    def __len__(self):
+        return self._len
@@ -1,7 +1,16 @@
-from collections import deque
+from array import array
+from dsa1lib.bucketqueue import integer_pq_of
+from dsa1lib.csr import CSRGraph, CSRWeightedGraph
+from dsa1lib.dense import DenseWeightedGraph, dense_dijkstra
 from dsa1lib.graph import WeightedEdge, WeightedGraph
-from dsa1lib.indexheap import IndexedMinPQ
+from dsa1lib.indexheap import IndexedMinPQ, IndexedPQ
+from dsa1lib.topological import PostOrder
+from typing import Callable, Iterable, Iterator
 import math
+import multiprocessing
+import os
+import shutil
+import tempfile
 import abc
 
 
@@ -42,44 +51,408 @@ class SingleSourceShortestPathAlgo(abc.ABC):
 
 class DijkstraSSSP(SingleSourceShortestPathAlgo):
 
-    def __init__(self, graph: WeightedGraph, source: int):
+    def __init__(self, graph: WeightedGraph, source: int,
+                 pq_factory: Callable[[int], IndexedPQ] | None = None, target: int | None = None):
+        """
+        Args:
+            graph (WeightedGraph): Graph with non negative edge weights.
+            source (int): Source vertex.
+            pq_factory (Callable[[int], IndexedPQ] | None, optional): Makes the priority queue from the number of
+                vertices, e.g. IndexedMinPQ, LazyMinPQ, PairingHeap. Defaults to a DialQueue for small integral 
+                weights and IndexedMinPQ otherwise.
+            target (int | None, optional): Stop as soon as target is settled. Only dist_to[target] and
+                shortest_path_to(target) are final then, other vertices may hold tentative distances. Defaults to
+                None, settling every reachable vertex.
+        """
+        self.pq_factory = pq_factory
+        self.target = target
         super().__init__(graph, source)
 
     def _find_shortest_path(self):
-        index_min_pq = IndexedMinPQ(self.graph.num_vertices)
-
-        self.dist_to[self.source] = 0.0
-        self.edge_to[self.source] = None
+        if isinstance(self.graph, DenseWeightedGraph):
+            self._find_shortest_path_dense(self.graph)
+            return
+
+        graph = self.graph
+        edge_v1, edge_v2, weights = graph.edge_v1, graph.edge_v2, graph.edge_weights  # type: ignore
+        dist_to = self.dist_to
+        # edge ids of the shortest path tree, edge objects are only made for these at the end
+        edge_id_to = [-1] * graph.num_vertices
+        index_min_pq = self._new_pq()
+
+        dist_to[self.source] = 0.0
         index_min_pq.insert(self.source, 0.0)
 
+        target = self.target
         while len(index_min_pq):
-            closest_vertex, _ = index_min_pq.del_min()
-            self._relax_vertex(closest_vertex, index_min_pq)
+            closest_vertex, closest_dist = index_min_pq.del_min()
+            if closest_vertex == target:
+                break
 
-    def _relax_vertex(self, vertex: int, index_min_pq: IndexedMinPQ):
-        """Relaxes adj edges of the vertex
+            for eid in graph.adj_ids(closest_vertex):  # type: ignore
+                to_vertex = edge_v2[eid] if edge_v1[eid] == closest_vertex else edge_v1[eid]
+                new_dist = closest_dist + weights[eid]
+
+                if new_dist < dist_to[to_vertex]:
+                    dist_to[to_vertex] = new_dist
+                    edge_id_to[to_vertex] = eid
+                    index_min_pq.insert_or_decrease(to_vertex, new_dist)
+
+        for v, eid in enumerate(edge_id_to):
+            if eid != -1:
+                self.edge_to[v] = graph.edge(eid)  # type: ignore
+
+    def _new_pq(self) -> IndexedPQ:
+        """Queue from pq_factory if given, else a Dial bucket queue for small integral weights, IndexedMinPQ otherwise. 
+        """
+        if self.pq_factory is not None:
+            return self.pq_factory(self.graph.num_vertices)
+        pq = integer_pq_of(self.graph)
+        return pq if pq is not None else IndexedMinPQ(self.graph.num_vertices)
 
+    def _find_shortest_path_dense(self, graph: DenseWeightedGraph):
+        """O(V^2) array-scan Dijkstra for adjacency matrices. 
+        """
+        self.dist_to, parent = dense_dijkstra(graph, self.source, self.target)
+        for v, u in enumerate(parent):
+            if u != -1:
+                self.edge_to[v] = graph.edge(u * graph.num_vertices + v)
+
+
+class BidirectionalDijkstra:
+    """Point to point Dijkstra searching forward from the source and backward from the target, over the cached 
+    reverse graph for directed graphs, or lists of the edges into every vertex for graphs without reverse(), such as 
+    SubgraphView. The side with the smaller queue settles next, and the search stops once the 
+    two smallest queued distances add up to at least the best source to target distance seen where the searches 
+    met. Each search only gets about half way, which on road like graphs settles far fewer vertices than searching 
+    from one side. 
+    """
+
+    def __init__(self, graph: WeightedGraph, source: int, target: int):
+        """
+        Args:
+            graph (WeightedGraph): Graph with non negative edge weights and edge arrays, so not a 
+                DenseWeightedGraph. 
+            source (int): Source vertex. 
+            target (int): Target vertex. 
+        """
+        if isinstance(graph, DenseWeightedGraph):
+            raise TypeError("BidirectionalDijkstra needs edge arrays, use DijkstraSSSP with a target for dense graphs.")
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.dist = math.inf
+        self._path_eids: list[int] = []
+        self._search()
+
+    def _search(self):
+        graph, source, target = self.graph, self.source, self.target
+        # both searches walk the edge arrays of the graph, the backward one over the edges into each vertex. Edge 
+        # eid of the reverse graph is the reverse of edge eid, and the other end of an edge into v is its tail 
+        adj_ids = (graph.adj_ids, self._backward_adj_ids())
+        edge_v1, edge_v2, weights = graph.edge_v1, graph.edge_v2, graph.edge_weights
+        V = graph.num_vertices
+        dist_to = ([math.inf] * V, [math.inf] * V)
+        edge_id_to = ([-1] * V, [-1] * V)
+        pqs = (self._new_pq(graph), self._new_pq(graph))
+
+        dist_to[0][source] = 0.0
+        dist_to[1][target] = 0.0
+        pqs[0].insert(source, 0.0)
+        pqs[1].insert(target, 0.0)
+        best, meet = (0.0, source) if source == target else (math.inf, -1)
+
+        while len(pqs[0]) and len(pqs[1]):
+            if pqs[0].key_of_index(pqs[0].min()) + pqs[1].key_of_index(pqs[1].min()) >= best:  # type: ignore
+                break
+
+            side = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+            pq, dist, other_dist = pqs[side], dist_to[side], dist_to[1 - side]
+
+            closest_vertex, closest_dist = pq.del_min()
+            for eid in adj_ids[side](closest_vertex):
+                to_vertex = edge_v2[eid] if edge_v1[eid] == closest_vertex else edge_v1[eid]
+                new_dist = closest_dist + weights[eid]
+
+                if new_dist < dist[to_vertex]:
+                    dist[to_vertex] = new_dist
+                    edge_id_to[side][to_vertex] = eid
+                    pq.insert_or_decrease(to_vertex, new_dist)
+                    # checked whenever either distance of a vertex drops, so no meeting point is missed
+                    if new_dist + other_dist[to_vertex] < best:
+                        best, meet = new_dist + other_dist[to_vertex], to_vertex
+
+        self.dist = best
+        if meet == -1:
+            return
+
+        # meeting vertex back to the target reversed, then the meeting vertex back to the source
+        for side, end in ((1, target), (0, source)):
+            half: list[int] = []
+            v = meet
+            while v != end:
+                eid = edge_id_to[side][v]
+                half.append(eid)
+                v = edge_v2[eid] if edge_v1[eid] == v else edge_v1[eid]
+            self._path_eids += reversed(half) if side == 1 else half
+
+    def _backward_adj_ids(self) -> Callable[[int], Iterable[int]]:
+        """Ids of the edges into a vertex. 
+        """
+        graph = self.graph
+        if not graph.directed:
+            return graph.adj_ids
+        if hasattr(graph, "reverse"):
+            return graph.reverse().adj_ids  # type: ignore
+        into: list[list[int]] = [[] for _ in range(graph.num_vertices)]
+        edge_v2 = graph.edge_v2
+        for v in range(graph.num_vertices):
+            for eid in graph.adj_ids(v):
+                into[edge_v2[eid]].append(eid)
+        return into.__getitem__
+
+    @staticmethod
+    def _new_pq(graph: WeightedGraph) -> IndexedPQ:
+        pq = integer_pq_of(graph)
+        return pq if pq is not None else IndexedMinPQ(graph.num_vertices)
+
+    def shortest_path(self) -> list[WeightedEdge]:
+        """Edges of the shortest path in the order of shortest_path_to(), from the target back to the source. Empty 
+        if the target is unreachable or is the source. 
+
+        Returns:
+            list[WeightedEdge]: Shortest path. 
+        """
+        return [self.graph.edge(eid) for eid in self._path_eids]
+
+
+def shortest_path(graph: WeightedGraph, source: int, target: int,
+                  bidirectional: bool = False) -> tuple[float, list[WeightedEdge]]:
+    """Shortest path between two vertices, without settling the rest of the graph. The one sided search is 
+    DijkstraSSSP stopping at the target, the two sided one BidirectionalDijkstra. Dense graphs always search from 
+    one side, their array scan Dijkstra gains nothing from a second search. 
+
+    Args:
+        graph (WeightedGraph): Graph with non negative edge weights. 
+        source (int): Source vertex. 
+        target (int): Target vertex. 
+        bidirectional (bool, optional): Search from both ends, ignored for DenseWeightedGraph. Defaults to False. 
+
+    Returns:
+        tuple[float, list[WeightedEdge]]: Distance, inf if unreachable, and the path edges from the target back to 
+            the source. 
+    """
+    if bidirectional and not isinstance(graph, DenseWeightedGraph):
+        search = BidirectionalDijkstra(graph, source, target)
+        return search.dist, search.shortest_path()
+
+    dijkstra = DijkstraSSSP(graph, source, target=target)
+    return dijkstra.dist_to[target], dijkstra.shortest_path_to(target)
+
+
+def _post_order(graph: WeightedGraph) -> PostOrder:
+    """Post order of the graph, whose has_cycle tells if it is a DAG. The search walks adj_ids(), so views only 
+    follow the edges they keep, and undirected edges go both ways, so they always make a cycle. 
+    """
+    edge_v1, edge_v2, adj_ids = graph.edge_v1, graph.edge_v2, graph.adj_ids
+    if graph.directed:
+        def heads(v: int) -> Iterable[int]:
+            return map(edge_v2.__getitem__, adj_ids(v))
+    else:
+        def heads(v: int) -> Iterable[int]:
+            return (edge_v2[eid] if edge_v1[eid] == v else edge_v1[eid] for eid in adj_ids(v))
+    return PostOrder(graph, heads)  # type: ignore
+
+
+class DagSSSP(SingleSourceShortestPathAlgo):
+    """Shortest paths in a directed acyclic graph. Vertices are taken in reverse post order, a topological order, 
+    and every edge is relaxed once after all edges into its tail, which is O(V + E) and allows negative weights. 
+    """
+
+    def __init__(self, graph: WeightedGraph, source: int, order: list[int] | None = None):
+        """
         Args:
-            vertex (int): Vertex whose adj edges to relax
-            index_min_pq (IndexedMinPQ): PQ holding shortest path order. 
+            graph (WeightedGraph): Directed acyclic graph. 
+            source (int): Source vertex. 
+            order (list[int] | None, optional): Post order of the graph if already known, e.g. from 
+                topological.PostOrder. Defaults to None, computing it. 
         """
+        self.order = order
+        super().__init__(graph, source)
 
-        def relax(edge: WeightedEdge, to_vertex: int):
-            pred = edge.other_vertex(to_vertex)
-            new_dist = self.dist_to[pred] + edge.weight
+    def _find_shortest_path(self):
+        graph = self.graph
+        if self.order is None:
+            post_order = _post_order(graph)
+            if post_order.has_cycle:
+                raise ValueError("Graph has a cycle, DagSSSP needs an acyclic graph.")
+            self.order = post_order.order
+
+        edge_v2, weights = graph.edge_v2, graph.edge_weights
+        dist_to = self.dist_to
+        edge_id_to = [-1] * graph.num_vertices
+        dist_to[self.source] = 0.0
+
+        for v in reversed(self.order):
+            v_dist = dist_to[v]
+            if v_dist == math.inf:
+                continue
+            for eid in graph.adj_ids(v):
+                to_vertex = edge_v2[eid]
+                if v_dist + weights[eid] < dist_to[to_vertex]:
+                    dist_to[to_vertex] = v_dist + weights[eid]
+                    edge_id_to[to_vertex] = eid
+
+        for v, eid in enumerate(edge_id_to):
+            if eid != -1:
+                self.edge_to[v] = graph.edge(eid)
+
+
+def shortest_paths(graph: WeightedGraph, source: int) -> SingleSourceShortestPathAlgo:
+    """Shortest paths from source with the cheapest algorithm the graph allows: DagSSSP for directed acyclic graphs, 
+    whatever their weights, DijkstraSSSP for non negative weights, and BellmanFordSSSP otherwise. The checks are a 
+    depth first search and a pass over the weights, both O(V + E). 
+
+    Args:
+        graph (WeightedGraph): Graph to search. 
+        source (int): Source vertex. 
+
+    Returns:
+        SingleSourceShortestPathAlgo: The algorithm that was run. 
+    """
+    if isinstance(graph, DenseWeightedGraph):
+        weights = graph.matrix
+    else:
+        weights = graph.edge_weights
+        if graph.directed:
+            post_order = _post_order(graph)
+            if not post_order.has_cycle:
+                return DagSSSP(graph, source, post_order.order)
+
+    if not len(weights) or min(weights) >= 0:
+        return DijkstraSSSP(graph, source)
+    return BellmanFordSSSP(graph, source)
+
+
+def _coordinate_arrays(coords) -> tuple[array, array]:
+    xs, ys = array("d"), array("d")
+    for x, y in coords:
+        xs.append(x)
+        ys.append(y)
+    return xs, ys
+
+
+class _MatrixEnds:
+    """Stand in for edge_v1 (tails) or edge_v2 (heads) of a DenseWeightedGraph, whose edge ids are v1 * V + v2. 
+    """
+
+    def __init__(self, V: int, heads: bool):
+        self.V = V
+        self.heads = heads
+
+    def __getitem__(self, eid: int) -> int:
+        return eid % self.V if self.heads else eid // self.V
+
+
+def euclidean_heuristic(coords, scale: float = 1.0) -> Callable[[int, int], float]:
+    """Straight line distance between vertex positions. Admissible when every edge weighs at least scale times the 
+    distance between its endpoints. 
+
+    Args:
+        coords: (x, y) of every vertex, e.g. Grid2D.coordinates(). 
+        scale (float, optional): Smallest weight per unit of distance. Defaults to 1.0. 
+
+    Returns:
+        Callable[[int, int], float]: Heuristic for AStarShortestPath. 
+    """
+    xs, ys = _coordinate_arrays(coords)
+
+    def heuristic(v: int, target: int) -> float:
+        return scale * math.hypot(xs[v] - xs[target], ys[v] - ys[target])
+    return heuristic
+
+
+def manhattan_heuristic(coords, scale: float = 1.0) -> Callable[[int, int], float]:
+    """Sum of the x and y differences between vertex positions, tighter than euclidean_heuristic on graphs whose 
+    edges run along the axes, like grids. Admissible when every edge weighs at least scale times the manhattan 
+    distance between its endpoints. 
+
+    Args:
+        coords: (x, y) of every vertex, e.g. Grid2D.coordinates(). 
+        scale (float, optional): Smallest weight per unit of distance. Defaults to 1.0. 
+
+    Returns:
+        Callable[[int, int], float]: Heuristic for AStarShortestPath. 
+    """
+    xs, ys = _coordinate_arrays(coords)
+
+    def heuristic(v: int, target: int) -> float:
+        return scale * (abs(xs[v] - xs[target]) + abs(ys[v] - ys[target]))
+    return heuristic
+
+
+class AStarShortestPath(SingleSourceShortestPathAlgo):
+    """Goal directed Dijkstra. Vertices are queued by distance from the source plus the heuristic estimate of the 
+    distance left to the target, so the search heads for the target and stops when it is settled. With an 
+    admissible heuristic dist_to[target] and shortest_path_to(target) are exact; other entries of dist_to are upper 
+    bounds. A vertex that is reached again through a shorter path is queued again, so heuristics that are admissible 
+    but not consistent are handled too. 
+    """
+
+    def __init__(self, graph: WeightedGraph, source: int, target: int,
+                 heuristic: Callable[[int, int], float] | None = None,
+                 pq_factory: Callable[[int], IndexedPQ] = IndexedMinPQ):
+        """
+        Args:
+            graph (WeightedGraph | DenseWeightedGraph): Graph with non negative edge weights. 
+            source (int): Source vertex. 
+            target (int): Target vertex. 
+            heuristic (Callable[[int, int], float] | None, optional): Lower bound on the distance from a vertex to 
+                the target, given both, e.g. euclidean_heuristic(coords). Defaults to None, which is Dijkstra. 
+            pq_factory (Callable[[int], IndexedPQ], optional): Makes the priority queue from the number of 
+                vertices. Defaults to IndexedMinPQ. 
+        """
+        self.target = target
+        self.heuristic = heuristic if heuristic is not None else lambda v, target: 0.0
+        self.pq_factory = pq_factory
+        super().__init__(graph, source)
+
+    def _find_shortest_path(self):
+        graph, target, heuristic = self.graph, self.target, self.heuristic
+        if isinstance(graph, DenseWeightedGraph):
+            # the matrix is indexed by edge id, only the endpoints have to be worked out from the id
+            V = graph.num_vertices
+            edge_v1, edge_v2, weights = _MatrixEnds(V, heads=False), _MatrixEnds(V, heads=True), graph.matrix
+        else:
+            edge_v1, edge_v2, weights = graph.edge_v1, graph.edge_v2, graph.edge_weights
+        dist_to = self.dist_to
+        edge_id_to = [-1] * graph.num_vertices
+        pq = self.pq_factory(graph.num_vertices)
+        # number of vertices taken off the queue, a measure of how focused the search was
+        self.settled = 0
 
-            if new_dist < self.dist_to[to_vertex]:
-                self.edge_to[to_vertex] = edge
-                self.dist_to[to_vertex] = new_dist
+        dist_to[self.source] = 0.0
+        pq.insert(self.source, heuristic(self.source, target))
 
-                if index_min_pq.key_of_index(to_vertex) is None:
-                    index_min_pq.insert(to_vertex, new_dist)
-                else:
-                    index_min_pq.decrease_key(to_vertex, new_dist)
+        while len(pq):
+            closest_vertex, _ = pq.del_min()
+            self.settled += 1
+            if closest_vertex == target:
+                break
 
-        for adj_edge in self.graph.adj(vertex):
-            to_vertex = adj_edge.other_vertex(vertex)
-            relax(adj_edge, to_vertex)
+            closest_dist = dist_to[closest_vertex]
+            for eid in graph.adj_ids(closest_vertex):
+                to_vertex = edge_v2[eid] if edge_v1[eid] == closest_vertex else edge_v1[eid]
+                new_dist = closest_dist + weights[eid]
+
+                if new_dist < dist_to[to_vertex]:
+                    dist_to[to_vertex] = new_dist
+                    edge_id_to[to_vertex] = eid
+                    pq.insert_or_decrease(to_vertex, new_dist + heuristic(to_vertex, target))
+
+        for v, eid in enumerate(edge_id_to):
+            if eid != -1:
+                self.edge_to[v] = graph.edge(eid)
 
 
 class BellmanFordSSSP(SingleSourceShortestPathAlgo):
@@ -98,57 +471,179 @@ class BellmanFordSSSP(SingleSourceShortestPathAlgo):
         return super().shortest_path_tree
 
     def _find_shortest_path(self):
-        relax_q: deque[int] = deque(maxlen=self.graph.num_vertices)
-        relax_q_next_iter: deque[int] = deque(maxlen=self.graph.num_vertices)
-
-        is_v_on_q = [False] * self.graph.num_vertices
-
-        relax_q.append(0)
-        is_v_on_q[0] = True
-        self.edge_to[0] = None
-        self.dist_to[0] = 0
-
-        # +1 pass to make relax_q_next_iter work as a negative cycle identifier
-        for _ in range(self.graph.num_vertices):
-            while len(relax_q):
-                next_v_to_relax = relax_q.popleft()
-                # a vertex can't be on q on multiple instances
-                is_v_on_q[next_v_to_relax] = False
-
-                # parent checking heuristic
-                if self.edge_to[next_v_to_relax]:
-                    pred_v = self.edge_to[next_v_to_relax].other_vertex(  # type: ignore
-                        next_v_to_relax)
-                    if is_v_on_q[pred_v]:
-                        # hold off relaxing this vertex, because predecessor will relax it again.
-                        continue
-
-                self._relax_vertex(
-                    next_v_to_relax, is_v_on_q, relax_q_next_iter)
-
-            relax_q, relax_q_next_iter = relax_q_next_iter, relax_q  # relax_q is empty now
-
-        if len(relax_q):
-            self.is_neg_cycle_reachable = True
-        else:
-            self.is_neg_cycle_reachable = False
-
-    def _relax_vertex(self, v: int, is_v_on_q: list[bool], relax_q_next_iter: deque[int]):
-
-        def relax(edge: WeightedEdge, to_v: int):
-            new_dist = self.dist_to[v] + edge.weight
-
-            if new_dist < self.dist_to[to_v]:
-                self.dist_to[to_v] = new_dist
-                self.edge_to[to_v] = edge
-                if not is_v_on_q[to_v]:
-                    relax_q_next_iter.append(to_v)
-                    is_v_on_q[to_v] = True
-
-        for adj_edge in self.graph.adj(v):
-            to_v = adj_edge.other_vertex(v)
-            relax(adj_edge, to_v)
+        # numpy is only needed once Bellman-Ford runs, importing shortestpath does not pull it in
+        from dsa1lib.bellmanford import bellman_ford, edge_arrays_of
+        dist_to, edge_id_to, self.is_neg_cycle_reachable = bellman_ford(
+            self.graph.num_vertices, *edge_arrays_of(self.graph), self.source)
+        self.dist_to = dist_to.tolist()
+        for v, eid in enumerate(edge_id_to.tolist()):
+            if eid != -1:
+                self.edge_to[v] = self.graph.edge(eid)
+
+
+class _SourceSweeper:
+    """Dijkstra distances from one source after another over a frozen graph. The distance buffer and the priority 
+    queue are made once and reset between sources, only the entries a source reached are touched. 
+    """
+
+    def __init__(self, graph: CSRWeightedGraph):
+        self.graph = graph
+        V = graph.num_vertices
+        self.dist_to = array("d", [math.inf]) * V
+        self.reached: list[int] = []
+        # every run empties the queue, so one queue serves all of them
+        pq = integer_pq_of(graph)
+        self.pq = pq if pq is not None else IndexedMinPQ(V)
+
+    def distances_from(self, source: int) -> tuple[int, array]:
+        graph, dist_to, reached, pq = self.graph, self.dist_to, self.reached, self.pq
+        offsets, targets, weights = graph.offsets, graph.targets, graph.slot_weights
+        if source < 0 or source >= graph.num_vertices:
+            raise ValueError(
+                "Vertex in not within bounds of the number of vertex for the graph.")
+
+        dist_to[source] = 0.0
+        reached.append(source)
+        pq.insert(source, 0.0)
+        while len(pq):
+            closest_vertex, closest_dist = pq.del_min()
+            lo, hi = offsets[closest_vertex], offsets[closest_vertex + 1]
+            for to_vertex, weight in zip(targets[lo:hi], weights[lo:hi]):
+                new_dist = closest_dist + weight
+                if new_dist < dist_to[to_vertex]:
+                    if dist_to[to_vertex] == math.inf:
+                        reached.append(to_vertex)
+                    dist_to[to_vertex] = new_dist
+                    pq.insert_or_decrease(to_vertex, new_dist)
+
+        result = array("d", dist_to)
+        for v in reached:
+            dist_to[v] = math.inf
+        reached.clear()
+        return source, result
+
+
+# sweeper of a pool worker, set up once per process by _init_worker
+_worker_sweeper: _SourceSweeper | None = None
+
+
+def _init_worker(path: str):
+    global _worker_sweeper
+    _worker_sweeper = _SourceSweeper(CSRGraph.load(path))  # type: ignore
+
+
+def _worker_distances_from(source: int) -> tuple[int, array]:
+    return _worker_sweeper.distances_from(source)  # type: ignore
+
+
+def many_sources_sssp(graph: WeightedGraph | CSRWeightedGraph, sources: Iterable[int], workers: int = 1,
+                      chunksize: int = 16) -> Iterator[tuple[int, array]]:
+    """Dijkstra distances from many sources over one graph. The graph is frozen once, and every worker keeps its own 
+    distance buffer and priority queue for all the sources it gets, instead of a DijkstraSSSP per source. 
+
+    With more than one worker the frozen graph is written to a temporary file that the worker processes map read 
+    only, so they share its pages through the OS instead of each receiving a pickled copy. Results then come in the 
+    order the workers finish them. Graphs that cannot be frozen, such as DenseWeightedGraph and SubgraphView, raise 
+    TypeError on the call. 
+
+    Args:
+        graph (WeightedGraph | CSRWeightedGraph): Graph with non negative edge weights. 
+        sources (Iterable[int]): Source vertices. 
+        workers (int, optional): Number of worker processes, 1 runs in this process. Defaults to 1. 
+        chunksize (int, optional): Sources handed to a worker at a time. Defaults to 16. 
+
+    Returns:
+        Iterator[tuple[int, array]]: Source, and the distance from it to every vertex (inf if unreachable). 
+    """
+    if isinstance(graph, CSRWeightedGraph):
+        frozen = graph
+    elif isinstance(graph, WeightedGraph):
+        frozen = graph.freeze()
+    else:
+        raise TypeError(f"many_sources_sssp needs a WeightedGraph or CSRWeightedGraph, not {type(graph).__name__}.")
+    # the checks above run on the call, not on the first result
+    return _sweep_sources(frozen, sources, workers, chunksize)
+
+
+def _sweep_sources(frozen: CSRWeightedGraph, sources: Iterable[int], workers: int,
+                   chunksize: int) -> Iterator[tuple[int, array]]:
+    if workers <= 1:
+        sweeper = _SourceSweeper(frozen)
+        for source in sources:
+            yield sweeper.distances_from(source)
+        return
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "graph.csr")
+        frozen.save(path)
+        with multiprocessing.Pool(workers, _init_worker, (path,)) as pool:
+            yield from pool.imap_unordered(_worker_distances_from, sources, chunksize)
+    finally:
+        shutil.rmtree(directory)
 
 
 if __name__ == "__main__":
-    pass
+    # priority queue backends side by side on the same graphs
+    # usage: python -m dsa1lib.shortestpath [V]
+    import random
+    import sys
+    import time
+    from dsa1lib.fibonacciheap import FibonacciHeap
+    from dsa1lib.generators import ErdosRenyi, Grid2D
+    from dsa1lib.indexheap import LazyMinPQ
+    from dsa1lib.mst import PrimMST
+    from dsa1lib.pairingheap import PairingHeap
+
+    V = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    side = int(V ** 0.5)
+    backends = [("IndexedMinPQ", IndexedMinPQ), ("binary IndexedMinPQ", lambda n: IndexedMinPQ(n, 2)),
+                ("LazyMinPQ", LazyMinPQ), ("PairingHeap", PairingHeap), ("FibonacciHeap", FibonacciHeap)]
+
+    for name, graph in [(f"grid {side} x {side}", Grid2D(side, side).to_graph()),
+                        (f"dense G({V // 20}, {V * 5})", ErdosRenyi(V // 20, V * 5, directed=False).to_graph())]:
+        print(name)
+        for backend, pq_factory in [("default", None)] + backends:
+            start = time.perf_counter()
+            dijkstra = DijkstraSSSP(graph, 0, pq_factory)
+            dijkstra_at = time.perf_counter()
+            prim_time = ""
+            if pq_factory is not None:
+                PrimMST(graph, pq_factory)  # type: ignore
+                prim_time = f", prim {time.perf_counter() - dijkstra_at : .3f} s"
+            print(f"  {backend : <20}: dijkstra {dijkstra_at - start : .3f} s{prim_time}")
+
+    # one DijkstraSSSP per source against the batched sweep, in this process and over the worker pool
+    graph = Grid2D(side, side).to_graph()
+    sources = list(range(0, graph.num_vertices, max(1, graph.num_vertices // 50)))
+    print(f"{len(sources)} sources on grid {side} x {side}")
+    for name, run in [("DijkstraSSSP per source", lambda: [DijkstraSSSP(graph, s).dist_to for s in sources]),
+                      ("many_sources_sssp, 1 worker", lambda: list(many_sources_sssp(graph, sources, 1))),
+                      (f"many_sources_sssp, {os.cpu_count()} workers",
+                       lambda: list(many_sources_sssp(graph, sources, os.cpu_count() or 1)))]:
+        start = time.perf_counter()
+        run()
+        print(f"  {name : <28}: {time.perf_counter() - start : .3f} s")
+
+    # vertices settled by point to point queries between random vertices of the grid, with fractional weights so
+    # the counted IndexedMinPQ is used rather than a DialQueue
+    from dsa1lib.graph import WeightedUndirectedGraph
+    from dsa1lib.heapstats import count_heap_ops
+    rng = random.Random(20)
+    graph = WeightedUndirectedGraph.from_edge_arrays(
+        graph.num_vertices, graph.edge_v1, graph.edge_v2, [w + rng.random() for w in graph.edge_weights])
+    pairs = [(rng.randrange(graph.num_vertices), rng.randrange(graph.num_vertices)) for _ in range(20)]
+    coords = Grid2D(side, side).coordinates()
+    manhattan, euclidean = manhattan_heuristic(coords), euclidean_heuristic(coords)
+    print(f"{len(pairs)} point to point queries on grid {side} x {side}")
+    for name, query in [("full DijkstraSSSP", lambda s, t: DijkstraSSSP(graph, s).dist_to[t]),
+                        ("shortest_path", lambda s, t: shortest_path(graph, s, t)),
+                        ("bidirectional", lambda s, t: shortest_path(graph, s, t, bidirectional=True)),
+                        ("A*, manhattan", lambda s, t: AStarShortestPath(graph, s, t, manhattan)),
+                        ("A*, euclidean", lambda s, t: AStarShortestPath(graph, s, t, euclidean))]:
+        start = time.perf_counter()
+        with count_heap_ops() as stats:
+            for s, t in pairs:
+                query(s, t)
+        print(f"  {name : <28}: {time.perf_counter() - start : .3f} s, "
+              f"{stats.counts['del_mins'] // len(pairs)} settled per query")
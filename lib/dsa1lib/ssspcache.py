@@ -0,0 +1,194 @@
+from array import array
+from collections import OrderedDict
+from dsa1lib.graph import WeightedEdge
+from dsa1lib.shortestpath import DijkstraSSSP, SingleSourceShortestPathAlgo
+from typing import Any, Callable, NamedTuple
+import weakref
+
+
+class CachedSSSP:
+    """Shortest path tree handed out by SSSPCache: the distance and the id of the edge into every vertex in two flat
+    arrays, 12 bytes per vertex, behind the dist_to/shortest_path_to surface of SingleSourceShortestPathAlgo. Edge
+    objects are made from the graph only when a path is asked for. The arrays are shared with the cache, do not
+    modify them.
+    """
+
+    def __init__(self, graph, source: int, dist_to: array, edge_id_to: array, is_neg_cycle_reachable: bool = False):
+        self.graph = graph
+        self.source = source
+        self.dist_to = dist_to
+        self.edge_id_to = edge_id_to
+        self.is_neg_cycle_reachable = is_neg_cycle_reachable
+
+    def shortest_path_to(self, v: int) -> list[WeightedEdge] | None:
+        if self.is_neg_cycle_reachable:
+            return None
+
+        shortest_path = []
+        u = v
+        while self.edge_id_to[u] != -1:
+            edge = self.graph.edge(self.edge_id_to[u])
+            shortest_path.append(edge)
+            u = edge.other_vertex(u)
+        return shortest_path
+
+    @property
+    def shortest_path_tree_cost(self) -> float:
+        return sum(self.graph.edge(eid).weight for eid in self.edge_id_to if eid != -1)
+
+
+class _Entry(NamedTuple):
+    dist_to: array
+    edge_id_to: array
+    is_neg_cycle_reachable: bool
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.dist_to) * self.dist_to.itemsize + len(self.edge_id_to) * self.edge_id_to.itemsize
+
+
+class SSSPCache:
+    """LRU cache of shortest path trees, keyed by graph, graph version, source and algorithm. Trees are kept as
+    arrays, and the least recently used ones are evicted once their total size passes max_bytes.
+
+    A graph that changes gets a new version, so its old trees are never returned again, and they are dropped the
+    next time the graph is looked up. The cache holds graphs weakly, and the trees of a graph go when it is garbage
+    collected. Frozen graphs are always at version 0 and views at the version of their graph. Trees of objects
+    without a version are computed every time and never cached, since nothing would tell when they go stale.
+
+    Algorithms are told apart by identity, so pass the same class or function for every lookup that should share
+    trees. A new lambda per call never hits, and its trees only take up room until they are evicted.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20):
+        """
+        Args:
+            max_bytes (int, optional): Memory budget for the distance and edge id arrays. Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # (id of graph, version, source, algorithm) -> tree, least recently used first
+        self._entries: OrderedDict[tuple[int, int, int, Callable], _Entry] = OrderedDict()
+        # id of graph -> keys of its trees
+        self._graph_keys: dict[int, set[tuple[int, int, int, Callable]]] = {}
+
+    def get(self, graph, source: int,
+            algorithm: Callable[[Any, int], SingleSourceShortestPathAlgo] = DijkstraSSSP) -> CachedSSSP:
+        """Shortest path tree from source, computed with algorithm(graph, source) on a miss.
+
+        Args:
+            graph (WeightedGraph): Graph to search.
+            source (int): Source vertex.
+            algorithm (Callable[[Any, int], SingleSourceShortestPathAlgo], optional): Algorithm class, or any
+                callable making one from the graph and the source. Defaults to DijkstraSSSP.
+
+        Returns:
+            CachedSSSP: Distances and shortest paths from source.
+        """
+        version = getattr(graph, "version", None)
+        if version is None:
+            self.misses += 1
+            return self._compute(graph, source, algorithm)
+        key = (id(graph), version, source, algorithm)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return CachedSSSP(graph, source, entry.dist_to, entry.edge_id_to, entry.is_neg_cycle_reachable)
+
+        self.misses += 1
+        self._drop_other_versions(graph, version)
+
+        cached = self._compute(graph, source, algorithm)
+        entry = _Entry(cached.dist_to, cached.edge_id_to, cached.is_neg_cycle_reachable)
+        if entry.nbytes <= self.max_bytes:
+            if id(graph) not in self._graph_keys:
+                self._graph_keys[id(graph)] = set()
+                weakref.finalize(graph, self._forget_graph, id(graph))
+            self._graph_keys[id(graph)].add(key)
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+        return cached
+
+    @staticmethod
+    def _compute(graph, source: int, algorithm: Callable[[Any, int], SingleSourceShortestPathAlgo]) -> CachedSSSP:
+        algo = algorithm(graph, source)
+        edge_id_to = array("i", [-1]) * graph.num_vertices
+        for v, edge in enumerate(algo.edge_to):
+            if edge is not None:
+                edge_id_to[v] = edge.eid  # type: ignore
+        return CachedSSSP(graph, source, array("d", algo.dist_to), edge_id_to,
+                          getattr(algo, "is_neg_cycle_reachable", False))
+
+    def _drop_other_versions(self, graph, version: int):
+        stale = [key for key in self._graph_keys.get(id(graph), ()) if key[1] != version]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+
+    def _remove(self, key: tuple[int, int, int, Callable]):
+        self.nbytes -= self._entries.pop(key).nbytes
+        self._graph_keys[key[0]].discard(key)
+
+    def _forget_graph(self, graph_id: int):
+        for key in self._graph_keys.pop(graph_id, ()):
+            self.nbytes -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        """Drops every tree, the statistics are kept.
+        """
+        self._entries.clear()
+        for keys in self._graph_keys.values():
+            keys.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Counters for sizing the cache.
+
+        Returns:
+            dict[str, int]: hits, misses, evictions (to stay within the memory budget), invalidations (trees of an
+                older graph version), entries and bytes in use.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "invalidations": self.invalidations, "entries": len(self._entries), "bytes": self.nbytes}
+
+
+if __name__ == "__main__":
+    # repeated queries from a few hot sources, with and without the cache
+    # usage: python -m dsa1lib.ssspcache [V] [queries]
+    import random
+    import sys
+    import time
+    from dsa1lib.generators import ErdosRenyi
+
+    V = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    graph = ErdosRenyi(V, 5 * V, seed=22).to_graph()
+    rng = random.Random(22)
+    hot_sources = [rng.randrange(V) for _ in range(8)]
+    workload = [(rng.choice(hot_sources), rng.randrange(V)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    for source, target in workload:
+        DijkstraSSSP(graph, source).shortest_path_to(target)
+    print(f"DijkstraSSSP per query: {time.perf_counter() - start : .3f} s")
+
+    for room in (4, 8):
+        cache = SSSPCache(max_bytes=room * 12 * V)
+        start = time.perf_counter()
+        for source, target in workload:
+            cache.get(graph, source).shortest_path_to(target)
+        print(f"SSSPCache, room for {room}: {time.perf_counter() - start : .3f} s, {cache.stats()}")
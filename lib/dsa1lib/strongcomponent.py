@@ -1,5 +1,5 @@
-from topological import PostOrder
-from graph import DirectedGraph
+from dsa1lib.topological import PostOrder
+from dsa1lib.graph import DirectedGraph
 
 
 class KosarajuStringComponent:
@@ -0,0 +1,159 @@
+from typing import Callable, Iterable, Sequence
+from dsa1lib.csr import CSRWeightedGraph
+from dsa1lib.graph import Graph, WeightedEdge, WeightedGraph
+
+
+class SubgraphView:
+    """Subgraph of a graph defined by a vertex mask and/or an edge predicate. Nothing is copied: adj() filters the
+    adjacency of the underlying graph when it is asked for, so any number of views can share one graph. Vertices
+    keep their numbers, masked out vertices are still counted but have no edges.
+    """
+
+    def __init__(self, graph: Graph, vertex_mask: Sequence[bool] | None = None,
+                 edge_predicate: Callable | None = None) -> None:
+        """
+        Args:
+            graph (Graph): Underlying graph, weighted or not, mutable or frozen.
+            vertex_mask (Sequence[bool] | None, optional): Truthy for vertices in the subgraph. Defaults to all.
+            edge_predicate (Callable | None, optional): Edges kept in the subgraph, called as predicate(edge) for
+                weighted graphs and predicate(v, neighbor) otherwise. Defaults to all.
+        """
+        self.graph = graph
+        self.vertex_mask = vertex_mask
+        self.edge_predicate = edge_predicate
+        self.directed = graph.directed
+        self._weighted = isinstance(graph, (WeightedGraph, CSRWeightedGraph))
+
+    @classmethod
+    def without_vertices(cls, graph: Graph, vertices: Iterable[int]) -> "SubgraphView":
+        """View of the graph minus the given vertices and their edges.
+
+        Args:
+            graph (Graph): Underlying graph.
+            vertices (Iterable[int]): Vertices to leave out.
+
+        Returns:
+            SubgraphView: The view.
+        """
+        mask = bytearray(b"\x01") * graph.num_vertices
+        for v in vertices:
+            mask[v] = 0
+        return cls(graph, mask)
+
+    @property
+    def num_vertices(self) -> int:
+        return self.graph.num_vertices
+
+    @property
+    def version(self) -> int:
+        """Version of the underlying graph. Changes to vertex_mask or to what edge_predicate accepts are not seen.
+
+        Returns:
+            int: Version of the underlying graph.
+        """
+        return self.graph.version  # type: ignore
+
+    @property
+    def num_edges(self) -> int:
+        """Number of edges in the subgraph, counted by scanning the adjacency.
+
+        Returns:
+            int: Number of edges in the subgraph.
+        """
+        if self._weighted:
+            return len(self.edge_ids())
+        slots = sum(len(self.adj(v)) for v in range(self.num_vertices))
+        return slots if self.directed else slots // 2
+
+    @property
+    def edge_v1(self):
+        """Edge arrays of the underlying weighted graph, edge ids are shared with it. The arrays hold every edge of
+        the graph, only the ids from edge_ids() and adj_ids() are in the subgraph.
+        """
+        return self.graph.edge_v1  # type: ignore
+
+    @property
+    def edge_v2(self):
+        return self.graph.edge_v2  # type: ignore
+
+    @property
+    def edge_weights(self):
+        return self.graph.edge_weights  # type: ignore
+
+    def _check_vertex(self, v: int):
+        if v < 0 or v >= self.num_vertices:
+            raise ValueError(
+                "Vertex in not within bounds of the number of vertex for the graph.")
+
+    def adj_ids(self, v: int) -> list[int]:
+        """Ids of the adjacent edges of v that are in the subgraph, for weighted graphs.
+
+        Args:
+            v (int): Vertex whose adjacent edges to find.
+
+        Returns:
+            list[int]: Adjacent edge ids.
+        """
+        self._check_vertex(v)
+        mask = self.vertex_mask
+        if mask is not None and not mask[v]:
+            return []
+
+        eids = self.graph.adj_ids(v)  # type: ignore
+        if mask is not None:
+            edge_v1, edge_v2 = self.graph.edge_v1, self.graph.edge_v2  # type: ignore
+            eids = [eid for eid in eids if mask[edge_v1[eid]] and mask[edge_v2[eid]]]
+        if self.edge_predicate is not None:
+            eids = [eid for eid in eids if self.edge_predicate(self.graph.edge(eid))]  # type: ignore
+        return list(eids)
+
+    def adj(self, v: int) -> list:
+        """Adjacent edges (weighted graphs) or vertices (unweighted graphs) of v that are in the subgraph.
+
+        Args:
+            v (int): Vertex whose neighbors to find.
+
+        Returns:
+            list: Adjacent edges or vertices.
+        """
+        if self._weighted:
+            return [self.graph.edge(eid) for eid in self.adj_ids(v)]  # type: ignore
+
+        self._check_vertex(v)
+        mask = self.vertex_mask
+        if mask is not None and not mask[v]:
+            return []
+
+        neighbors = self.graph.adj(v)
+        if mask is not None:
+            neighbors = [u for u in neighbors if mask[u]]
+        if self.edge_predicate is not None:
+            neighbors = [u for u in neighbors if self.edge_predicate(v, u)]
+        return list(neighbors)
+
+    def edge(self, eid: int) -> WeightedEdge:
+        return self.graph.edge(eid)  # type: ignore
+
+    def edge_ids(self) -> list[int]:
+        """Ids of the edges in the subgraph, every edge once, for weighted graphs. These index the edge arrays of
+        the underlying graph.
+
+        Returns:
+            list[int]: Edge ids in the subgraph.
+        """
+        mask, edge_v1, edge_v2 = self.vertex_mask, self.graph.edge_v1, self.graph.edge_v2  # type: ignore
+        eids = range(self.graph.num_edges)
+        if mask is not None:
+            eids = [eid for eid in eids if mask[edge_v1[eid]] and mask[edge_v2[eid]]]
+        if self.edge_predicate is not None:
+            eids = [eid for eid in eids if self.edge_predicate(self.graph.edge(eid))]  # type: ignore
+        return list(eids)
+
+    def get_all_edges(self) -> list[WeightedEdge]:
+        return [self.graph.edge(eid) for eid in self.edge_ids()]  # type: ignore
+
+    def __repr__(self) -> str:
+        repre = ""
+        for v in range(self.num_vertices):
+            repre += f"{v}: " + str(self.adj(v)) + "\n"
+        return repre
@@ -1,15 +1,14 @@
-from typing import cast
-from graph import DirectedGraph
-from traversal import DFS
+from typing import Callable, Iterable, cast
+from dsa1lib.graph import DirectedGraph
 
 
 class TopologicalSort:
     def __init__(self, graph: DirectedGraph):
         self.graph = graph
-        dfs = DFS(graph)
+        post_order = PostOrder(graph)
         self._order = None
-        if not dfs.has_cycle:
-            self._order = PostOrder(self.graph).order
+        if not post_order.has_cycle:
+            self._order = post_order.order
             self._order.reverse()
 
     @property
@@ -18,28 +17,53 @@ class TopologicalSort:
 
 
 class PostOrder:
-    def __init__(self, graph: DirectedGraph):
+    """Vertices in the order a depth first search finishes them. The search keeps its own stack of adjacency 
+    iterators instead of recursing, so long paths do not hit the recursion limit. 
+    """
+
+    def __init__(self, graph: DirectedGraph, adj: Callable[[int], Iterable[int]] | None = None):
+        """
+        Args:
+            graph (DirectedGraph): Graph to search. 
+            adj (Callable[[int], Iterable[int]] | None, optional): Heads of the edges out of a vertex, for graphs 
+                whose adj() does not give vertices, e.g. weighted graphs. Defaults to graph.adj. 
+        """
         self.graph = graph
+        self._adj = adj if adj is not None else graph.adj
         self.color = [0] * self.graph.num_vertices
+        self._has_cycle = False
         self._order = self._get_order()
 
     def _get_order(self) -> list[int]:
         order = []
+        color, adj = self.color, self._adj
 
-        def _dfs(v: int):
-            self.color[v] = 1
-            for neighbor in self.graph.adj(v):
-                if self.color[neighbor] == 0:
-                    _dfs(neighbor)
-            order.append(v)
-            self.color[v] = 2
-
-        for v in range(self.graph.num_vertices):
-            if self.color[v] == 0:
-                _dfs(v)
+        for root in range(self.graph.num_vertices):
+            if color[root] != 0:
+                continue
+            color[root] = 1
+            stack = [(root, iter(adj(root)))]
+            while stack:
+                v, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if color[neighbor] == 0:
+                        color[neighbor] = 1
+                        stack.append((neighbor, iter(adj(neighbor))))
+                        break
+                    elif color[neighbor] == 1:
+                        # neighbor is still on the stack, the edge closes a cycle
+                        self._has_cycle = True
+                else:
+                    stack.pop()
+                    order.append(v)
+                    color[v] = 2
 
         return order
 
+    @property
+    def has_cycle(self) -> bool:
+        return self._has_cycle
+
     @property
     def order(self) -> list[int]:
         return self._order
@@ -48,10 +72,7 @@ class PostOrder:
 if __name__ == "__main__":
     v, e = input().split()
     v, e = int(v), int(e)
-    graph = DirectedGraph(v)
-    for edge in range(e):
-        v1, v2 = input().split()
-        v1, v2 = int(v1) - 1, int(v2) - 1
-        graph.add_edge(v1, v2)
+    edges = [input().split() for _ in range(e)]
+    graph = DirectedGraph.from_edge_arrays(v, [int(e[0]) - 1 for e in edges], [int(e[1]) - 1 for e in edges])
 
     print(TopologicalSort(graph).order)
@@ -1,5 +1,5 @@
 from typing import cast
-from graph import Graph, DirectedGraph
+from dsa1lib.graph import Graph, DirectedGraph
 from collections import deque
 
 
@@ -0,0 +1,75 @@
+import math
+import os
+import random
+import sys
+
+# the tests import the package the same way the modules do, as dsa1lib from the lib directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dsa1lib.graph import WeightedGraph  # noqa: E402
+
+
+def random_edges(V: int, E: int, seed: int, weight_range: tuple[float, float] = (0.5, 20.0), integral: bool = False,
+                 connected: bool = False) -> tuple[list[int], list[int], list[float]]:
+    """Seeded random edge arrays v1s, v2s, weights, parallel edges and self loops included.
+
+    Args:
+        V (int): Number of vertices.
+        E (int): Number of random edges.
+        seed (int): Seed of the edges and weights.
+        weight_range (tuple[float, float], optional): Weights are drawn from [low, high). Defaults to (0.5, 20.0).
+        integral (bool, optional): Whole number weights. Defaults to False.
+        connected (bool, optional): Start with a random path through every vertex, V - 1 more edges. Defaults to
+            False.
+    """
+    rng = random.Random(seed)
+    v1s, v2s = [], []
+    if connected:
+        path = list(range(V))
+        rng.shuffle(path)
+        v1s, v2s = path[:-1], path[1:]
+    v1s += [rng.randrange(V) for _ in range(E)]
+    v2s += [rng.randrange(V) for _ in range(E)]
+    low, high = weight_range
+    weights = [float(rng.randrange(int(low), int(high))) if integral else rng.uniform(low, high) for _ in v1s]
+    return v1s, v2s, weights
+
+
+def random_graph(graph_cls, V: int, E: int, seed: int, **kwargs):
+    """graph_cls with random_edges(V, E, seed, **kwargs), unweighted classes drop the weights."""
+    v1s, v2s, weights = random_edges(V, E, seed, **kwargs)
+    if issubclass(graph_cls, WeightedGraph):
+        return graph_cls.from_edge_arrays(V, v1s, v2s, weights)
+    return graph_cls.from_edge_arrays(V, v1s, v2s)
+
+
+def directed_edges(graph) -> tuple[list[int], list[int], list[float]]:
+    """Directed edges of a weighted graph or view as v1s, v2s, weights, undirected edges once per direction."""
+    v1s, v2s, weights = [], [], []
+    for v in range(graph.num_vertices):
+        for eid in graph.adj_ids(v):
+            v1, v2 = graph.edge_v1[eid], graph.edge_v2[eid]
+            v1s.append(v)
+            v2s.append(v2 if v1 == v else v1)
+            weights.append(graph.edge_weights[eid])
+    return v1s, v2s, weights
+
+
+def reference_bellman_ford(V: int, v1s, v2s, weights, source: int) -> tuple[list[float], bool]:
+    """Textbook Bellman-Ford over a directed edge list, V - 1 passes of every edge and one more to find a negative
+    cycle.
+
+    Returns:
+        tuple[list[float], bool]: Distances, and whether a negative cycle is reachable from the source.
+    """
+    dist = [math.inf] * V
+    dist[source] = 0.0
+    for _ in range(V):
+        changed = False
+        for v1, v2, weight in zip(v1s, v2s, weights):
+            if dist[v1] + weight < dist[v2]:
+                dist[v2] = dist[v1] + weight
+                changed = True
+        if not changed:
+            return dist, False
+    return dist, True
@@ -0,0 +1,78 @@
+import random
+import pytest
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.generators import Grid2D
+from dsa1lib.graph import WeightedDirectedGraph
+from dsa1lib.indexheap import LazyMinPQ
+from dsa1lib.pairingheap import PairingHeap
+from dsa1lib.shortestpath import AStarShortestPath, DijkstraSSSP, euclidean_heuristic, manhattan_heuristic
+
+
+@pytest.fixture(scope="module")
+def grid():
+    generator = Grid2D(15, 20, seed=21)
+    return generator.to_graph(), generator.coordinates()
+
+
+def query_pairs(V: int, seed: int) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(V), rng.randrange(V)) for _ in range(15)]
+
+
+@pytest.mark.parametrize("make_heuristic", [None, manhattan_heuristic, euclidean_heuristic])
+@pytest.mark.parametrize("pq_factory", [None, LazyMinPQ, PairingHeap])
+def test_astar_matches_dijkstra(grid, make_heuristic, pq_factory):
+    graph, coords = grid
+    # every grid edge joins vertices one apart and weighs at least 1, so scale 1 is admissible
+    heuristic = make_heuristic(coords) if make_heuristic is not None else None
+    kwargs = {"pq_factory": pq_factory} if pq_factory is not None else {}
+    for source, target in query_pairs(graph.num_vertices, 1):
+        expected = DijkstraSSSP(graph, source).dist_to[target]
+        astar = AStarShortestPath(graph, source, target, heuristic, **kwargs)
+        assert astar.dist_to[target] == expected
+        path = astar.shortest_path_to(target)
+        assert sum(edge.weight for edge in path) == expected
+        assert astar.settled <= graph.num_vertices
+
+
+def test_manhattan_settles_fewer_than_no_heuristic(grid):
+    graph, coords = grid
+    heuristic = manhattan_heuristic(coords)
+    blind = sum(AStarShortestPath(graph, s, t).settled for s, t in query_pairs(graph.num_vertices, 2))
+    guided = sum(AStarShortestPath(graph, s, t, heuristic).settled for s, t in query_pairs(graph.num_vertices, 2))
+    assert guided <= blind
+
+
+def test_astar_with_admissible_inconsistent_heuristic(grid):
+    graph, _ = grid
+    rng = random.Random(3)
+    target = 137
+    # a random fraction of the true distance never overestimates, but jumps between neighbors
+    to_target = DijkstraSSSP(graph, target).dist_to
+    estimates = [rng.uniform(0.0, dist) for dist in to_target]
+    for source in rng.sample(range(graph.num_vertices), 10):
+        astar = AStarShortestPath(graph, source, target, lambda v, t: estimates[v])
+        assert astar.dist_to[target] == to_target[source]
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_astar_on_dense_graphs(grid, directed):
+    graph, coords = grid
+    if directed:
+        # every grid edge both ways, heavier against the grain
+        v1s, v2s, weights = list(graph.edge_v1), list(graph.edge_v2), list(graph.edge_weights)
+        graph = WeightedDirectedGraph.from_edge_arrays(graph.num_vertices, v1s + v2s, v2s + v1s,
+                                                       weights + [weight + 5 for weight in weights])
+    dense = DenseWeightedGraph.from_graph(graph)
+    heuristic = manhattan_heuristic(coords)
+    for source, target in query_pairs(graph.num_vertices, 4):
+        expected = DijkstraSSSP(graph, source).dist_to[target]
+        astar = AStarShortestPath(dense, source, target, heuristic)  # type: ignore
+        assert astar.dist_to[target] == expected
+        v = target
+        for edge in astar.shortest_path_to(target):
+            if directed:
+                assert edge.edge_to == v
+            v = edge.other_vertex(v)
+        assert v == source
+        assert sum(edge.weight for edge in astar.shortest_path_to(target)) == expected
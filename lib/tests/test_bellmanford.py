@@ -0,0 +1,78 @@
+import math
+import pytest
+from conftest import directed_edges, random_edges, random_graph, reference_bellman_ford
+from dsa1lib.bellmanford import bellman_ford, edge_arrays_of
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.graph import WeightedDirectedGraph, WeightedUndirectedGraph
+from dsa1lib.shortestpath import BellmanFordSSSP
+from dsa1lib.subgraph import SubgraphView
+
+
+def shifted_graph(V: int, E: int, seed: int) -> WeightedDirectedGraph:
+    """Directed graph with negative edges but no negative cycle, positive weights shifted by vertex potentials."""
+    v1s, v2s, weights = random_edges(V, E, seed, weight_range=(1, 20), integral=True)
+    potential = [(v * 37 + seed) % 50 for v in range(V)]
+    weights = [weight + potential[v1] - potential[v2] for v1, v2, weight in zip(v1s, v2s, weights)]
+    return WeightedDirectedGraph.from_edge_arrays(V, v1s, v2s, weights)
+
+
+def check_paths(sssp: BellmanFordSSSP, expected: list[float]):
+    assert sssp.dist_to == pytest.approx(expected)
+    for v, dist in enumerate(expected):
+        if v != sssp.source and dist != math.inf:
+            path = sssp.shortest_path_to(v)
+            assert sum(edge.weight for edge in path) == pytest.approx(dist)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_negative_edges_without_negative_cycle(seed):
+    graph = shifted_graph(50, 200, seed)
+    expected, has_cycle = reference_bellman_ford(50, *directed_edges(graph), 0)
+    assert not has_cycle
+    sssp = BellmanFordSSSP(graph, 0)
+    assert not sssp.is_neg_cycle_reachable
+    check_paths(sssp, expected)
+
+
+def test_undirected_edges_go_both_ways():
+    graph = random_graph(WeightedUndirectedGraph, 40, 80, 7)
+    v1s, v2s, _, _ = edge_arrays_of(graph)
+    assert len(v1s) == len(v2s) == 2 * graph.num_edges
+    expected, _ = reference_bellman_ford(40, *directed_edges(graph), 3)
+    check_paths(BellmanFordSSSP(graph, 3), expected)
+
+
+def test_reachable_negative_cycle():
+    graph = WeightedDirectedGraph.from_edge_arrays(4, [0, 1, 2, 2], [1, 2, 1, 3], [1.0, -3.0, 1.0, 2.0])
+    sssp = BellmanFordSSSP(graph, 0)
+    assert sssp.is_neg_cycle_reachable
+    assert sssp.shortest_path_to(3) is None
+
+
+def test_unreachable_negative_cycle_is_not_reported():
+    graph = WeightedDirectedGraph.from_edge_arrays(5, [0, 1, 3, 4], [1, 2, 4, 3], [2.0, -1.0, -1.0, -1.0])
+    sssp = BellmanFordSSSP(graph, 0)
+    assert not sssp.is_neg_cycle_reachable
+    assert sssp.dist_to == [0.0, 2.0, 1.0, math.inf, math.inf]
+    assert [edge.eid for edge in sssp.shortest_path_to(2)] == [1, 0]
+
+
+def test_view_only_uses_its_edges():
+    graph = shifted_graph(40, 160, 11)
+    view = SubgraphView.without_vertices(graph, [5, 17, 23])
+    expected, _ = reference_bellman_ford(40, *directed_edges(view), 0)
+    sssp = BellmanFordSSSP(view, 0)  # type: ignore
+    check_paths(sssp, expected)
+    assert all(math.isinf(sssp.dist_to[v]) for v in (5, 17, 23))
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_dense_matches_sparse(directed):
+    graph_cls = WeightedDirectedGraph if directed else WeightedUndirectedGraph
+    graph = random_graph(graph_cls, 30, 90, 5, weight_range=(1, 20), integral=True)
+    dense = DenseWeightedGraph.from_graph(graph)
+    expected, _ = reference_bellman_ford(30, *directed_edges(graph), 0)
+    dist, edge_id_to, has_cycle = bellman_ford(30, *edge_arrays_of(dense), 0)
+    assert not has_cycle
+    assert dist.tolist() == expected
+    assert edge_id_to[0] == -1
@@ -0,0 +1,59 @@
+import gc
+import weakref
+from dsa1lib import bucketqueue
+from dsa1lib.bucketqueue import DIAL_MAX_STEP, DialQueue, dial_max_step, integer_pq_of
+from dsa1lib.graph import WeightedDirectedGraph
+from dsa1lib.shortestpath import DijkstraSSSP
+from dsa1lib.subgraph import SubgraphView
+
+
+def count_scans(monkeypatch) -> list:
+    """Records the weights every dial_max_step() call of integer_pq_of() scans."""
+    scans = []
+
+    def counted(weights):
+        scans.append(weights)
+        return dial_max_step(weights)
+    monkeypatch.setattr(bucketqueue, "dial_max_step", counted)
+    return scans
+
+
+def test_dial_max_step():
+    assert dial_max_step([1.0, 7.0, 0.0]) == 7
+    assert dial_max_step([]) is None
+    assert dial_max_step([1.0, 2.5]) is None
+    assert dial_max_step([-1.0, 2.0]) is None
+    assert dial_max_step([float(DIAL_MAX_STEP + 1)]) is None
+
+
+def test_weight_check_is_cached_until_the_graph_changes(monkeypatch):
+    scans = count_scans(monkeypatch)
+    graph = WeightedDirectedGraph.from_edge_arrays(4, [0, 1, 2], [1, 2, 3], [3.0, 4.0, 5.0])
+    assert isinstance(integer_pq_of(graph), DialQueue)
+    assert isinstance(integer_pq_of(graph), DialQueue)
+    assert len(scans) == 1
+
+    graph.add_edge(3, 0, 0.5)
+    assert integer_pq_of(graph) is None
+    assert len(scans) == 2
+    assert DijkstraSSSP(graph, 1).dist_to == [9.5, 0.0, 4.0, 9.0]
+    assert len(scans) == 2
+
+
+def test_frozen_graphs_and_views_cache_the_weight_check(monkeypatch):
+    scans = count_scans(monkeypatch)
+    graph = WeightedDirectedGraph.from_edge_arrays(3, [0, 1], [1, 2], [2.0, 9.0])
+    for searched in (graph.freeze(), SubgraphView(graph)):
+        assert integer_pq_of(searched).max_len == 3
+        assert isinstance(integer_pq_of(searched), DialQueue)
+    assert len(scans) == 2
+    assert DijkstraSSSP(graph.freeze(), 0).dist_to == [0.0, 2.0, 11.0]
+
+
+def test_cache_does_not_keep_graphs_alive():
+    graph = WeightedDirectedGraph.from_edge_arrays(2, [0], [1], [1.0])
+    integer_pq_of(graph)
+    alive = weakref.ref(graph)
+    del graph
+    gc.collect()
+    assert alive() is None
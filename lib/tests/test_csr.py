@@ -0,0 +1,60 @@
+from conftest import random_graph
+from dsa1lib.csr import CSRGraph
+from dsa1lib.graph import DirectedGraph, WeightedDirectedGraph, WeightedUndirectedGraph
+
+
+def test_freeze_keeps_adjacency():
+    graph = random_graph(WeightedDirectedGraph, 50, 300, 1)
+    frozen = graph.freeze()
+    for v in range(graph.num_vertices):
+        assert list(frozen.adj_ids(v)) == graph.adj_ids(v)
+        targets, weights = frozen.neighbors(v)
+        assert list(targets) == [graph.edge_v2[eid] for eid in graph.adj_ids(v)]
+        assert list(weights) == [graph.edge_weights[eid] for eid in graph.adj_ids(v)]
+
+
+def test_reverse_of_unweighted_graph():
+    graph = DirectedGraph.from_edge_arrays(4, [0, 0, 1, 3], [1, 2, 2, 0])
+    reverse = graph.freeze().reverse()
+    assert [sorted(reverse.adj(v)) for v in range(4)] == [[3], [0], [0, 1], []]
+
+
+def test_weighted_reverse_keeps_edge_ids():
+    graph = random_graph(WeightedDirectedGraph, 60, 400, 2)
+    reverse = graph.freeze().reverse()
+    expected = graph.reverse()
+    for v in range(graph.num_vertices):
+        assert sorted(reverse.adj_ids(v)) == sorted(expected.adj_ids(v))
+        targets, weights = reverse.neighbors(v)
+        for eid, target, weight in zip(reverse.adj_ids(v), targets, weights):
+            assert (graph.edge_v2[eid], graph.edge_v1[eid], graph.edge_weights[eid]) == (v, target, weight)
+            assert (reverse.edge_v1[eid], reverse.edge_v2[eid]) == (v, target)
+
+
+def test_weighted_reverse_of_undirected_graph_is_itself():
+    graph = WeightedUndirectedGraph.from_edge_arrays(3, [0, 1], [1, 2], [1.0, 2.0]).freeze()
+    assert graph.reverse() is graph
+
+
+def test_save_and_load_round_trip(tmp_path):
+    graph = random_graph(WeightedDirectedGraph, 40, 200, 3)
+    path = str(tmp_path / "graph.csr")
+    graph.save(path)
+    for mmap in (True, False):
+        loaded = CSRGraph.load(path, mmap=mmap)
+        assert loaded.num_vertices == 40 and loaded.num_edges == 200
+        assert list(loaded.edge_weights) == list(graph.edge_weights)
+        for v in range(40):
+            assert list(loaded.adj_ids(v)) == graph.adj_ids(v)
+        assert sorted(loaded.reverse().adj_ids(7)) == sorted(graph.reverse().adj_ids(7))
+
+
+def test_public_slot_arrays():
+    graph = random_graph(WeightedDirectedGraph, 30, 120, 5)
+    frozen = graph.freeze()
+    for v in range(graph.num_vertices):
+        lo, hi = frozen.offsets[v], frozen.offsets[v + 1]
+        targets, weights = frozen.neighbors(v)
+        assert list(frozen.targets[lo:hi]) == list(targets)
+        assert list(frozen.slot_weights[lo:hi]) == list(weights)
+        assert list(frozen.slot_edges[lo:hi]) == list(frozen.adj_ids(v))
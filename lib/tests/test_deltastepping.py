@@ -0,0 +1,59 @@
+import math
+import numpy as np
+import pytest
+from conftest import random_graph
+from dsa1lib.deltastepping import DeltaSteppingSSSP, delta_stepping
+from dsa1lib.generators import ErdosRenyi, Grid2D
+from dsa1lib.graph import WeightedDirectedGraph, WeightedUndirectedGraph
+from dsa1lib.shortestpath import DijkstraSSSP
+
+
+@pytest.mark.parametrize("delta", [None, 0.5, 3.0, 40.0, math.inf])
+@pytest.mark.parametrize("generator", [ErdosRenyi(300, 2000, seed=23, weight_range=(1, 50)),
+                                       Grid2D(12, 15, seed=24, weight_range=(0, 9))])
+def test_distances_match_dijkstra(generator, delta):
+    frozen = generator.to_csr()
+    for source in (0, 7, frozen.num_vertices - 1):
+        dist, edge_id_to = delta_stepping(frozen, source, delta)
+        expected = DijkstraSSSP(frozen, source).dist_to
+        assert dist.tolist() == expected
+
+        # every tree edge leads into its vertex and accounts for its distance
+        for v in np.flatnonzero(edge_id_to >= 0).tolist():
+            edge = frozen.edge(int(edge_id_to[v]))
+            u = edge.other_vertex(v)
+            assert dist[u] + edge.weight == dist[v]
+        assert edge_id_to[source] == -1
+
+
+def test_fractional_weights():
+    graph = random_graph(WeightedDirectedGraph, 200, 1500, 5, weight_range=(0.0, 1.0))
+    dist, _ = delta_stepping(graph.freeze(), 3, 0.1)
+    assert dist.tolist() == pytest.approx(DijkstraSSSP(graph, 3).dist_to)
+
+
+def test_edgeless_graph():
+    dist, edge_id_to = delta_stepping(WeightedUndirectedGraph(4).freeze(), 2)
+    assert dist.tolist() == [math.inf, math.inf, 0.0, math.inf]
+    assert edge_id_to.tolist() == [-1, -1, -1, -1]
+
+
+def test_algo_surface_and_errors():
+    graph = ErdosRenyi(100, 400, seed=25).to_graph()
+    algo = DeltaSteppingSSSP(graph, 0, delta=20.0)
+    assert algo.dist_to == DijkstraSSSP(graph, 0).dist_to
+    assert sum(edge.weight for edge in algo.shortest_path_to(99)) == algo.dist_to[99]
+
+    with pytest.raises(ValueError):
+        delta_stepping(graph.freeze(), 100)
+    negative = WeightedDirectedGraph.from_edge_arrays(2, [0], [1], [-1.0])
+    with pytest.raises(ValueError):
+        delta_stepping(negative.freeze(), 0)
+
+
+def test_threads_give_the_same_distances():
+    # with delta = inf the frontiers grow past the size split across threads
+    frozen = ErdosRenyi(20000, 160000, seed=26).to_csr()
+    dist, _ = delta_stepping(frozen, 0, math.inf, workers=2)
+    assert dist.tolist() == delta_stepping(frozen, 0, math.inf)[0].tolist()
+    assert dist.tolist() == delta_stepping(frozen, 0)[0].tolist()
@@ -0,0 +1,47 @@
+import pytest
+from dsa1lib.generators import RMAT, Bipartite, ErdosRenyi, Grid2D, LayeredFlowNetwork, RandomDAG
+from dsa1lib.topological import PostOrder
+
+
+def test_random_dag_needs_two_vertices_for_edges():
+    with pytest.raises(ValueError):
+        RandomDAG(1, 1)
+    with pytest.raises(ValueError):
+        RandomDAG(0, 3)
+    assert RandomDAG(1, 0).to_graph().num_edges == 0
+
+
+def test_random_dag_is_acyclic():
+    graph = RandomDAG(2, 50, seed=3).to_graph(weighted=False)
+    assert graph.num_edges == 50
+    assert not PostOrder(graph).has_cycle
+    assert not PostOrder(RandomDAG(200, 2000, seed=4).to_graph(weighted=False)).has_cycle
+
+
+@pytest.mark.parametrize("layers, width", [(0, 3), (2, 0), (-1, 2)])
+def test_layered_flow_network_rejects_empty_layers(layers, width):
+    with pytest.raises(ValueError):
+        LayeredFlowNetwork(layers, width, 2)
+
+
+def test_layered_flow_network_with_one_layer():
+    network = LayeredFlowNetwork(1, 3, 2, seed=5)
+    graph = network.to_graph()
+    assert graph.num_vertices == 5
+    assert sorted(zip(graph.edge_v1, graph.edge_v2)) == [(0, 1), (0, 2), (0, 3), (1, 4), (2, 4), (3, 4)]
+
+
+@pytest.mark.parametrize("generator", [ErdosRenyi(50, 300, seed=1), Grid2D(6, 7, seed=2), RMAT(6, 200, seed=3),
+                                       Bipartite(10, 15, 80, seed=4), RandomDAG(40, 120, seed=5),
+                                       LayeredFlowNetwork(3, 4, 2, seed=6)])
+def test_generators_are_seeded_and_csr_matches_graph(generator):
+    graph = generator.to_graph()
+    again = generator.to_graph()
+    assert list(graph.edge_v1) == list(again.edge_v1) and list(graph.edge_weights) == list(again.edge_weights)
+
+    low, high = generator.weight_range
+    assert all(low <= weight <= high for weight in graph.edge_weights)
+    frozen = generator.to_csr()
+    assert frozen.num_edges == graph.num_edges
+    for v in range(graph.num_vertices):
+        assert sorted(frozen.adj_ids(v)) == sorted(graph.adj_ids(v))
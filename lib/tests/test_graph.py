@@ -0,0 +1,177 @@
+import pytest
+from conftest import random_edges
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.graph import (DirectedGraph, UndirectedGraph, WeightedDirectedGraph, WeightedGraph,
+                           WeightedUndirectedGraph)
+from dsa1lib.maxflow import FlowNetwork
+
+
+@pytest.mark.parametrize("graph_cls", [WeightedDirectedGraph, WeightedUndirectedGraph])
+@pytest.mark.parametrize("v1, v2", [(3, 0), (0, 3), (-1, 0), (0, 4)])
+def test_add_edge_out_of_range_leaves_graph_unchanged(graph_cls, v1, v2):
+    graph = graph_cls(3)
+    graph.add_edge(0, 1, 1.0)
+    version = graph.version
+    with pytest.raises(ValueError):
+        graph.add_edge(v1, v2, 1.0)
+    assert graph.num_edges == 1
+    assert len(graph.edge_v1) == len(graph.edge_v2) == len(graph.edge_weights) == 1
+    assert graph.version == version
+
+
+def test_adj_rejects_vertex_past_the_end():
+    graph = WeightedDirectedGraph(3)
+    with pytest.raises(ValueError):
+        graph.adj(3)
+    with pytest.raises(ValueError):
+        graph.adj_ids(3)
+
+
+def test_adj_views_match_edge_arrays():
+    graph = WeightedUndirectedGraph.from_edge_arrays(4, [0, 1, 2, 0], [1, 2, 3, 3], [1.0, 2.0, 3.0, 4.0])
+    for v in range(graph.num_vertices):
+        edges = graph.adj(v)
+        assert [edge.eid for edge in edges] == graph.adj_ids(v)
+        assert [edge.weight for edge in edges] == [graph.edge_weights[eid] for eid in graph.adj_ids(v)]
+
+
+def test_flow_network_copies_edges_by_id():
+    graph = WeightedDirectedGraph.from_edge_arrays(4, [0, 0, 1, 2], [1, 2, 3, 3], [3, 2, 2, 3])
+    network = FlowNetwork(graph, 0, 3)
+    assert list(network.edge_v1) == [0, 0, 1, 2]
+    assert list(network.edge_v2) == [1, 2, 3, 3]
+    assert list(network.edge_weights) == [3, 2, 2, 3]
+    dense_network = FlowNetwork(DenseWeightedGraph.from_graph(graph), 0, 3)
+    assert sorted(zip(dense_network.edge_v1, dense_network.edge_v2, dense_network.edge_weights)) == \
+        sorted(zip(network.edge_v1, network.edge_v2, network.edge_weights))
+
+
+@pytest.mark.parametrize("graph_cls", [DirectedGraph, UndirectedGraph, WeightedDirectedGraph, WeightedUndirectedGraph])
+@pytest.mark.parametrize("E", [3, 400])
+def test_add_edges_matches_add_edge(graph_cls, E):
+    # 3 edges take the append path, 400 the path that counts degrees first
+    weighted = issubclass(graph_cls, WeightedGraph)
+    one_by_one, batched = graph_cls(40), graph_cls(40)
+    for edge_arrays in (random_edges(40, 10, 1), random_edges(40, E, 2)):
+        edge_arrays = edge_arrays if weighted else edge_arrays[:2]
+        for edge in zip(*edge_arrays):
+            one_by_one.add_edge(*edge)
+        batched.add_edges(*edge_arrays)
+
+    assert batched.num_edges == one_by_one.num_edges
+    adj = (lambda graph, v: graph.adj_ids(v)) if weighted else (lambda graph, v: graph.adj(v))
+    for v in range(40):
+        assert adj(batched, v) == adj(one_by_one, v)
+
+
+@pytest.mark.parametrize("graph_cls", [DirectedGraph, UndirectedGraph])
+def test_single_and_batch_bounds_agree(graph_cls):
+    graph = graph_cls(3)
+    with pytest.raises(ValueError):
+        graph.add_edge(0, 3)
+    with pytest.raises(ValueError):
+        graph.add_edges([0], [3])
+    assert graph.num_edges == 0
+    assert all(graph.adj(v) == [] for v in range(3))
+
+
+def test_add_edges_out_of_range_leaves_graph_unchanged():
+    graph = WeightedDirectedGraph(3)
+    with pytest.raises(ValueError):
+        graph.add_edges([0, 1], [1, 3], [1.0, 1.0])
+    assert graph.num_edges == 0
+    assert len(graph.edge_v1) == 0
+
+
+@pytest.mark.parametrize("policy, merged", [("min", [1.0, 2.0]), ("max", [4.0, 5.0]), ("sum", [8.0, 7.0])])
+def test_coalesce_policies(policy, merged):
+    graph = WeightedDirectedGraph.from_edge_arrays(3, [0, 1, 0, 0, 1], [1, 2, 1, 1, 2], [3.0, 5.0, 1.0, 4.0, 2.0])
+    assert graph.coalesce(policy) == 3
+    assert (list(graph.edge_v1), list(graph.edge_v2), list(graph.edge_weights)) == ([0, 1], [1, 2], merged)
+    assert graph.adj_ids(0) == [0] and graph.adj_ids(1) == [1]
+
+
+def test_coalesce_keys_undirected_edges_by_their_endpoints():
+    graph = WeightedUndirectedGraph.from_edge_arrays(3, [0, 1, 1, 2], [1, 0, 2, 1], [3.0, 2.0, 4.0, 6.0])
+    assert graph.coalesce("sum") == 2
+    assert list(graph.edge_weights) == [5.0, 10.0]
+    assert graph.adj_ids(1) == [0, 1]
+    directed = WeightedDirectedGraph.from_edge_arrays(2, [0, 1], [1, 0], [3.0, 2.0])
+    assert directed.coalesce() == 0
+
+
+def test_coalesce_self_loops():
+    v1s, v2s, weights = [0, 1, 1, 1], [1, 1, 1, 2], [1.0, 2.0, 3.0, 4.0]
+    dropped = WeightedDirectedGraph.from_edge_arrays(3, v1s, v2s, weights)
+    assert dropped.coalesce() == 2
+    assert list(zip(dropped.edge_v1, dropped.edge_v2)) == [(0, 1), (1, 2)]
+    kept = WeightedDirectedGraph.from_edge_arrays(3, v1s, v2s, weights)
+    assert kept.coalesce("max", keep_self_loops=True) == 1
+    assert list(zip(kept.edge_v1, kept.edge_v2, kept.edge_weights)) == [(0, 1, 1.0), (1, 1, 3.0), (1, 2, 4.0)]
+
+
+def test_coalesce_bumps_the_version_only_when_edges_go():
+    graph = WeightedDirectedGraph.from_edge_arrays(3, [0, 1], [1, 2], [1.0, 1.0])
+    version = graph.version
+    assert graph.coalesce() == 0
+    assert graph.version == version
+    graph.add_edge(0, 1, 0.5)
+    version = graph.version
+    reverse = graph.reverse()
+    assert graph.coalesce() == 1
+    assert graph.version > version
+    assert graph.reverse() is not reverse and graph.reverse().adj_ids(1) == [0]
+
+
+def test_coalesce_rejects_unknown_policies():
+    graph = WeightedDirectedGraph.from_edge_arrays(2, [0, 0], [1, 1], [1.0, 2.0])
+    with pytest.raises(ValueError):
+        graph.coalesce("mean")
+    assert graph.num_edges == 2
+
+
+def derived_structures(graph) -> dict:
+    """Every cached structure of the graph, in a form that compares by value."""
+    structures = {"out_degrees": list(graph.out_degrees()), "in_degrees": list(graph.in_degrees())}
+    if isinstance(graph, WeightedGraph):
+        structures["edges"] = [(edge.eid, edge.any_vertex(), edge.other_vertex(edge.any_vertex()), edge.weight)
+                               for edge in graph.get_all_edges()]
+    if isinstance(graph, DirectedGraph):
+        # unweighted edges have no ids, so their order is not fixed
+        structures["edge_arrays"] = sorted(zip(*graph.edge_arrays()))
+        structures["reverse"] = [sorted(graph.reverse().adj(v)) for v in range(graph.num_vertices)]
+    elif graph.directed:
+        structures["reverse"] = [list(graph.reverse().adj_ids(v)) for v in range(graph.num_vertices)]
+    return structures
+
+
+def cached_objects(graph) -> list:
+    """The cached structures the graph hands out itself rather than as copies."""
+    cached = [graph.out_degrees(), graph.in_degrees()]
+    cached += [graph.reverse()] if graph.directed else []
+    cached += [graph.edge_arrays()] if isinstance(graph, DirectedGraph) else []
+    return cached
+
+
+@pytest.mark.parametrize("graph_cls", [DirectedGraph, UndirectedGraph, WeightedDirectedGraph, WeightedUndirectedGraph])
+def test_patched_derived_structures_match_a_rebuild(graph_cls):
+    weighted = issubclass(graph_cls, WeightedGraph)
+    batches = [random_edges(30, 20, seed) for seed in (1, 2, 3)]
+    batches = batches if weighted else [batch[:2] for batch in batches]
+    graph = graph_cls.from_edge_arrays(30, *batches[0])
+    derived_structures(graph)
+    cached = cached_objects(graph)
+
+    version = graph.version
+    for edge in zip(*batches[1]):
+        graph.add_edge(*edge)
+        assert graph.version == version + 1
+        version = graph.version
+    # a batch of 20 over 30 vertices takes the degree counting path of add_edges
+    graph.add_edges(*batches[2])
+    assert graph.version == version + 1
+
+    # patched in place rather than dropped and rebuilt
+    assert all(before is after for before, after in zip(cached, cached_objects(graph)))
+    rebuilt = graph_cls.from_edge_arrays(30, *[sum(map(list, arrays), []) for arrays in zip(*batches)])
+    assert derived_structures(graph) == derived_structures(rebuilt)
@@ -0,0 +1,85 @@
+import random
+import pytest
+from dsa1lib.binomialheap import CountingMaxBinomialHeap, MaxBinomialHeap
+from dsa1lib.generators import ErdosRenyi
+from dsa1lib.heapstats import active_stats, count_heap_ops
+from dsa1lib.indexheap import CountingIndexedMinPQ, IndexedMinPQ
+from dsa1lib.shortestpath import DijkstraSSSP
+
+
+class CountedKey:
+    """Key that counts how often it is ordered."""
+    comparisons = 0
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def __lt__(self, other: "CountedKey") -> bool:
+        CountedKey.comparisons += 1
+        return self.value < other.value
+
+
+def test_heaps_count_only_inside_the_block():
+    assert type(IndexedMinPQ(3)) is IndexedMinPQ
+    assert type(MaxBinomialHeap()) is MaxBinomialHeap
+    with count_heap_ops() as stats:
+        assert active_stats() is stats
+        assert type(IndexedMinPQ(3)) is CountingIndexedMinPQ
+        assert type(MaxBinomialHeap()) is CountingMaxBinomialHeap
+    assert active_stats() is None
+    assert type(IndexedMinPQ(3)) is IndexedMinPQ
+
+
+def test_counted_dijkstra_matches_plain_dijkstra():
+    # weights too large for a DialQueue, so Dijkstra makes an IndexedMinPQ
+    graph = ErdosRenyi(300, 2000, seed=1, weight_range=(1, 10 ** 6)).to_graph()
+    with count_heap_ops() as stats:
+        dist_to = DijkstraSSSP(graph, 0).dist_to
+    assert dist_to == DijkstraSSSP(graph, 0).dist_to
+
+    counts = stats.as_dict()
+    reached = sum(dist != float("inf") for dist in dist_to)
+    assert counts["inserts"] == reached
+    assert counts["del_mins"] == reached
+    assert counts["seconds"] > 0
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4])
+def test_comparisons_are_the_ordering_comparisons(arity):
+    rng = random.Random(arity)
+    pq = CountingIndexedMinPQ(200, arity)
+    CountedKey.comparisons = 0
+    # change_key and decrease_key compare the new key with the old one before moving it, which is not counted
+    argument_checks = 0
+    for index in range(200):
+        pq.insert(index, CountedKey(rng.random()))
+    for index in range(0, 200, 3):
+        pq.change_key(index, CountedKey(rng.random()))
+        argument_checks += 1
+    for _ in range(100):
+        pq.del_min()
+    for index in range(200):
+        if pq.contains(index):
+            pq.decrease_key(index, CountedKey(pq.key_of_index(index).value - 0.1))
+            argument_checks += 1
+    while len(pq):
+        pq.del_min()
+
+    assert pq.stats.counts["comparisons"] == CountedKey.comparisons - argument_checks
+    assert pq.stats.counts["inserts"] == 200
+    assert pq.stats.counts["del_mins"] == 200
+
+
+def test_counting_binomial_heap_keeps_max_order():
+    with count_heap_ops() as stats:
+        heap = MaxBinomialHeap[int]()
+        for key in [5, 1, 9, 3, 7, 2]:
+            heap.insert(key)
+        heap.increase_key(1, 10)
+        extracted = [heap.extract_max() for _ in range(6)]
+    assert extracted == [10, 9, 7, 5, 3, 2]
+    counts = stats.as_dict()
+    assert counts["inserts"] == 6
+    assert counts["increase_keys"] == 1
+    assert counts["extract_maxes"] == 6
+    assert counts["links"] > 0
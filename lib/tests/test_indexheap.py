@@ -0,0 +1,177 @@
+import functools
+import random
+from collections import Counter
+import pytest
+from dsa1lib.bucketqueue import DialQueue, RadixHeap
+from dsa1lib.fibonacciheap import FibonacciHeap
+from dsa1lib.indexheap import IndexedMinPQ, LazyMinPQ
+from dsa1lib.pairingheap import PairingHeap
+
+N = 60
+
+COMPARISON_HEAPS = {
+    "binary": functools.partial(IndexedMinPQ, arity=2),
+    "4-ary": IndexedMinPQ,
+    "8-ary float keys": functools.partial(IndexedMinPQ, arity=8, float_keys=True),
+    "lazy": LazyMinPQ,
+    "pairing": PairingHeap,
+    "fibonacci": FibonacciHeap,
+}
+
+MAX_STEP = 20
+MONOTONE_HEAPS = {
+    "dial": functools.partial(DialQueue, max_step=MAX_STEP),
+    "radix": RadixHeap,
+}
+
+
+def check_against_dict(pq, rng: random.Random, new_key, lower_key, steps: int = 3000,
+                       reference: dict[int, float] | None = None) -> Counter:
+    """Random mix of every IndexedPQ operation, each result compared with a dict of index -> key. new_key(floor)
+    and lower_key(key, floor) get the last deleted key as floor. reference holds what pq starts with. Queues with
+    change_key get keys moved both ways too, so only heaps that allow any key should have it.
+
+    Returns:
+        Counter: How often each outcome of insert_or_decrease and change_key came up.
+    """
+    reference = dict(reference or {})
+    outcomes: Counter = Counter()
+    floor = 0
+    for _ in range(steps):
+        op = rng.random()
+        index = rng.randrange(N)
+        if op < 0.3:
+            if index not in reference:
+                key = new_key(floor)
+                pq.insert(index, key)
+                reference[index] = key
+        elif op < 0.45:
+            if index in reference:
+                key = lower_key(reference[index], floor)
+                pq.decrease_key(index, key)
+                reference[index] = key
+        elif op < 0.65:
+            if index in reference and rng.random() < 0.7:
+                key = lower_key(reference[index], floor)
+            else:
+                key = new_key(floor)
+            changed = pq.insert_or_decrease(index, key)
+            assert changed == (index not in reference or key < reference[index])
+            outcomes["inserted" if index not in reference else "decreased" if changed else "unchanged"] += 1
+            if changed:
+                reference[index] = key
+        elif op < 0.75 and hasattr(pq, "change_key"):
+            if index in reference:
+                key = new_key(floor)
+                pq.change_key(index, key)
+                outcomes["raised" if key > reference[index] else "lowered" if key < reference[index] else "same"] += 1
+                reference[index] = key
+            else:
+                with pytest.raises(KeyError):
+                    pq.change_key(index, new_key(floor))
+        elif reference:
+            index, key = pq.del_min()
+            assert key == min(reference.values())
+            assert reference.pop(index) == key
+            floor = key
+
+        assert len(pq) == len(reference)
+        probe = rng.randrange(N)
+        assert pq.contains(probe) == (probe in reference)
+        if probe in reference:
+            assert pq.key_of_index(probe) == reference[probe]
+
+    drained = [pq.del_min()[1] for _ in range(len(pq))]
+    assert drained == sorted(reference.values())
+    assert len(pq) == 0
+    return outcomes
+
+
+@pytest.mark.parametrize("name", COMPARISON_HEAPS)
+@pytest.mark.parametrize("seed", range(3))
+def test_comparison_heaps_match_dict(name, seed):
+    rng = random.Random(seed)
+    # few distinct keys, so ties are common
+    outcomes = check_against_dict(COMPARISON_HEAPS[name](N), rng, lambda floor: float(rng.randrange(100)),
+                                  lambda key, floor: key - rng.randrange(3))
+    assert outcomes["inserted"] and outcomes["decreased"] and outcomes["unchanged"]
+    if hasattr(COMPARISON_HEAPS[name](N), "change_key"):
+        assert outcomes["raised"] and outcomes["lowered"]
+
+
+# from_items and clear() are IndexedMinPQ only
+INDEXED_MIN_PQS = {
+    "binary": {"arity": 2},
+    "4-ary": {},
+    "8-ary float keys": {"arity": 8, "float_keys": True},
+}
+
+
+@pytest.mark.parametrize("name", INDEXED_MIN_PQS)
+@pytest.mark.parametrize("start", ["heapified", "cleared"])
+@pytest.mark.parametrize("seed", range(3))
+def test_indexed_min_pq_from_items_and_clear_match_dict(name, start, seed):
+    rng = random.Random(seed)
+    indices = rng.sample(range(N), N // 2)
+    keys = [float(rng.randrange(100)) for _ in indices]
+    pq = IndexedMinPQ.from_items(indices, keys, N, **INDEXED_MIN_PQS[name])
+    reference = dict(zip(indices, keys))
+    if start == "cleared":
+        for _ in range(5):
+            pq.del_min()
+        pq.clear()
+        assert len(pq) == 0
+        assert not any(pq.contains(index) or pq.key_of_index(index) is not None for index in range(N))
+        reference = {}
+    check_against_dict(pq, rng, lambda floor: float(rng.randrange(100)), lambda key, floor: key - rng.randrange(3),
+                       reference=reference)
+
+
+def test_from_items_rejects_bad_items():
+    with pytest.raises(KeyError):
+        IndexedMinPQ.from_items([0, 3, 0], [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        IndexedMinPQ.from_items([0, 1], [1.0])
+    with pytest.raises(IndexError):
+        IndexedMinPQ.from_items([0, 1, 2], [1.0, 2.0, 3.0], max_len=2)
+    for out_of_range in ([0, 4], [-1, 2]):
+        with pytest.raises(IndexError):
+            IndexedMinPQ.from_items(out_of_range, [1.0, 2.0], max_len=4)
+
+
+@pytest.mark.parametrize("name", MONOTONE_HEAPS)
+@pytest.mark.parametrize("seed", range(3))
+def test_monotone_heaps_match_dict(name, seed):
+    rng = random.Random(seed)
+    # keys never go below the last deleted key, and stay within MAX_STEP of it as Dijkstra's would
+    check_against_dict(MONOTONE_HEAPS[name](N), rng, lambda floor: floor + rng.randrange(MAX_STEP + 1),
+                       lambda key, floor: max(floor, key - rng.randrange(3)))
+
+
+@pytest.mark.parametrize("name", MONOTONE_HEAPS)
+def test_monotone_heaps_reject_keys_below_the_last_deleted(name):
+    pq = MONOTONE_HEAPS[name](4)
+    pq.insert(0, 5)
+    pq.insert(1, 7)
+    assert pq.del_min() == (0, 5)
+    with pytest.raises(ValueError):
+        pq.insert(2, 4)
+
+
+def test_dial_queue_rejects_fractional_and_far_keys():
+    pq = DialQueue(4, 10)
+    with pytest.raises(ValueError):
+        pq.insert(0, 1.5)
+    pq.insert(0, 3)
+    with pytest.raises(ValueError):
+        pq.insert(1, 3 + 11)
+
+
+@pytest.mark.parametrize("name", list(COMPARISON_HEAPS) + list(MONOTONE_HEAPS))
+def test_decrease_key_of_absent_index(name):
+    pq = {**COMPARISON_HEAPS, **MONOTONE_HEAPS}[name](4)
+    pq.insert(0, 3)
+    with pytest.raises(KeyError):
+        pq.decrease_key(2, 1)
+    assert len(pq) == 1 and not pq.contains(2)
+    assert pq.del_min() == (0, 3)
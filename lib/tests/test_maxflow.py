@@ -0,0 +1,37 @@
+import pytest
+from dsa1lib.graph import WeightedDirectedGraph
+from dsa1lib.maxflow import EdmondsKarp, FlowNetwork
+
+
+def parallel_network_graph() -> WeightedDirectedGraph:
+    # 0 -> 1 twice, 1 -> 3 and 0 -> 2 -> 3, and a self loop at 2
+    return WeightedDirectedGraph.from_edge_arrays(4, [0, 0, 1, 0, 2, 2], [1, 1, 3, 2, 3, 2], [2, 3, 4, 1, 5, 7])
+
+
+def test_coalesce_sums_capacities_and_resets_flow():
+    network = FlowNetwork(parallel_network_graph(), 0, 3)
+    assert network.coalesce() == 2
+    # the network copies edges vertex by vertex, so 0 -> 2 comes before 1 -> 3
+    assert [network.edge(eid).capacity for eid in range(network.num_edges)] == [5, 1, 4, 5]
+    assert [network.flow_of(eid) for eid in range(network.num_edges)] == [0, 0, 0, 0]
+    assert network.incoming_edge_ids(3) == [2, 3]
+    assert EdmondsKarp(network, 0, 3).maxflow == EdmondsKarp(parallel_network_graph(), 0, 3).maxflow == 5
+
+
+def test_coalesce_refuses_a_network_with_flow():
+    network = FlowNetwork(parallel_network_graph(), 0, 3)
+    network.push_flow(0, 1, 0)
+    with pytest.raises(ValueError):
+        network.coalesce()
+    assert network.num_edges == 6
+
+
+def test_edges_added_after_construction_carry_capacity():
+    network = FlowNetwork(parallel_network_graph(), 0, 3)
+    network.add_edge(0, 3, 6)
+    network.add_edges([1, 2], [2, 1], [2, 3])
+    assert [network.edge(eid).capacity for eid in range(6, 9)] == [6, 2, 3]
+    assert [network.flow_of(eid) for eid in range(network.num_edges)] == [0] * 9
+    assert network.incoming_edge_ids(3)[-1] == 6
+    # 1 -> 2 lets the spare unit on 0 -> 1 reach 2 -> 3, and 0 -> 3 adds 6
+    assert EdmondsKarp(network, 0, 3).maxflow == 6 + 6
@@ -0,0 +1,27 @@
+import pytest
+from conftest import random_graph
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.graph import WeightedUndirectedGraph
+from dsa1lib.indexheap import LazyMinPQ
+from dsa1lib.mst import KruskalMST, PrimMST
+from dsa1lib.pairingheap import PairingHeap
+
+
+def random_connected_graph(V: int, E: int, seed: int) -> WeightedUndirectedGraph:
+    return random_graph(WeightedUndirectedGraph, V, E, seed, weight_range=(1, 50), integral=True, connected=True)
+
+
+@pytest.mark.parametrize("pq_factory", [None, LazyMinPQ, PairingHeap])
+def test_prim_matches_kruskal_and_prints_nothing(pq_factory, capsys):
+    graph = random_connected_graph(80, 300, 1)
+    prim = PrimMST(graph) if pq_factory is None else PrimMST(graph, pq_factory)
+    kruskal = KruskalMST(graph)
+    assert len(prim.mst) == len(kruskal.mst) == graph.num_vertices - 1
+    assert prim.mst_weight == kruskal.mst_weight
+    assert capsys.readouterr().out == ""
+
+
+def test_dense_prim_matches_sparse(capsys):
+    graph = random_connected_graph(40, 200, 2)
+    assert PrimMST(DenseWeightedGraph.from_graph(graph)).mst_weight == KruskalMST(graph).mst_weight
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,152 @@
+import math
+import os
+import random
+import subprocess
+import sys
+import pytest
+from conftest import directed_edges, random_graph, reference_bellman_ford
+from dsa1lib.dense import DenseWeightedGraph
+from dsa1lib.generators import RandomDAG
+from dsa1lib.graph import WeightedDirectedGraph, WeightedUndirectedGraph
+from dsa1lib.shortestpath import BellmanFordSSSP, BidirectionalDijkstra, DagSSSP, DijkstraSSSP, many_sources_sssp, \
+    shortest_path, shortest_paths
+from dsa1lib.subgraph import SubgraphView
+
+
+@pytest.mark.parametrize("graph_cls", [WeightedDirectedGraph, WeightedUndirectedGraph])
+@pytest.mark.parametrize("integral", [False, True])
+def test_many_sources_matches_dijkstra(graph_cls, integral):
+    graph = random_graph(graph_cls, 60, 240, 19, weight_range=(1, 20), integral=integral)
+    sources = [0, 5, 5, 59, 17]
+    for frozen in (graph, graph.freeze()):
+        results = list(many_sources_sssp(frozen, sources))
+        assert [source for source, _ in results] == sources
+        for source, dist_to in results:
+            assert list(dist_to) == DijkstraSSSP(graph, source).dist_to
+
+
+def test_many_sources_over_a_worker_pool():
+    graph = random_graph(WeightedDirectedGraph, 40, 160, 3)
+    results = dict(many_sources_sssp(graph, range(0, 40, 3), workers=2, chunksize=2))
+    assert sorted(results) == list(range(0, 40, 3))
+    for source, dist_to in results.items():
+        assert list(dist_to) == DijkstraSSSP(graph, source).dist_to
+
+
+def test_many_sources_rejects_graphs_that_cannot_be_frozen():
+    graph = random_graph(WeightedDirectedGraph, 10, 30, 1)
+    for unfrozen in (DenseWeightedGraph.from_graph(graph), SubgraphView(graph, [True] * 10)):
+        with pytest.raises(TypeError):
+            many_sources_sssp(unfrozen, [0])
+
+
+def test_many_sources_rejects_sources_out_of_range():
+    graph = random_graph(WeightedDirectedGraph, 10, 30, 1)
+    with pytest.raises(ValueError):
+        list(many_sources_sssp(graph, [10]))
+
+
+def check_path(graph, source: int, target: int, dist: float, path):
+    """path runs from target back to source, along edges in their direction, and weighs dist."""
+    if dist == math.inf:
+        assert not path
+        return
+    v = target
+    for edge in path:
+        if graph.directed:
+            assert edge.edge_to == v
+        v = edge.other_vertex(v)
+    assert v == source
+    assert sum(edge.weight for edge in path) == pytest.approx(dist)
+
+
+GRAPHS = {
+    "directed": lambda: random_graph(WeightedDirectedGraph, 80, 240, 20),
+    "undirected": lambda: random_graph(WeightedUndirectedGraph, 80, 160, 21),
+    "frozen directed": lambda: random_graph(WeightedDirectedGraph, 80, 240, 22).freeze(),
+    "frozen undirected": lambda: random_graph(WeightedUndirectedGraph, 80, 160, 23).freeze(),
+    "integral directed": lambda: random_graph(WeightedDirectedGraph, 80, 240, 24, weight_range=(1, 20),
+                                              integral=True),
+    "view directed": lambda: SubgraphView.without_vertices(random_graph(WeightedDirectedGraph, 80, 240, 25), [1, 2]),
+    "view undirected": lambda: SubgraphView(random_graph(WeightedUndirectedGraph, 80, 160, 26),
+                                            edge_predicate=lambda edge: edge.weight < 15),
+    "dense directed": lambda: DenseWeightedGraph.from_graph(random_graph(WeightedDirectedGraph, 80, 240, 27)),
+    "dense undirected": lambda: DenseWeightedGraph.from_graph(random_graph(WeightedUndirectedGraph, 80, 160, 28)),
+}
+
+
+@pytest.mark.parametrize("name", GRAPHS)
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_point_to_point_matches_dijkstra(name, bidirectional):
+    graph = GRAPHS[name]()
+    rng = random.Random(20)
+    for source in rng.sample(range(graph.num_vertices), 6):
+        expected = DijkstraSSSP(graph, source).dist_to
+        for target in rng.sample(range(graph.num_vertices), 10) + [source]:
+            dist, path = shortest_path(graph, source, target, bidirectional)
+            assert dist == pytest.approx(expected[target])
+            check_path(graph, source, target, dist, path)
+
+
+def test_bidirectional_dijkstra_rejects_dense_graphs():
+    with pytest.raises(TypeError):
+        BidirectionalDijkstra(DenseWeightedGraph(3), 0, 2)
+
+
+def test_bidirectional_on_unreachable_target():
+    graph = WeightedDirectedGraph.from_edge_arrays(4, [0, 1, 3], [1, 2, 2], [1.0, 1.0, 1.0])
+    for frozen in (graph, graph.freeze()):
+        assert shortest_path(frozen, 0, 3, bidirectional=True) == (math.inf, [])
+        assert shortest_path(frozen, 0, 3) == (math.inf, [])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_dag_shortest_paths_with_negative_weights(seed):
+    graph = RandomDAG(60, 300, seed=seed, weight_range=(-20, 30)).to_graph()
+    expected, _ = reference_bellman_ford(60, *directed_edges(graph), 0)
+    dag = DagSSSP(graph, 0)
+    assert dag.dist_to == expected
+    for v in range(60):
+        if expected[v] != math.inf:
+            assert sum(edge.weight for edge in dag.shortest_path_to(v)) == expected[v]
+
+
+def test_dag_sssp_rejects_cycles():
+    graph = WeightedDirectedGraph.from_edge_arrays(3, [0, 1, 2], [1, 2, 0], [1.0, 1.0, 1.0])
+    with pytest.raises(ValueError):
+        DagSSSP(graph, 0)
+
+
+def test_dag_sssp_sees_only_the_edges_of_a_view():
+    graph = WeightedDirectedGraph.from_edge_arrays(3, [0, 1, 2], [1, 2, 0], [1.0, 1.0, 1.0])
+    view = SubgraphView(graph, edge_predicate=lambda edge: edge.eid != 2)
+    assert DagSSSP(view, 0).dist_to == [0.0, 1.0, 2.0]  # type: ignore
+    # every undirected edge is a cycle of two
+    with pytest.raises(ValueError):
+        DagSSSP(WeightedUndirectedGraph.from_edge_arrays(3, [0, 1], [1, 2], [1.0, 1.0]), 0)
+
+
+def test_importing_shortestpath_does_not_need_numpy():
+    code = "import sys, dsa1lib.shortestpath; assert 'numpy' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+def test_dispatcher_picks_the_cheapest_algorithm():
+    dag = RandomDAG(40, 120, seed=7, weight_range=(-5, 10)).to_graph()
+    cyclic = random_graph(WeightedDirectedGraph, 40, 200, 8)
+    undirected = random_graph(WeightedUndirectedGraph, 40, 100, 9)
+    negative = WeightedDirectedGraph.from_edge_arrays(
+        4, [0, 1, 2, 2], [1, 2, 1, 3], [2.0, -1.0, 3.0, 1.0])
+
+    assert isinstance(shortest_paths(dag, 0), DagSSSP)
+    assert isinstance(shortest_paths(cyclic, 0), DijkstraSSSP)
+    assert isinstance(shortest_paths(undirected, 0), DijkstraSSSP)
+    assert isinstance(shortest_paths(negative, 0), BellmanFordSSSP)
+    assert isinstance(shortest_paths(DenseWeightedGraph.from_graph(cyclic), 0), DijkstraSSSP)
+    assert isinstance(shortest_paths(SubgraphView(dag, [True] * 40), 0), DagSSSP)
+
+    for graph in (dag, cyclic, negative, SubgraphView.without_vertices(dag, [3, 4])):
+        expected, _ = reference_bellman_ford(graph.num_vertices, *directed_edges(graph), 0)
+        assert shortest_paths(graph, 0).dist_to == pytest.approx(expected)
+    assert shortest_paths(undirected, 5).dist_to == DijkstraSSSP(undirected, 5).dist_to
+
@@ -0,0 +1,120 @@
+import gc
+import pytest
+from dsa1lib.graph import WeightedDirectedGraph
+from dsa1lib.shortestpath import BellmanFordSSSP, DijkstraSSSP
+from dsa1lib.ssspcache import SSSPCache
+from dsa1lib.subgraph import SubgraphView
+
+
+def small_graph() -> WeightedDirectedGraph:
+    return WeightedDirectedGraph.from_edge_arrays(5, [0, 0, 1, 2, 3], [1, 2, 3, 3, 4], [1.0, 4.0, 1.0, 1.0, 2.0])
+
+
+class Unversioned:
+    """Graph stand in without a version."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getattr__(self, name):
+        if name == "version":
+            raise AttributeError(name)
+        return getattr(self._graph, name)
+
+
+def test_hits_return_the_computed_tree():
+    graph = small_graph()
+    cache = SSSPCache()
+    first = cache.get(graph, 0)
+    second = cache.get(graph, 0)
+    assert list(second.dist_to) == list(first.dist_to) == DijkstraSSSP(graph, 0).dist_to
+    assert [edge.eid for edge in second.shortest_path_to(4)] == [4, 2, 0]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_algorithms_with_the_same_name_do_not_collide():
+    graph = small_graph()
+    cache = SSSPCache()
+    # both lambdas are called <lambda>, the first stops as soon as vertex 1 is settled
+    early_exit, full = (lambda g, s: DijkstraSSSP(g, s, target=1)), (lambda g, s: DijkstraSSSP(g, s))
+    assert early_exit.__qualname__ == full.__qualname__
+    cache.get(graph, 0, early_exit)
+    assert list(cache.get(graph, 0, full).dist_to) == DijkstraSSSP(graph, 0).dist_to
+    assert cache.stats()["misses"] == 2
+    assert cache.get(graph, 0, BellmanFordSSSP).dist_to == cache.get(graph, 0).dist_to
+    assert len(cache) == 4
+
+
+def test_new_version_invalidates_old_trees():
+    graph = small_graph()
+    cache = SSSPCache()
+    assert cache.get(graph, 0).dist_to[4] == 4.0
+    graph.add_edge(0, 4, 1.5)
+    assert cache.get(graph, 0).dist_to[4] == 1.5
+    assert cache.stats()["invalidations"] == 1
+    assert len(cache) == 1
+
+
+def test_view_follows_the_version_of_its_graph():
+    graph = small_graph()
+    view = SubgraphView.without_vertices(graph, [2])
+    assert view.version == graph.version
+    cache = SSSPCache()
+    assert cache.get(view, 0).dist_to[4] == 4.0
+    graph.add_edge(1, 4, 0.5)
+    assert view.version == graph.version
+    assert cache.get(view, 0).dist_to[4] == 1.5
+
+
+def test_frozen_graphs_are_cached_at_version_0():
+    frozen = small_graph().freeze()
+    assert frozen.version == 0
+    cache = SSSPCache()
+    cache.get(frozen, 0)
+    cache.get(frozen, 0)
+    assert cache.stats()["hits"] == 1
+
+
+def test_graphs_without_a_version_are_not_cached():
+    graph = Unversioned(small_graph())
+    cache = SSSPCache()
+    for _ in range(2):
+        assert list(cache.get(graph, 0).dist_to) == DijkstraSSSP(small_graph(), 0).dist_to
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 2
+
+
+def test_trees_go_with_their_graph():
+    cache = SSSPCache()
+    graph = small_graph()
+    cache.get(graph, 0)
+    cache.get(graph, 1)
+    assert len(cache) == 2
+    del graph
+    gc.collect()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_least_recently_used_trees_are_evicted():
+    graph = small_graph()
+    # room for two trees of 5 vertices, 12 bytes per vertex
+    cache = SSSPCache(max_bytes=2 * 12 * 5)
+    cache.get(graph, 0)
+    cache.get(graph, 1)
+    cache.get(graph, 0)
+    cache.get(graph, 2)
+    assert cache.stats()["evictions"] == 1
+    cache.get(graph, 0)
+    assert cache.stats()["hits"] == 2
+    cache.get(graph, 1)
+    assert cache.stats()["misses"] == 4
+
+
+@pytest.mark.parametrize("source", [0, 3])
+def test_cached_paths_match_dijkstra(source):
+    graph = small_graph()
+    cached = SSSPCache().get(graph, source)
+    dijkstra = DijkstraSSSP(graph, source)
+    for v in range(graph.num_vertices):
+        assert [edge.eid for edge in cached.shortest_path_to(v)] == [edge.eid for edge in dijkstra.shortest_path_to(v)]
@@ -0,0 +1,83 @@
+import pytest
+from conftest import random_edges, random_graph
+from dsa1lib.graph import DirectedGraph, UndirectedGraph, WeightedDirectedGraph, WeightedUndirectedGraph
+from dsa1lib.mst import KruskalMST, PrimMST
+from dsa1lib.subgraph import SubgraphView
+
+WEIGHTED = [WeightedDirectedGraph, WeightedUndirectedGraph]
+REMOVED = [0, 3, 11]
+
+
+def copy_of(view: SubgraphView):
+    """Weighted graph holding only the edges of the view, with new edge ids."""
+    graph = view.graph
+    eids = view.edge_ids()
+    return type(graph).from_edge_arrays(view.num_vertices, [graph.edge_v1[eid] for eid in eids],
+                                        [graph.edge_v2[eid] for eid in eids],
+                                        [graph.edge_weights[eid] for eid in eids])
+
+
+@pytest.mark.parametrize("graph_cls", WEIGHTED)
+def test_vertex_mask_hides_vertices_and_their_edges(graph_cls):
+    graph = random_graph(graph_cls, 30, 120, 1)
+    view = SubgraphView.without_vertices(graph, REMOVED)
+    for v in range(view.num_vertices):
+        if v in REMOVED:
+            assert view.adj_ids(v) == [] and view.adj(v) == []
+        for eid in view.adj_ids(v):
+            assert graph.edge_v1[eid] not in REMOVED and graph.edge_v2[eid] not in REMOVED
+    assert all(graph.edge_v1[eid] not in REMOVED and graph.edge_v2[eid] not in REMOVED for eid in view.edge_ids())
+
+
+@pytest.mark.parametrize("graph_cls", WEIGHTED)
+def test_edge_predicate_on_weighted_graphs(graph_cls):
+    graph = random_graph(graph_cls, 30, 120, 2)
+    view = SubgraphView(graph, edge_predicate=lambda edge: edge.weight < 10)
+    assert list(view.edge_ids()) == [eid for eid in graph.edge_ids() if graph.edge_weights[eid] < 10]
+    for v in range(view.num_vertices):
+        assert view.adj_ids(v) == [eid for eid in graph.adj_ids(v) if graph.edge_weights[eid] < 10]
+
+
+@pytest.mark.parametrize("graph_cls", [DirectedGraph, UndirectedGraph])
+def test_masks_and_predicates_on_unweighted_graphs(graph_cls):
+    graph = random_graph(graph_cls, 20, 60, 3)
+    view = SubgraphView(graph, bytearray(v not in REMOVED for v in range(20)), lambda v, u: (v + u) % 3 != 0)
+    for v in range(20):
+        expected = [] if v in REMOVED else [u for u in graph.adj(v) if u not in REMOVED and (v + u) % 3 != 0]
+        assert view.adj(v) == expected
+
+
+@pytest.mark.parametrize("graph_cls", WEIGHTED + [DirectedGraph, UndirectedGraph])
+def test_num_edges_agrees_with_adj(graph_cls):
+    v1s, v2s, _ = random_edges(25, 100, 4)
+    graph = random_graph(graph_cls, 25, 100, 4)
+    view = SubgraphView.without_vertices(graph, REMOVED)
+    kept = sum(v1 not in REMOVED and v2 not in REMOVED for v1, v2 in zip(v1s, v2s))
+    assert view.num_edges == kept
+    if graph_cls in WEIGHTED:
+        ids = [eid for v in range(view.num_vertices) for eid in view.adj_ids(v)]
+        assert sorted(view.edge_ids()) == sorted(set(ids))
+        assert len(ids) == (kept if graph.directed else 2 * kept)
+    else:
+        slots = sum(len(view.adj(v)) for v in range(view.num_vertices))
+        assert slots == (kept if graph.directed else 2 * kept)
+
+
+def test_kruskal_skips_masked_edges():
+    graph = WeightedUndirectedGraph.from_edge_arrays(4, [0, 1, 2, 1], [1, 2, 3, 3], [1.0, 5.0, 2.0, 4.0])
+    mst = KruskalMST(SubgraphView.without_vertices(graph, [0])).mst
+    assert sorted(edge.eid for edge in mst) == [2, 3]
+
+
+@pytest.mark.parametrize("view_of", [
+    lambda graph: SubgraphView.without_vertices(graph, [3, 11]),
+    lambda graph: SubgraphView(graph, edge_predicate=lambda edge: edge.weight < 30),
+])
+def test_mst_over_a_view_matches_mst_over_a_copy(view_of):
+    graph = random_graph(WeightedUndirectedGraph, 40, 160, 5, weight_range=(1, 50), integral=True, connected=True)
+    view = view_of(graph)
+    copy = copy_of(view)
+    assert KruskalMST(view).mst_weight == KruskalMST(copy).mst_weight
+    assert PrimMST(view).mst_weight == PrimMST(copy).mst_weight
+    kept = set(view.edge_ids())
+    assert all(edge.eid in kept for edge in KruskalMST(view).mst + PrimMST(view).mst)